@@ -125,7 +125,8 @@ class FilmManager: ObservableObject {
         
         print("📄 Processing \(jsonFiles.count) JSON files from \(directory)")
         
-        for file in jsonFiles {
+        // Name order, so the same file of a duplicate ID pair wins on every run (and in load_shots)
+        for file in jsonFiles.sorted() {
             let filepath = "\(directory)/\(file)"
             
             guard let data = FileManager.default.contents(atPath: filepath) else {
@@ -173,6 +174,7 @@ class FilmManager: ObservableObject {
             shot.duration = (metadata["duration_seconds"] as? Int) ?? 8
             shot.narrativeFunction = metadata["narrative_function"] as? String ?? ""
             shot.progressiveState = json["progressive_state"] as? String ?? ""
+            shot.loadTrackingValues(from: json)
             
             // Load prompt variants
             if let prompts = json["prompt_variants"] as? [[String: Any]], !prompts.isEmpty {
@@ -189,6 +191,8 @@ class FilmManager: ObservableObject {
                     variant.dialogue = prompt["dialogue"] as? String ?? ""
                     variant.cameraPosition = prompt["camera_position"] as? String ?? ""
                     variant.negativePrompt = prompt["negative_prompt"] as? String ?? ""
+                    variant.degradationStyle = prompt["degradation_style"] as? String ?? ""
+                    variant.degradationNegative = prompt["degradation_negative"] as? String ?? ""
                     shot.promptVariants.append(variant)
                 }
             }
@@ -511,6 +515,8 @@ class FilmManager: ObservableObject {
             copiedVariant.dialogue = variant.dialogue
             copiedVariant.cameraPosition = variant.cameraPosition
             copiedVariant.negativePrompt = variant.negativePrompt
+            copiedVariant.degradationStyle = variant.degradationStyle
+            copiedVariant.degradationNegative = variant.degradationNegative
             copiedVariant.progressiveState = variant.progressiveState
             copiedVariant.selectedCharacterPlateId = variant.selectedCharacterPlateId
             copiedVariant.selectedEnvironmentPlateId = variant.selectedEnvironmentPlateId
@@ -555,6 +561,11 @@ class FilmShot: ObservableObject, Identifiable {
     @Published var progressiveState: String = ""
     @Published var stitchFrom: String = ""
     @Published var narrativeFunction: String = ""
+    // Tracking system values at this shot, precomputed by tracking_engine.py
+    @Published var trackingValues: [String: Double] = [:]
+    @Published var trackingUnits: [String: String] = [:]
+    // Milestone label per tracking system at this shot, precomputed by milestones.py
+    @Published var milestones: [String: String] = [:]
     
     init(id: String, title: String, sequenceType: String, position: Double, 
          subject: String, action: String, scene: String, style: String) {
@@ -576,6 +587,14 @@ class FilmShot: ObservableObject, Identifiable {
         self.promptVariants = [defaultVariant]
     }
     
+    func loadTrackingValues(from json: [String: Any]) {
+        milestones = json["milestones"] as? [String: String] ?? [:]
+        guard let tracking = json["tracking_values"] as? [String: Any],
+              let systems = tracking["systems"] as? [String: [String: Any]] else { return }
+        trackingValues = systems.compactMapValues { $0["value"] as? Double }
+        trackingUnits = systems.compactMapValues { $0["unit"] as? String }
+    }
+    
     var selectedVideo: VideoFile? {
         guard let index = selectedVideoIndex, index < videos.count else { return nil }
         return videos[index]
@@ -641,6 +660,8 @@ class FilmShot: ObservableObject, Identifiable {
         copy.dialogue = original.dialogue
         copy.cameraPosition = original.cameraPosition
         copy.negativePrompt = original.negativePrompt
+        copy.degradationStyle = original.degradationStyle
+        copy.degradationNegative = original.degradationNegative
         copy.progressiveState = original.progressiveState
         copy.recommendedPlates = original.recommendedPlates
         copy.selectedPlates = original.selectedPlates
@@ -677,6 +698,9 @@ class PromptVariant: ObservableObject, Identifiable {
     @Published var dialogue: String = ""
     @Published var cameraPosition: String = ""
     @Published var negativePrompt: String = ""
+    // Fading Witness modifiers generated by degradation_engine.py, appended when rendering
+    @Published var degradationStyle: String = ""
+    @Published var degradationNegative: String = ""
     @Published var recommendedPlates: [String: Any] = [:]
     @Published var selectedPlates: [String: Any] = [:]
     @Published var progressiveState: String = ""
@@ -702,6 +726,14 @@ class PromptVariant: ObservableObject, Identifiable {
         }
     }
     
+    var renderedStyle: String {
+        [style, degradationStyle].filter { !$0.isEmpty }.joined(separator: " ")
+    }
+    
+    var renderedNegativePrompt: String {
+        [negativePrompt, degradationNegative].filter { !$0.isEmpty }.joined(separator: ", ")
+    }
+    
     func generateCompletePrompt(for shot: FilmShot, plateManager: PlateManager? = nil) -> String {
         var promptText = ""
         
@@ -728,7 +760,7 @@ class PromptVariant: ObservableObject, Identifiable {
         Subject: \(subject)
         Action: \(action)
         Scene: \(scene)
-        Style: \(style)
+        Style: \(renderedStyle)
         Camera Position: \(cameraPosition)
         """
         
@@ -751,8 +783,8 @@ class PromptVariant: ObservableObject, Identifiable {
             promptText += "\nProgressive State: \(progressiveState)"
         }
         
-        if !negativePrompt.isEmpty {
-            promptText += "\n\nTechnical (Negative Prompt): \(negativePrompt)"
+        if !renderedNegativePrompt.isEmpty {
+            promptText += "\n\nTechnical (Negative Prompt): \(renderedNegativePrompt)"
         }
         
         return promptText
@@ -765,9 +797,15 @@ class TrackingSystem: ObservableObject, Identifiable {
     @Published var description: String
     @Published var currentPercentage: Double
     @Published var isBeingDragged: Bool = false
-    @Published var milestoneValues: [String: String] = [:]
+    @Published var milestoneValues: [String: String] = [:] {
+        didSet { compileMilestones() }
+    }
     @Published var affectsShots: [String] = []
     
+    // milestone_values sorted by percentage; each label applies up to the next breakpoint
+    private(set) var milestoneBreakpoints: [Double] = []
+    private(set) var milestoneLabels: [String] = []
+    
     let continuousRange: ClosedRange<Double> = 0...100
     
     init(name: String, description: String, currentPercentage: Double) {
@@ -780,23 +818,30 @@ class TrackingSystem: ObservableObject, Identifiable {
         name.replacingOccurrences(of: "_", with: " ").capitalized
     }
     
+    private func compileMilestones() {
+        let sorted = milestoneValues
+            .compactMap { key, label in Double(key).map { ($0, label) } }
+            .sorted { $0.0 < $1.0 }
+        milestoneBreakpoints = sorted.map { $0.0 }
+        milestoneLabels = sorted.map { $0.1 }
+    }
+    
     func getMilestoneDescription(at percentage: Double) -> String {
-        // Return description based on percentage for this system
-        switch name {
-        case "breathing_coordination":
-            if percentage < 25 { return "Individual rhythms" }
-            else if percentage < 50 { return "Synchronization beginning" }
-            else if percentage < 75 { return "Animal rhythms emerging" }
-            else { return "Species-appropriate breathing" }
-        case "klettagja_formation":
-            if percentage < 35 { return "No crack formation" }
-            else if percentage < 45 { return "Hairline crack (0.5mm)" }
-            else if percentage < 65 { return "Readable KLETTAGJÁ (2mm)" }
-            else if percentage < 75 { return "Passable opening (6cm)" }
-            else { return "Escape doorway (3ft)" }
-        default:
+        guard !milestoneBreakpoints.isEmpty else {
             return "\(Int(percentage))% progression"
         }
+        // Last breakpoint at or below the percentage
+        var low = 0
+        var high = milestoneBreakpoints.count
+        while low < high {
+            let mid = (low + high) / 2
+            if milestoneBreakpoints[mid] <= percentage {
+                low = mid + 1
+            } else {
+                high = mid
+            }
+        }
+        return milestoneLabels[max(0, low - 1)]
     }
 }
 
@@ -1379,14 +1424,23 @@ class FilmFileManager {
                 }
             }
             
-            // Sort shots by their ID/position
+            // Sort shots: prologue first, then main_story, sorted by ID
             shots.sort { shot1, shot2 in
+                if shot1.sequenceType != shot2.sequenceType {
+                    return shot1.sequenceType == "prologue"
+                }
+                
                 // Extract numeric value from ID for proper sorting
                 let id1 = extractNumericValue(from: shot1.id)
                 let id2 = extractNumericValue(from: shot2.id)
                 return id1 < id2
             }
             
+            // Same index-based positions as FilmManager and the Python scripts
+            for (index, shot) in shots.enumerated() {
+                shot.position = Double(index) / Double(max(1, shots.count - 1)) * 100.0
+            }
+            
             print("📁 Successfully loaded \(shots.count) shots from JSON files")
         } catch {
             print("❌ Error loading shots: \(error)")
@@ -1448,7 +1502,7 @@ class FilmFileManager {
             let narrativeFunction = metadata["narrative_function"] as? String ?? ""
             let stitchFrom = metadata["stitch_from"] as? String ?? ""
             
-            // Calculate position based on sequence and order
+            // Estimate from the ID; loadShotsFromJSON replaces it with the index-based position
             let position = calculatePosition(for: id, sequenceType: sequenceType)
             
             // Create base shot
@@ -1467,6 +1521,7 @@ class FilmFileManager {
             shot.narrativeFunction = narrativeFunction
             shot.stitchFrom = stitchFrom
             shot.progressiveState = jsonDict["progressive_state"] as? String ?? ""
+            shot.loadTrackingValues(from: jsonDict)
             
             // Parse prompt variants
             if let promptVariants = jsonDict["prompt_variants"] as? [[String: Any]] {
@@ -1510,6 +1565,8 @@ class FilmFileManager {
             promptVariant.cameraPosition = variant["camera_position"] as? String ?? ""
             promptVariant.dialogue = variant["dialogue"] as? String ?? ""
             promptVariant.negativePrompt = variant["negative_prompt"] as? String ?? ""
+            promptVariant.degradationStyle = variant["degradation_style"] as? String ?? ""
+            promptVariant.degradationNegative = variant["degradation_negative"] as? String ?? ""
             
             // Load plate information
             if let recommendedPlates = variant["recommended_plates"] as? [String: Any] {
@@ -1568,6 +1625,17 @@ class FilmFileManager {
         
         json["progressive_state"] = shot.progressiveState
         
+        if !shot.trackingValues.isEmpty {
+            var systems: [String: Any] = [:]
+            for (name, value) in shot.trackingValues {
+                systems[name] = ["value": value, "unit": shot.trackingUnits[name] ?? ""]
+            }
+            json["tracking_values"] = ["film_position_percentage": shot.position, "systems": systems]
+        }
+        if !shot.milestones.isEmpty {
+            json["milestones"] = shot.milestones
+        }
+        
         // Prompt variants
         var promptVariantsJSON: [[String: Any]] = []
         for variant in shot.promptVariants {
@@ -1580,7 +1648,9 @@ class FilmFileManager {
                 "style": variant.style,
                 "camera_position": variant.cameraPosition,
                 "dialogue": variant.dialogue,
-                "negative_prompt": variant.negativePrompt
+                "negative_prompt": variant.negativePrompt,
+                "degradation_style": variant.degradationStyle,
+                "degradation_negative": variant.degradationNegative
             ])
         }
         json["prompt_variants"] = promptVariantsJSON
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Audio cue catalog over the PRIMARY/AMBIENT/ABSENT lists that parse_sounds() stores on
+each prompt variant.
+Cues are normalized (mojibake fixed, quotes dropped, "13 /min" -> "13/min",
+"60 BPM" -> "60bpm") and near-identical cues are clustered ("House heartbeat 60bpm",
+"house heartbeat becoming audible at 60bpm"). The catalog keeps an inverted index
+term -> cues, each cue's shots in film order, and continuity spans of every cluster
+across the timeline, so "every shot with the house heartbeat" or "where does 60bpm
+first appear" are answered from the catalog without opening a shot file. A shot that
+lists a cue as ABSENT goes in the cue's absent_shots, never among the shots where it
+is heard. Shots whose audio did not change are not re-processed, and existing
+clusters are kept stable.
+
+Usage: python3 audio_catalog.py [query words...]
+"""
+
+import hashlib
+import json
+import re
+import sys
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from film_data import APP_PATH, SHOTS_PATH, fix_mojibake, load_json, load_shots
+from timeline_index import build_timeline
+
+AUDIO_CATALOG_PATH = f"{APP_PATH}/audio_catalog.json"
+# Bump when normalization or clustering changes so the catalog is rebuilt
+CATALOG_VERSION = 2
+AUDIO_CATEGORIES = ('primary', 'ambient', 'absent')
+
+CLUSTER_SIMILARITY = 0.6
+# Shots a cue may skip and still count as one continuous span
+SPAN_GAP = 1
+
+QUOTES = str.maketrans('', '', '"“”„\'‘’«»')
+RATE_PATTERN = re.compile(r'(\d+(?:\.\d+)?)\s*(?:/\s*min(?:ute)?\b|per\s+min(?:ute)?\b)')
+BPM_PATTERN = re.compile(r'(\d+(?:\.\d+)?)\s*bpm\b')
+WORD_PATTERN = re.compile(r'\d+(?:\.\d+)?(?:/min|bpm)|[^\W\d_]+')
+STOPWORDS = set('a an the of to at in on from with and or by as its his her their now then still all '
+                'becoming beginning continues throughout'.split())
+
+
+def normalize_cue(cue: str) -> str:
+    """Canonical spelling of a cue; rates and bpm written as 13/min and 60bpm."""
+    text = fix_mojibake(cue).lower().translate(QUOTES)
+    text = RATE_PATTERN.sub(r'\1/min', text)
+    text = BPM_PATTERN.sub(r'\1bpm', text)
+    text = re.sub(r'[()\[\]]', ' ', text)
+    return ' '.join(text.split()).strip(' .,;:-')
+
+
+def stem(word: str) -> str:
+    """Crude English stemming, enough for breath/breaths/breathing to meet."""
+    if word.endswith('ing') and len(word) > 5:
+        word = word[:-3]
+    elif word.endswith('s') and not word.endswith('ss') and len(word) > 3:
+        word = word[:-1]
+    return word[:-1] if word.endswith('e') and len(word) > 4 else word
+
+
+def cue_terms(normalized: str) -> List[str]:
+    """Searchable terms: stemmed words, plus each rate/bpm value and its unit."""
+    terms = []
+    for word in WORD_PATTERN.findall(normalized):
+        if word[0].isdigit():
+            terms += [word, '/min' if word.endswith('/min') else 'bpm']
+        elif word not in STOPWORDS:
+            terms.append(stem(word))
+    return list(dict.fromkeys(terms))
+
+
+def cluster_terms(normalized: str) -> Set[str]:
+    """Terms compared for clustering; values are left out so 12/min and 13/min still match."""
+    return {term for term in cue_terms(normalized) if not term[0].isdigit()}
+
+
+def similarity(first: Set[str], second: Set[str]) -> float:
+    """Jaccard similarity; a negated cue ("no female voices") never matches a plain one."""
+    if ('no' in first) != ('no' in second) or not first | second:
+        return 0.0
+    return len(first & second) / len(first | second)
+
+
+def shot_cues(shot_data: Dict[str, Any]) -> List[Tuple[str, str, str]]:
+    """(category, normalized cue, original text) across every variant, without repeats."""
+    cues = []
+    seen = set()
+    for variant in shot_data.get('prompt_variants', []):
+        audio = variant.get('audio') or {}
+        for category in AUDIO_CATEGORIES:
+            for text in audio.get(category) or []:
+                normalized = normalize_cue(text)
+                if normalized and (category, normalized) not in seen:
+                    seen.add((category, normalized))
+                    cues.append((category, normalized, fix_mojibake(text).strip()))
+    return cues
+
+
+def audio_digest(shot_data: Dict[str, Any]) -> str:
+    audio = [variant.get('audio') for variant in shot_data.get('prompt_variants', [])]
+    return hashlib.sha256(json.dumps(audio, sort_keys=True).encode('utf-8')).hexdigest()[:16]
+
+
+def continuity_spans(positions: List[int], entries: List[Dict[str, Any]], gap: int = SPAN_GAP) -> List[Dict[str, Any]]:
+    """Runs of timeline positions, allowing up to gap missing shots inside a run."""
+    spans = []
+    for position in sorted(positions):
+        if spans and position - spans[-1][1] <= gap + 1:
+            spans[-1][1] = position
+        else:
+            spans.append([position, position])
+    return [{'first_shot': entries[first]['key'], 'last_shot': entries[last]['key'],
+             'shots': last - first + 1, 'start_seconds': entries[first]['start_seconds'],
+             'end_seconds': entries[last]['start_seconds'] + entries[last]['duration_seconds']}
+            for first, last in spans]
+
+
+class AudioCatalog:
+    """Per-shot cues, cue clusters, the inverted term index and timeline spans."""
+
+    def __init__(self, path: str = AUDIO_CATALOG_PATH):
+        self.path = path
+        data = load_json(path)
+        current = data.get('version') == CATALOG_VERSION
+        self.shots: Dict[str, Dict[str, Any]] = data.get('shots', {}) if current else {}
+        self.clusters: Dict[str, Dict[str, Any]] = data.get('clusters', {}) if current else {}
+        self.cues: Dict[str, Dict[str, Any]] = data.get('cues', {}) if current else {}
+        self.terms: Dict[str, List[str]] = data.get('terms', {}) if current else {}
+        self.timeline: List[Dict[str, Any]] = data.get('timeline', []) if current else []
+
+    def _assign_cluster(self, normalized: str) -> str:
+        """Join the cluster of the most similar cue already placed, or found a new one."""
+        terms = cluster_terms(normalized)
+        candidates = {cue for term in terms for cue in self.terms.get(term, []) if cue in self.cues}
+        best = max(((similarity(terms, cluster_terms(cue)), cue) for cue in candidates), default=(0.0, None))
+        if best[1] is not None and best[0] >= CLUSTER_SIMILARITY:
+            return self.cues[best[1]]['cluster']
+        cluster = f"c{len(self.clusters) + 1}"
+        while cluster in self.clusters:
+            cluster = f"c{int(cluster[1:]) + 1}"
+        self.clusters[cluster] = {'label': normalized}
+        return cluster
+
+    def update(self, shots: List[Tuple[str, Dict[str, Any]]]) -> Dict[str, int]:
+        """Re-read the audio of changed shots only, then rebuild shot lists and spans."""
+        stats = {'changed': 0, 'unchanged': 0, 'removed': len(set(self.shots) - {key for key, _ in shots})}
+        shot_entries = {}
+        for shot_key, shot_data in shots:
+            digest = audio_digest(shot_data)
+            known = self.shots.get(shot_key)
+            if known and known['digest'] == digest:
+                shot_entries[shot_key] = known
+                stats['unchanged'] += 1
+                continue
+            shot_entries[shot_key] = {'digest': digest, 'cues': [list(cue) for cue in shot_cues(shot_data)]}
+            stats['changed'] += 1
+        self.shots = shot_entries
+        self.timeline = build_timeline(shots).entries()
+        position = {entry['key']: entry['index'] for entry in self.timeline}
+
+        # Cues no shot uses any more are dropped; new cues join or found clusters
+        used = {}
+        for shot_key, entry in self.shots.items():
+            for category, normalized, text in entry['cues']:
+                cue = used.setdefault(normalized, {'text': text, 'categories': {}, 'shots': [], 'absent_shots': []})
+                cue['categories'][category] = cue['categories'].get(category, 0) + 1
+                listed = cue['absent_shots' if category == 'absent' else 'shots']
+                if shot_key not in listed:
+                    listed.append(shot_key)
+        previous = self.cues
+        self.cues = {}
+        self.terms = {}
+        for normalized in sorted(used, key=lambda cue: (cue not in previous, cue)):
+            cluster = previous[normalized]['cluster'] if normalized in previous \
+                and previous[normalized]['cluster'] in self.clusters else self._assign_cluster(normalized)
+            cue = used[normalized]
+            cue['shots'].sort(key=position.get)
+            cue['absent_shots'].sort(key=position.get)
+            self.cues[normalized] = {'cluster': cluster, **cue,
+                                     'rates': [float(value) for value in RATE_PATTERN.findall(normalized)],
+                                     'bpm': [float(value) for value in BPM_PATTERN.findall(normalized)]}
+            for term in cue_terms(normalized):
+                self.terms.setdefault(term, []).append(normalized)
+
+        members: Dict[str, List[str]] = {}
+        for normalized, cue in self.cues.items():
+            members.setdefault(cue['cluster'], []).append(normalized)
+        self.clusters = {cluster: info for cluster, info in self.clusters.items() if cluster in members}
+        for cluster, cues in members.items():
+            shot_keys = sorted({shot for cue in cues for shot in self.cues[cue]['shots']}, key=position.get)
+            absent_keys = sorted({shot for cue in cues for shot in self.cues[cue]['absent_shots']}, key=position.get)
+            cues = sorted(cues, key=lambda cue: (-len(self.cues[cue]['shots']) - len(self.cues[cue]['absent_shots']),
+                                                 cue))
+            self.clusters[cluster].update({
+                'label': cues[0],
+                'cues': cues,
+                'shots': shot_keys,
+                'absent_shots': absent_keys,
+                'spans': continuity_spans([position[shot] for shot in shot_keys], self.timeline)
+            })
+        return stats
+
+    def save(self) -> None:
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump({'version': CATALOG_VERSION, 'shots': self.shots, 'timeline': self.timeline,
+                       'clusters': self.clusters, 'cues': self.cues, 'terms': self.terms},
+                      f, indent=2, ensure_ascii=False)
+
+    def find_cues(self, query: str) -> List[str]:
+        """Cues containing every term of the query ("house heartbeat", "60bpm")."""
+        terms = cue_terms(normalize_cue(query))
+        if not terms:
+            return []
+        found = set(self.terms.get(terms[0], []))
+        for term in terms[1:]:
+            found &= set(self.terms.get(term, []))
+        return sorted(found)
+
+    def shots_with(self, query: str) -> List[str]:
+        """Every shot where a matching cue is heard (not merely listed as absent), in film order."""
+        order = {entry['key']: entry['index'] for entry in self.timeline}
+        shots = {shot for cue in self.find_cues(query) for shot in self.cues[cue]['shots']}
+        return sorted(shots, key=lambda shot: order.get(shot, len(order)))
+
+    def first_appearance(self, query: str) -> Optional[Dict[str, Any]]:
+        """Timeline entry of the first shot with a matching cue, with the cues it has."""
+        shots = self.shots_with(query)
+        if not shots:
+            return None
+        matched = set(self.find_cues(query))
+        entry = next(entry for entry in self.timeline if entry['key'] == shots[0])
+        return {**entry, 'cues': [cue for category, cue, _ in self.shots[shots[0]]['cues']
+                                  if cue in matched and category != 'absent']}
+
+    def spans(self, query: str) -> List[Dict[str, Any]]:
+        """Continuity spans of the shots with a matching cue."""
+        order = {entry['key']: entry['index'] for entry in self.timeline}
+        return continuity_spans([order[shot] for shot in self.shots_with(query) if shot in order], self.timeline)
+
+
+def main(query: str = ''):
+    """Main execution"""
+    catalog = AudioCatalog()
+    if not query or not catalog.shots:
+        print("🔊 Cataloguing audio cues...")
+        stats = catalog.update(load_shots(SHOTS_PATH))
+        catalog.save()
+        print(f"   {len(catalog.shots)} shots: {stats['changed']} changed, {stats['unchanged']} unchanged, "
+              f"{stats['removed']} removed")
+        print(f"   {len(catalog.cues)} cues in {len(catalog.clusters)} clusters")
+        for cluster in sorted(catalog.clusters.values(), key=lambda info: -len(info['shots']))[:10]:
+            print(f"   {len(cluster['shots']):4} shots, {len(cluster['spans']):2} spans  {cluster['label']}")
+
+    if query:
+        shots = catalog.shots_with(query)
+        first = catalog.first_appearance(query)
+        for span in catalog.spans(query):
+            print(f"   {span['start_seconds']:7.1f}s-{span['end_seconds']:7.1f}s  "
+                  f"{span['first_shot']} .. {span['last_shot']} ({span['shots']} shots)")
+        if first:
+            print(f"   First: {first['key']} at {first['start_seconds']:.1f}s ({', '.join(first['cues'])})")
+        print(f"\n✅ '{query}': {len(catalog.find_cues(query))} cues in {len(shots)} shots")
+    else:
+        print(f"\n✅ Catalog: {AUDIO_CATALOG_PATH}")
+
+
+if __name__ == "__main__":
+    main(' '.join(sys.argv[1:]))
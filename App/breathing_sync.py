@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Breathing-rate synchronization conflict detector.
+One pass over the film builds an entity index of every stated rate ("House 13/min",
+"empty clothes breathing 8/min", "Magnús ... 12/min"); the rules then run on the index.
+Stated rates are compared with the expected rates interpolated from
+breathing_rates_external.json, and inside sync windows (film ranges where two entities'
+expected rates agree) entities stated in the same shot must match each other.
+"""
+
+import json
+import re
+from collections import defaultdict
+from itertools import combinations
+from typing import Any, Dict, Iterator, List, Tuple
+
+import numpy as np
+
+from film_data import APP_PATH, ASCII_FOLD, SHOTS_PATH, fix_mojibake, load_json, load_shots, shot_position
+from tracking_engine import breathing_keyframes, interpolate_systems, keyframe_arrays
+
+BREATHING_REPORT_PATH = f"{APP_PATH}/breathing_sync_report.json"
+RATE_TOLERANCE = 2.0
+SYNC_GRID_STEP = 0.5
+# Shorter agreements are curves crossing, not intended synchronization
+MIN_SYNC_WINDOW = 5.0
+
+# Entity -> name forms as they appear in folded (lowercase, ASCII) text
+ENTITY_ALIASES = {
+    'magnus': ['magnus'],
+    'sigrid': ['sigrid'],
+    'gudrun': ['gudrun'],
+    'jon': ['jon'],
+    'lilja': ['lilja'],
+    'house_bergrisi': ['house', 'bergrisi'],
+    'empty_clothes': ['empty clothes', 'clothes']
+}
+
+# Shot fields that carry prose; generated fields (degradation_*, tracking_values) are skipped
+SHOT_FIELDS = ['progressive_state']
+METADATA_FIELDS = ['narrative_function']
+VARIANT_FIELDS = ['subject', 'action', 'scene', 'style', 'dialogue', 'progressive_state']
+
+_ALIAS_ENTITY = {alias: entity for entity, aliases in ENTITY_ALIASES.items() for alias in aliases}
+SCAN_PATTERN = re.compile(
+    r'(?P<entity>\b(?:' + '|'.join(sorted(map(re.escape, _ALIAS_ENTITY), key=len, reverse=True)) + r')\b)'
+    r'|(?P<rate>\d+(?:\.\d+)?)\s*(?:/\s*min\b|breaths? (?:per|a) minute)'
+    r'|(?P<boundary>[.!?|\n])')
+
+
+def fold_text(text: str) -> str:
+    return fix_mojibake(text).lower().translate(ASCII_FOLD)
+
+
+def scan_rates(text: str) -> Iterator[Tuple[str, float, int]]:
+    """Yield (entity, rate, offset) for each rate attributed to the nearest entity named
+    before it in the same sentence or progressive-state segment."""
+    folded = fold_text(text)
+    entity = None
+    for match in SCAN_PATTERN.finditer(folded):
+        if match.group('entity'):
+            entity = _ALIAS_ENTITY[match.group('entity')]
+        elif match.group('boundary'):
+            # Decimal points ("13.5/min") are not sentence ends
+            if match.group('boundary') != '.' or not folded[match.start() + 1:match.start() + 2].isdigit():
+                entity = None
+        elif entity is not None:
+            yield entity, float(match.group('rate')), match.start()
+
+
+def shot_texts(shot_data: Dict[str, Any]) -> Iterator[Tuple[str, str]]:
+    """(field path, text) for every prose field of a shot."""
+    for field in SHOT_FIELDS:
+        if shot_data.get(field):
+            yield field, shot_data[field]
+    metadata = shot_data.get('shot_metadata', {})
+    for field in METADATA_FIELDS:
+        if metadata.get(field):
+            yield f"shot_metadata.{field}", metadata[field]
+    for variant in shot_data.get('prompt_variants', []):
+        variant_id = variant.get('variant_id', '')
+        for field in VARIANT_FIELDS:
+            if variant.get(field):
+                yield f"{variant_id}.{field}", variant[field]
+        for cue in variant.get('audio', {}).get('ambient', []) + variant.get('audio', {}).get('primary', []):
+            if isinstance(cue, str):
+                yield f"{variant_id}.audio", cue
+
+
+def build_entity_index(shots: List[Tuple[str, Dict[str, Any]]]) -> Dict[str, List[Dict[str, Any]]]:
+    """entity -> [{row, shot_key, rate, field}] for every stated rate in the film."""
+    index = defaultdict(list)
+    for row, (shot_key, shot_data) in enumerate(shots):
+        for field, text in shot_texts(shot_data):
+            for entity, rate, _ in scan_rates(text):
+                index[entity].append({'row': row, 'shot_key': shot_key, 'rate': rate, 'field': field})
+    return dict(index)
+
+
+def expected_rates(positions: np.ndarray, app_path: str = APP_PATH) -> Dict[str, np.ndarray]:
+    """Interpolated expected rate per entity at every shot position."""
+    systems = breathing_keyframes(load_json(f"{app_path}/breathing_rates_external.json"))
+    names, xs, ys = keyframe_arrays(systems)
+    values = interpolate_systems(xs, ys, positions)
+    return {name[len('breathing_rate.'):]: values[:, column] for column, name in enumerate(names)}
+
+
+def sync_windows(app_path: str = APP_PATH, tolerance: float = RATE_TOLERANCE / 4) -> List[Dict[str, Any]]:
+    """Film ranges where two entities' expected rates agree; they should breathe together there."""
+    grid = np.arange(0.0, 100.0 + SYNC_GRID_STEP, SYNC_GRID_STEP)
+    expected = expected_rates(grid, app_path)
+    windows = []
+    for first, second in combinations(sorted(expected), 2):
+        together = np.abs(expected[first] - expected[second]) <= tolerance
+        # Run boundaries of the boolean mask
+        edges = np.flatnonzero(np.diff(np.concatenate(([0], together.astype(int), [0]))))
+        for start, end in zip(edges[::2], edges[1::2]):
+            if grid[end - 1] - grid[start] >= MIN_SYNC_WINDOW:
+                windows.append({'entities': [first, second],
+                                'start': float(grid[start]), 'end': float(grid[end - 1]),
+                                'rate': round(float(expected[first][start:end].mean()), 2)})
+    return windows
+
+
+def detect_conflicts(shots: List[Tuple[str, Dict[str, Any]]], app_path: str = APP_PATH,
+                     tolerance: float = RATE_TOLERANCE) -> Dict[str, Any]:
+    """Expected-rate and sync-window conflicts for the whole film, evaluated at the same
+    index-based shot positions as the tracking_values the tracking engine writes."""
+    positions = np.array([shot_position(index, len(shots)) for index in range(len(shots))])
+
+    index = build_entity_index(shots)
+    expected = expected_rates(positions, app_path)
+    windows = sync_windows(app_path)
+    conflicts = []
+
+    for entity, mentions in index.items():
+        if entity not in expected:
+            continue
+        for mention in mentions:
+            target = float(expected[entity][mention['row']])
+            if abs(mention['rate'] - target) > tolerance:
+                conflicts.append({'type': 'expected_rate', 'entity': entity, 'shot': mention['shot_key'],
+                                  'position': round(float(positions[mention['row']]), 2),
+                                  'stated': mention['rate'], 'expected': round(target, 2),
+                                  'field': mention['field']})
+
+    # Stated rates per (row, entity) for the sync rule
+    stated = defaultdict(set)
+    for entity, mentions in index.items():
+        for mention in mentions:
+            stated[(mention['row'], entity)].add(mention['rate'])
+    for window in windows:
+        first, second = window['entities']
+        for row in np.flatnonzero((positions >= window['start']) & (positions <= window['end'])):
+            first_rates, second_rates = stated.get((row, first)), stated.get((row, second))
+            if not first_rates or not second_rates:
+                continue
+            gap = min(abs(a - b) for a in first_rates for b in second_rates)
+            if gap > tolerance:
+                conflicts.append({'type': 'sync_window', 'entities': [first, second], 'shot': shots[row][0],
+                                  'position': round(float(positions[row]), 2),
+                                  'stated': [sorted(first_rates), sorted(second_rates)],
+                                  'window': [window['start'], window['end']]})
+
+    return {
+        'mentions': {entity: len(mentions) for entity, mentions in index.items()},
+        'sync_windows': windows,
+        'conflicts': sorted(conflicts, key=lambda conflict: conflict['position'])
+    }
+
+
+def main():
+    """Main execution"""
+    print("🫁 Checking breathing-rate synchronization...")
+    report = detect_conflicts(load_shots(SHOTS_PATH))
+
+    with open(BREATHING_REPORT_PATH, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+
+    for entity, count in report['mentions'].items():
+        print(f"   {entity}: {count} stated rates")
+    for window in report['sync_windows']:
+        print(f"   Sync {' + '.join(window['entities'])}: {window['start']:g}–{window['end']:g}% "
+              f"at ~{window['rate']:g}/min")
+    for conflict in report['conflicts']:
+        if conflict['type'] == 'expected_rate':
+            print(f"⚠️  {conflict['shot']}: {conflict['entity']} {conflict['stated']:g}/min, "
+                  f"expected {conflict['expected']:g}/min")
+        else:
+            print(f"⚠️  {conflict['shot']}: {' / '.join(conflict['entities'])} out of sync {conflict['stated']}")
+
+    print(f"\n✅ {len(report['conflicts'])} conflicts")
+    print(f"📄 Report: {BREATHING_REPORT_PATH}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Content-addressed, chunk-deduplicating snapshot store for the stories tree.
+Files are cut into content-defined chunks with a gear rolling hash, so an edit only
+changes the chunks around it and copies (Ultimate v7/v9, FINAL GENESIS v14 with and
+without .txt, "... copy.txt", the whole App copy/ tree) share every chunk. Each unique
+chunk is stored once, zlib-compressed, under its SHA-256; a snapshot is a manifest of
+per-file chunk lists, and files are reconstructed from it on demand.
+
+Usage: python3 chunk_store.py [snapshot name]
+"""
+
+import hashlib
+import json
+import sys
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from film_data import STORIES_PATH, load_json
+
+CHUNK_STORE_PATH = f"{STORIES_PATH}/.chunk_store"
+# Paths (relative to the stories tree) never snapshotted
+EXCLUDED_PARTS = {'.git', '.chunk_store', 'cache', '__pycache__'}
+EXCLUDED_NAMES = {'.DS_Store'}
+
+MIN_CHUNK = 2 * 1024
+AVERAGE_CHUNK = 8 * 1024
+MAX_CHUNK = 64 * 1024
+# A boundary needs the top bits of the hash to be zero: 13 bits for 8 KiB chunks
+BOUNDARY_MASK = ((1 << (AVERAGE_CHUNK.bit_length() - 1)) - 1) << (64 - (AVERAGE_CHUNK.bit_length() - 1))
+MASK_64 = (1 << 64) - 1
+# The gear hash only remembers the last 64 bytes, so hashing can start just before MIN_CHUNK
+GEAR_WINDOW = 64
+
+# Deterministic 64-bit gear table; changing it changes every chunk boundary
+GEAR = [int.from_bytes(hashlib.sha256(bytes([value])).digest()[:8], 'little') for value in range(256)]
+
+
+def chunk_boundaries(data: bytes) -> Iterator[Tuple[int, int]]:
+    """(start, end) of each content-defined chunk of data."""
+    start = 0
+    size = len(data)
+    while start < size:
+        if size - start <= MIN_CHUNK:
+            yield start, size
+            return
+        limit = min(size, start + MAX_CHUNK)
+        end = limit
+        fingerprint = 0
+        for position in range(start + MIN_CHUNK - GEAR_WINDOW, limit):
+            fingerprint = ((fingerprint << 1) + GEAR[data[position]]) & MASK_64
+            if position >= start + MIN_CHUNK and not fingerprint & BOUNDARY_MASK:
+                end = position + 1
+                break
+        yield start, end
+        start = end
+
+
+def snapshot_files(root: Path) -> List[Path]:
+    return sorted(path for path in root.rglob('*')
+                  if path.is_file() and path.name not in EXCLUDED_NAMES
+                  and not EXCLUDED_PARTS.intersection(path.relative_to(root).parts[:-1]))
+
+
+class ChunkStore:
+    """chunks/<2 hex>/<sha256> blobs plus snapshots/<name>.json manifests."""
+
+    def __init__(self, store_path: str = CHUNK_STORE_PATH):
+        self.path = Path(store_path)
+        self.chunks_path = self.path / 'chunks'
+        self.snapshots_path = self.path / 'snapshots'
+
+    def _chunk_file(self, digest: str) -> Path:
+        return self.chunks_path / digest[:2] / digest
+
+    def put_bytes(self, data: bytes) -> Tuple[List[str], int]:
+        """Store data's chunks; returns (chunk digests, bytes newly written)."""
+        digests = []
+        written = 0
+        for start, end in chunk_boundaries(data):
+            chunk = data[start:end]
+            digest = hashlib.sha256(chunk).hexdigest()
+            chunk_file = self._chunk_file(digest)
+            if not chunk_file.exists():
+                chunk_file.parent.mkdir(parents=True, exist_ok=True)
+                compressed = zlib.compress(chunk, 6)
+                chunk_file.write_bytes(compressed)
+                written += len(compressed)
+            digests.append(digest)
+        return digests, written
+
+    def get_bytes(self, digests: List[str]) -> bytes:
+        return b''.join(zlib.decompress(self._chunk_file(digest).read_bytes()) for digest in digests)
+
+    def snapshot(self, root: str = STORIES_PATH, name: Optional[str] = None) -> Dict[str, Any]:
+        """Snapshot every file under root. Files whose size and mtime match the latest
+        snapshot reuse its chunk list without being read."""
+        root = Path(root)
+        previous = self.load_snapshot(self.latest()) if self.latest() else {}
+        known = previous.get('files', {})
+        files = {}
+        written = 0
+        for path in snapshot_files(root):
+            relative = str(path.relative_to(root))
+            stat = path.stat()
+            entry = known.get(relative)
+            if entry and entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns:
+                files[relative] = entry
+                continue
+            data = path.read_bytes()
+            digests, new_bytes = self.put_bytes(data)
+            written += new_bytes
+            files[relative] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns,
+                               'sha256': hashlib.sha256(data).hexdigest(), 'chunks': digests}
+
+        name = name or time.strftime('%Y%m%d-%H%M%S')
+        manifest = {'name': name, 'root': str(root), 'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                    'files': files, 'written_bytes': written}
+        self.snapshots_path.mkdir(parents=True, exist_ok=True)
+        with open(self.snapshots_path / f"{name}.json", 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2, ensure_ascii=False)
+        return manifest
+
+    def snapshots(self) -> List[str]:
+        return sorted(path.stem for path in self.snapshots_path.glob('*.json'))
+
+    def latest(self) -> Optional[str]:
+        names = self.snapshots()
+        return names[-1] if names else None
+
+    def load_snapshot(self, name: str) -> Dict[str, Any]:
+        return load_json(self.snapshots_path / f"{name}.json")
+
+    def restore_file(self, name: str, relative: str, destination: Optional[str] = None) -> bytes:
+        """A file as it was in a snapshot, verified against its hash; written out if a
+        destination is given."""
+        entry = self.load_snapshot(name)['files'][relative]
+        data = self.get_bytes(entry['chunks'])
+        if hashlib.sha256(data).hexdigest() != entry['sha256']:
+            raise ValueError(f"Corrupt chunk data for {relative} in snapshot {name}")
+        if destination:
+            Path(destination).parent.mkdir(parents=True, exist_ok=True)
+            Path(destination).write_bytes(data)
+        return data
+
+    def stats(self, name: Optional[str] = None) -> Dict[str, Any]:
+        """Logical size of a snapshot against the unique chunk data it needs, and the real
+        size of the whole store on disk."""
+        files = self.load_snapshot(name or self.latest()).get('files', {})
+        unique = {digest for entry in files.values() for digest in entry['chunks']}
+        stored = sum(path.stat().st_size for path in self.chunks_path.rglob('*') if path.is_file())
+        duplicates = {}
+        for relative, entry in files.items():
+            duplicates.setdefault(entry['sha256'], []).append(relative)
+        return {
+            'files': len(files),
+            'logical_bytes': sum(entry['size'] for entry in files.values()),
+            'unique_chunks': len(unique),
+            'chunk_references': sum(len(entry['chunks']) for entry in files.values()),
+            'stored_bytes': stored,
+            'identical_copies': [paths for paths in duplicates.values() if len(paths) > 1]
+        }
+
+
+def main(name: Optional[str] = None):
+    """Main execution"""
+    print("🗄  Snapshotting stories tree into the chunk store...")
+    store = ChunkStore()
+    start = time.perf_counter()
+    manifest = store.snapshot(name=name)
+    stats = store.stats(manifest['name'])
+
+    print(f"   Snapshot {manifest['name']}: {stats['files']} files in {time.perf_counter() - start:.1f}s, "
+          f"{manifest['written_bytes'] / 1e6:.1f} MB new chunk data")
+    print(f"   Logical size: {stats['logical_bytes'] / 1e6:.1f} MB")
+    print(f"   Stored size:  {stats['stored_bytes'] / 1e6:.1f} MB "
+          f"({stats['unique_chunks']} unique of {stats['chunk_references']} chunks)")
+    for paths in stats['identical_copies'][:10]:
+        print(f"   = {' | '.join(paths)}")
+    print(f"\n✅ {len(store.snapshots())} snapshots in {CHUNK_STORE_PATH}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1] if len(sys.argv) > 1 else None)
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Streaming extractive compaction of the research documents (replaces the hand-made
+MegaPrompt/compaction/ outputs, which drift from their sources).
+Each source is streamed line by line and cut into sections at heading-like lines.
+Sentences are scored by salience against the project glossary (character names, plate
+IDs, tracking-system terms) plus how central their words are to the section, and the
+best sentences are kept, in their original order, up to a share of each section and
+an overall size budget. Scored sections are cached by content hash, so when a source
+grows only its new or edited sections are scored again.
+"""
+
+import hashlib
+import json
+import math
+import re
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Tuple
+
+from film_data import APP_PATH, CACHE_PATH, CHARACTER_KEYS, STORIES_PATH, load_json
+from research_index import fold, tokenize
+
+COMPACTION_OUTPUT_PATH = f"{STORIES_PATH}/MegaPrompt/compaction/auto"
+COMPACTION_CACHE_PATH = f"{CACHE_PATH}/compaction"
+# Bump when scoring changes so cached sections are rescored
+COMPACTION_VERSION = 1
+
+# Output name -> sources (relative to the stories tree) compacted into it
+COMPACTION_JOBS = {
+    'condensed_research': ['MegaPrompt/combined_research.txt'],
+    'compacted_old_research': ['combined_old_research.txt'],
+    'compacted_google_opinions': ['MegaPrompt/combined_google_opinions.txt'],
+    'condensed_cinematic_analysis': ['MegaPrompt/cinema_research.txt'],
+    'condensed_documentation': ['MegaPrompt/documentation.txt', 'MegaPrompt/consultants_documentation.txt'],
+    'nostalgia_compacted': ['MegaPrompt/nostalgia_research_upper.txt', 'MegaPrompt/nostalgia_research_lower.txt'],
+    'thinking_notes_compacted': ['MegaPrompt/thinking_notes.txt']
+}
+
+# Share of each section kept, and the cap on a whole output
+SECTION_RATIO = 0.12
+OUTPUT_BUDGET = 60_000
+SECTION_MAX_CHARS = 8_000
+
+CHARACTER_WEIGHT = 3.0
+PLATE_WEIGHT = 2.0
+TRACKING_WEIGHT = 1.5
+NUMBER_BONUS = 0.3
+LEAD_BONUS = 0.5
+# Words of tracking-system names too generic to signal relevance
+GENERIC_TRACKING_WORDS = {'progression', 'formation', 'coordination'}
+STOPWORDS = set('the a an and or of to in on for with as at by from is are was were be been it its this that '
+                'these those their his her they we you your our but not no into than then so if which who '
+                'what when where how all can will would should could has have had more most'.split())
+
+SENTENCE_PATTERN = re.compile(r'(?<=[.!?])\s+(?=[A-Z0-9"“(\[])')
+NUMBER_PATTERN = re.compile(r'\d')
+HEADING_END = tuple('.,;:!?"”)')
+
+
+def build_glossary(app_path: str = APP_PATH) -> Dict[str, Any]:
+    """Weighted folded terms plus a pattern for plate IDs."""
+    terms = {key: CHARACTER_WEIGHT for key in CHARACTER_KEYS}
+    for system in load_json(f"{app_path}/main_film_system.json").get('tracking_systems', {}):
+        for word in fold(system).split('_'):
+            if word not in GENERIC_TRACKING_WORDS:
+                terms.setdefault(word, TRACKING_WEIGHT)
+    plate_ids = [plate_id for name in ('character_plates_index.json', 'environmental_plates_index.json')
+                 for plate_id in load_json(f"{app_path}/{name}").get('plate_index', {})
+                 if 3 < len(plate_id) <= 30]
+    return {
+        'terms': terms,
+        'plate_pattern': re.compile(r'\b(?:' + '|'.join(sorted(map(re.escape, plate_ids), key=len, reverse=True))
+                                    + r')\b') if plate_ids else None
+    }
+
+
+def glossary_digest(glossary: Dict[str, Any]) -> str:
+    pattern = glossary['plate_pattern'].pattern if glossary['plate_pattern'] else ''
+    return hashlib.sha256(json.dumps([COMPACTION_VERSION, sorted(glossary['terms'].items()), pattern])
+                          .encode('utf-8')).hexdigest()[:16]
+
+
+def is_heading(line: str) -> bool:
+    """Short title-like line: no sentence punctuation at the end and no "Label: value"."""
+    text = line.strip().lstrip('#').strip()
+    return (3 <= len(text) < 90 and len(text.split()) >= 2 and ': ' not in text
+            and not text.endswith(HEADING_END) and (text[0].isupper() or text[0].isdigit()))
+
+
+def stream_sections(path: str) -> Iterator[Tuple[str, str]]:
+    """(heading, body) sections of a file, read line by line."""
+    heading = ''
+    body: List[str] = []
+    size = 0
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        for line in f:
+            if is_heading(line) or size > SECTION_MAX_CHARS:
+                if body:
+                    yield heading, ''.join(body)
+                heading, body, size = (line.strip(), [], 0) if is_heading(line) else (heading, [line], len(line))
+                continue
+            body.append(line)
+            size += len(line)
+    if body:
+        yield heading, ''.join(body)
+
+
+def score_section(body: str, glossary: Dict[str, Any]) -> List[Tuple[str, float]]:
+    """(sentence, salience) for every sentence of a section, in order."""
+    sentences = [sentence.strip() for paragraph in body.split('\n')
+                 for sentence in SENTENCE_PATTERN.split(paragraph) if len(sentence.split()) >= 3]
+    tokens = [[token for token in tokenize(sentence) if token not in STOPWORDS] for sentence in sentences]
+    frequency = Counter(token for sentence_tokens in tokens for token in set(sentence_tokens))
+    scored = []
+    for index, (sentence, sentence_tokens) in enumerate(zip(sentences, tokens)):
+        distinct = set(sentence_tokens)
+        score = sum(glossary['terms'].get(token, 0.0) for token in distinct)
+        if glossary['plate_pattern'] is not None:
+            score += PLATE_WEIGHT * len(set(glossary['plate_pattern'].findall(sentence)))
+        # Centrality: words the rest of the section keeps returning to
+        score += sum(frequency[token] - 1 for token in distinct) / max(1, len(sentences)) * 2
+        score /= math.sqrt(max(1, len(sentence_tokens)) / 10)
+        if NUMBER_PATTERN.search(sentence):
+            score += NUMBER_BONUS
+        if index == 0:
+            score += LEAD_BONUS
+        scored.append((sentence, round(score, 4)))
+    return scored
+
+
+def select_sentences(scored: List[Tuple[str, float]], budget: int) -> List[int]:
+    """Indices of the best sentences fitting in budget characters, in document order."""
+    chosen = []
+    used = 0
+    for index in sorted(range(len(scored)), key=lambda i: -scored[i][1]):
+        length = len(scored[index][0]) + 1
+        if used + length > budget and chosen:
+            continue
+        chosen.append(index)
+        used += length
+    return sorted(chosen)
+
+
+def compact_sources(sources: List[str], glossary: Dict[str, Any], cache: Dict[str, Any],
+                    budget: int = OUTPUT_BUDGET) -> Tuple[str, Dict[str, Any], Dict[str, int]]:
+    """Compacted text for the sources; returns (text, cache entries used, section stats)."""
+    salt = glossary_digest(glossary)
+    used_cache = {}
+    stats = {'sections': 0, 'scored': 0}
+    sections = []
+    for path in sources:
+        if not Path(path).exists():
+            print(f"⚠️  Missing source: {path}")
+            continue
+        for heading, body in stream_sections(path):
+            digest = hashlib.sha256(f"{salt}\n{heading}\n{body}".encode('utf-8')).hexdigest()
+            if digest not in cache:
+                cache[digest] = score_section(body, glossary)
+                stats['scored'] += 1
+            used_cache[digest] = cache[digest]
+            stats['sections'] += 1
+            scored = cache[digest]
+            keep = select_sentences(scored, max(200, int(len(body) * SECTION_RATIO)))
+            sections.append((heading, [scored[index] for index in keep]))
+
+    # Overall cap: drop the weakest kept sentences across all sections (headings counted as kept)
+    total = sum(len(heading) + 2 + sum(len(sentence) + 1 for sentence, _ in kept) for heading, kept in sections)
+    if total > budget:
+        ranked = sorted(((score, s, k) for s, (_, kept) in enumerate(sections) for k, (_, score) in enumerate(kept)))
+        dropped = set()
+        for score, section_index, kept_index in ranked:
+            if total <= budget:
+                break
+            dropped.add((section_index, kept_index))
+            total -= len(sections[section_index][1][kept_index][0]) + 1
+        sections = [(heading, [item for k, item in enumerate(kept) if (s, k) not in dropped])
+                    for s, (heading, kept) in enumerate(sections)]
+
+    parts = []
+    for heading, kept in sections:
+        if not kept:
+            continue
+        parts.append((f"{heading}\n" if heading else '') + ' '.join(sentence for sentence, _ in kept))
+    return '\n\n'.join(parts) + '\n', used_cache, stats
+
+
+def run_job(name: str, sources: List[str], glossary: Dict[str, Any], stories_path: str = STORIES_PATH,
+            output_path: str = COMPACTION_OUTPUT_PATH, cache_path: str = COMPACTION_CACHE_PATH) -> Dict[str, Any]:
+    """Compact one output, reusing and then pruning its section cache."""
+    cache_file = Path(cache_path) / f"{name}.json"
+    cache = {digest: [tuple(item) for item in scored] for digest, scored in load_json(cache_file).items()}
+    text, used_cache, stats = compact_sources([f"{stories_path}/{source}" for source in sources], glossary, cache)
+
+    Path(output_path).mkdir(parents=True, exist_ok=True)
+    output_file = Path(output_path) / f"{name}.txt"
+    changed = not output_file.exists() or output_file.read_text(encoding='utf-8') != text
+    if changed:
+        output_file.write_text(text, encoding='utf-8')
+    if stats['scored'] or len(used_cache) != len(cache):
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(cache_file, 'w', encoding='utf-8') as f:
+            json.dump(used_cache, f, ensure_ascii=False)
+    source_size = sum(Path(f"{stories_path}/{source}").stat().st_size
+                      for source in sources if Path(f"{stories_path}/{source}").exists())
+    return {'name': name, 'source_bytes': source_size, 'output_bytes': len(text.encode('utf-8')),
+            'changed': changed, **stats}
+
+
+def main():
+    """Main execution"""
+    print("🗜  Compacting research documents...")
+    glossary = build_glossary()
+    print(f"   Glossary: {len(glossary['terms'])} terms + plate IDs")
+    for name, sources in COMPACTION_JOBS.items():
+        result = run_job(name, sources, glossary)
+        status = 'updated' if result['changed'] else 'unchanged'
+        print(f"   {name}: {result['source_bytes'] / 1000:.0f}k -> {result['output_bytes'] / 1000:.0f}k, "
+              f"{result['scored']}/{result['sections']} sections rescored ({status})")
+    print(f"\n✅ Compacted outputs in {COMPACTION_OUTPUT_PATH}")
+
+
+if __name__ == "__main__":
+    main()
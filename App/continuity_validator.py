@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Incremental continuity validator for story quantities that should only move one way.
+Tracks come from progressive_state (see progressive_state.py). Alternate shots sharing an
+ID form one slot; consecutive slots in the same sequence are checked against declared
+direction and max-step rules. Editing, inserting or removing a shot re-checks only the
+pairs around its slot.
+"""
+
+import json
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+
+from film_data import APP_PATH, SHOTS_PATH, extract_numeric_from_id, load_shots
+from progressive_state import parse_progressive_state, shot_progressive_state
+
+REPORT_PATH = f"{APP_PATH}/continuity_report.json"
+
+# track -> rule; max_step is the largest change allowed between neighbouring slots (None = no limit)
+CONTINUITY_RULES = {
+    'camera_frost.percent': {'direction': 'increasing', 'max_step': None},
+    'klettagja.mm': {'direction': 'increasing', 'max_step': 1.0},
+    'temperature.celsius': {'direction': 'decreasing', 'max_step': 10.0},
+    'sigrid.feet': {'direction': 'increasing', 'max_step': None}
+}
+
+Slot = Tuple[str, str]
+
+
+def shot_slot(shot_data: Dict[str, Any]) -> Slot:
+    """(sequence group, shot ID); alternates of one shot share a slot."""
+    metadata = shot_data.get('shot_metadata', {})
+    group = 'prologue' if metadata.get('sequence_type') == 'prologue' else 'main'
+    return group, str(metadata.get('id', '')).lower()
+
+
+def slot_sort_key(slot: Slot) -> Tuple[int, float, str]:
+    return (0 if slot[0] == 'prologue' else 1, extract_numeric_from_id(slot[1]), slot[1])
+
+
+def shot_quantities(shot_data: Dict[str, Any]) -> Dict[str, float]:
+    """Track values for one shot; a repeated quantity keeps the last mention."""
+    return dict(parse_progressive_state(shot_progressive_state(shot_data)))
+
+
+class ContinuityValidator:
+    """Slot-ordered track values plus the current set of rule violations."""
+
+    def __init__(self, rules: Dict[str, Dict[str, Any]] = CONTINUITY_RULES):
+        self.rules = rules
+        self.slots: List[Slot] = []
+        self.slot_keys: List[Tuple[int, float, str]] = []
+        self.members: Dict[Slot, List[str]] = defaultdict(list)
+        self.shot_slots: Dict[str, Slot] = {}
+        # track -> shot key -> value
+        self.values: Dict[str, Dict[str, float]] = {track: {} for track in rules}
+        # (track, from slot, to slot) -> violation
+        self.violations: Dict[Tuple[str, Slot, Slot], Dict[str, Any]] = {}
+
+    @classmethod
+    def from_shots(cls, shots: List[Tuple[str, Dict[str, Any]]],
+                   rules: Dict[str, Dict[str, Any]] = CONTINUITY_RULES) -> 'ContinuityValidator':
+        validator = cls(rules)
+        for shot_key, shot_data in shots:
+            validator._add(shot_key, shot_data)
+        validator.validate_all()
+        return validator
+
+    # Slot bookkeeping
+
+    def _add(self, shot_key: str, shot_data: Dict[str, Any]) -> Slot:
+        slot = shot_slot(shot_data)
+        if not self.members[slot]:
+            sort_key = slot_sort_key(slot)
+            index = bisect_left(self.slot_keys, sort_key)
+            self.slot_keys.insert(index, sort_key)
+            self.slots.insert(index, slot)
+        self.members[slot].append(shot_key)
+        self.shot_slots[shot_key] = slot
+        quantities = shot_quantities(shot_data)
+        for track, values in self.values.items():
+            if track in quantities:
+                values[shot_key] = quantities[track]
+        return slot
+
+    def _discard(self, shot_key: str) -> Slot:
+        slot = self.shot_slots.pop(shot_key)
+        self.members[slot].remove(shot_key)
+        if not self.members[slot]:
+            del self.members[slot]
+            index = bisect_left(self.slot_keys, slot_sort_key(slot))
+            del self.slot_keys[index]
+            del self.slots[index]
+        for values in self.values.values():
+            values.pop(shot_key, None)
+        return slot
+
+    def _slot_range(self, track: str, slot: Slot) -> Optional[Tuple[float, float]]:
+        """(min, max) of a track over a slot's alternates, or None if none of them state it."""
+        values = self.values[track]
+        found = [values[key] for key in self.members.get(slot, ()) if key in values]
+        return (min(found), max(found)) if found else None
+
+    def _nearest(self, track: str, index: int, step: int, group: str) -> Optional[int]:
+        """Nearest slot index from `index` (inclusive) in direction `step`, within one sequence
+        group, whose shots state the track."""
+        while 0 <= index < len(self.slots) and self.slots[index][0] == group:
+            if self._slot_range(track, self.slots[index]) is not None:
+                return index
+            index += step
+        return None
+
+    # Checks
+
+    def _check_pair(self, track: str, first: Slot, second: Slot) -> None:
+        rule = self.rules[track]
+        self.violations.pop((track, first, second), None)
+        first_range = self._slot_range(track, first)
+        second_range = self._slot_range(track, second)
+        if first_range is None or second_range is None:
+            return
+
+        problems = []
+        if rule.get('direction') == 'increasing' and first_range[1] > second_range[0]:
+            problems.append(f"decreases from {first_range[1]:g} to {second_range[0]:g}")
+        elif rule.get('direction') == 'decreasing' and first_range[0] < second_range[1]:
+            problems.append(f"increases from {first_range[0]:g} to {second_range[1]:g}")
+        step = max(second_range[1] - first_range[0], first_range[1] - second_range[0])
+        if rule.get('max_step') is not None and step > rule['max_step']:
+            problems.append(f"changes by {step:g} (max {rule['max_step']:g})")
+
+        if problems:
+            self.violations[(track, first, second)] = {
+                'track': track,
+                'from_shots': list(self.members[first]),
+                'to_shots': list(self.members[second]),
+                'from_range': list(first_range),
+                'to_range': list(second_range),
+                'problems': problems
+            }
+
+    def _recheck_around(self, slot: Slot) -> None:
+        """Re-check the pairs a change at `slot` can affect, for every track."""
+        index = bisect_left(self.slot_keys, slot_sort_key(slot))
+        present = index < len(self.slots) and self.slots[index] == slot
+        group = slot[0]
+        for track in self.rules:
+            for key in [key for key in self.violations if key[0] == track and slot in key[1:]]:
+                del self.violations[key]
+            before = self._nearest(track, index - 1, -1, group)
+            after = self._nearest(track, index + 1 if present else index, 1, group)
+            if present and self._slot_range(track, slot) is not None:
+                if before is not None:
+                    self._check_pair(track, self.slots[before], slot)
+                if after is not None:
+                    self._check_pair(track, slot, self.slots[after])
+                # The slot now sits between them, so their direct pair no longer exists
+                if before is not None and after is not None:
+                    self.violations.pop((track, self.slots[before], self.slots[after]), None)
+            elif before is not None and after is not None:
+                self._check_pair(track, self.slots[before], self.slots[after])
+
+    def validate_all(self) -> List[Dict[str, Any]]:
+        self.violations.clear()
+        for track in self.rules:
+            previous = None
+            for slot in self.slots:
+                if previous is not None and previous[0] != slot[0]:
+                    previous = None
+                if self._slot_range(track, slot) is None:
+                    continue
+                if previous is not None:
+                    self._check_pair(track, previous, slot)
+                previous = slot
+        return self.report()
+
+    # Edits
+
+    def update_shot(self, shot_key: str, shot_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Re-read one shot (new quantities, or moved to another slot) and re-check its neighbours."""
+        old_slot = self._discard(shot_key) if shot_key in self.shot_slots else None
+        new_slot = self._add(shot_key, shot_data)
+        if old_slot is not None and old_slot != new_slot:
+            self._recheck_around(old_slot)
+        self._recheck_around(new_slot)
+        return self.report()
+
+    insert_shot = update_shot
+
+    def remove_shot(self, shot_key: str) -> List[Dict[str, Any]]:
+        self._recheck_around(self._discard(shot_key))
+        return self.report()
+
+    def report(self) -> List[Dict[str, Any]]:
+        """Violations in film order."""
+        return [self.violations[key] for key in
+                sorted(self.violations, key=lambda key: (key[0], slot_sort_key(key[1])))]
+
+
+def validate_film(shots_dir: str = SHOTS_PATH) -> Dict[str, Any]:
+    """Validate every shot from scratch."""
+    start = time.perf_counter()
+    validator = ContinuityValidator.from_shots(load_shots(shots_dir))
+    elapsed = time.perf_counter() - start
+    return {
+        'rules': validator.rules,
+        'slot_count': len(validator.slots),
+        'elapsed_ms': round(elapsed * 1000, 2),
+        'violations': validator.report()
+    }
+
+
+def main():
+    """Main execution"""
+    print("🔎 Checking continuity of progressive quantities...")
+    report = validate_film()
+
+    with open(REPORT_PATH, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+
+    for violation in report['violations']:
+        print(f"⚠️  {violation['track']}: {', '.join(violation['from_shots'])} -> "
+              f"{', '.join(violation['to_shots'])}: {'; '.join(violation['problems'])}")
+    print(f"\n✅ {report['slot_count']} shot slots checked in {report['elapsed_ms']}ms, "
+          f"{len(report['violations'])} violations")
+    print(f"📄 Report: {REPORT_PATH}")
+
+
+if __name__ == "__main__":
+    main()
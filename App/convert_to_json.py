@@ -5,6 +5,10 @@ import os
 import json
 from pathlib import Path
 
+from glossary_tagger import GLOSSARY, build_tagger
+
+_character_tagger = build_tagger({key: entry for key, entry in GLOSSARY.items() if entry[0] == 'character'})
+
 def parse_shot_content(content):
     """Parse shot content into structured data"""
     lines = content.strip().split('\n')
@@ -155,24 +159,17 @@ def parse_sounds(sounds_text):
 
 def extract_characters(subject, action):
     """Extract character references from subject and action text"""
-    characters = []
-    
-    # Look for character references in brackets
-    char_matches = re.findall(r'\[([A-Z][A-ZÉÍÓÚ]*)\]', subject + ' ' + action)
-    
+    # Any spelling counts, bracketed or not: [MAGNÚS], Magnús, Magnus, mojibake MagnÃºs
     character_map = {
-        'MAGNÚS': 'MAGNÚS',
-        'SIGRID': 'SIGRID', 
-        'GUÐRÚN': 'GUÐRÚN',
-        'JÓN': 'JÓN',
-        'LILJA': 'LILJA'
+        'magnus': 'MAGNÚS',
+        'sigrid': 'SIGRID',
+        'gudrun': 'GUÐRÚN',
+        'jon': 'JÓN',
+        'lilja': 'LILJA'
     }
     
-    for char in char_matches:
-        if char in character_map:
-            characters.append(character_map[char])
-    
-    return characters
+    found = {key for key, _, _ in _character_tagger.matches(subject + ' ' + action)}
+    return [name for key, name in character_map.items() if key in found]
 
 def determine_character_plates(characters, sequence_type, film_position):
     """Determine appropriate character plates based on film position"""
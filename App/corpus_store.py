@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Memory-mapped access to the large source texts (v18, v7, whole context.txt, v18_cleaned.txt...).
+Each file is mapped read-only, and its line and paragraph offsets are built once and
+persisted under the cache keyed by the file's content hash. Line ranges and paragraphs come
+back as memoryviews into the mapping, so showing a few lines never reads the whole file.
+The splitter and plate parsers read their inputs through read_text().
+
+Usage: python3 corpus_store.py <file> [first line] [last line]
+"""
+
+import hashlib
+import mmap
+import os
+import re
+import struct
+import sys
+from array import array
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple
+
+from film_data import CACHE_PATH
+
+OFFSETS_PATH = f"{CACHE_PATH}/corpus_offsets"
+HASH_CHUNK = 1 << 20
+NEWLINE = re.compile(rb'\n')
+BLANK_LINE = re.compile(rb'[ \t\r\f\v]*\n?')
+
+
+class CorpusFile:
+    """A read-only mapped text file with 0-based line and paragraph access."""
+
+    def __init__(self, path, offsets_path: str = OFFSETS_PATH):
+        self.path = Path(path)
+        self.offsets_path = str(offsets_path)
+        stat = self.path.stat()
+        self.mtime_ns = stat.st_mtime_ns
+        self.data = _map(self.path)
+        self.view = memoryview(self.data)
+        self.digest = self._hash()
+        self.line_starts, self.paragraphs = self._load_offsets(Path(offsets_path) / f"{self.digest}.idx")
+
+    def _hash(self) -> str:
+        digest = hashlib.sha256()
+        for start in range(0, len(self.view), HASH_CHUNK):
+            digest.update(self.view[start:start + HASH_CHUNK])
+        return digest.hexdigest()[:24]
+
+    def _build_offsets(self) -> Tuple[array, array]:
+        """Start offset of every line (plus end of file), and (first, last + 1) line of every
+        paragraph, a paragraph being a run of non-blank lines."""
+        line_starts = array('q', [0])
+        line_starts.extend(match.end() for match in NEWLINE.finditer(self.data))
+        if line_starts[-1] != len(self.view):
+            line_starts.append(len(self.view))
+        paragraphs = array('q')
+        first = None
+        for line in range(len(line_starts) - 1):
+            blank = BLANK_LINE.fullmatch(self.data, line_starts[line], line_starts[line + 1]) is not None
+            if not blank and first is None:
+                first = line
+            elif blank and first is not None:
+                paragraphs.extend((first, line))
+                first = None
+        if first is not None:
+            paragraphs.extend((first, len(line_starts) - 1))
+        return line_starts, paragraphs
+
+    def _load_offsets(self, index_file: Path) -> Tuple[array, array]:
+        """Offsets from the persisted index (<line count> <paragraph pairs> then both arrays)."""
+        if index_file.exists():
+            raw = index_file.read_bytes()
+            line_count, pair_count = struct.unpack_from('<qq', raw)
+            values = array('q')
+            values.frombytes(raw[16:])
+            return values[:line_count], values[line_count:line_count + pair_count * 2]
+        line_starts, paragraphs = self._build_offsets()
+        index_file.parent.mkdir(parents=True, exist_ok=True)
+        index_file.write_bytes(struct.pack('<qq', len(line_starts), len(paragraphs) // 2)
+                               + line_starts.tobytes() + paragraphs.tobytes())
+        return line_starts, paragraphs
+
+    @property
+    def line_count(self) -> int:
+        return len(self.line_starts) - 1
+
+    @property
+    def paragraph_count(self) -> int:
+        return len(self.paragraphs) // 2
+
+    def lines(self, start: int, stop: int) -> memoryview:
+        """Bytes of lines [start, stop), newlines included; no copy."""
+        start = max(0, min(start, self.line_count))
+        stop = max(start, min(stop, self.line_count))
+        return self.view[self.line_starts[start]:self.line_starts[stop]]
+
+    def paragraph(self, index: int) -> memoryview:
+        return self.lines(self.paragraphs[index * 2], self.paragraphs[index * 2 + 1])
+
+    def paragraph_lines(self, index: int) -> Tuple[int, int]:
+        """[first, last + 1) line numbers of a paragraph."""
+        return self.paragraphs[index * 2], self.paragraphs[index * 2 + 1]
+
+    def iter_paragraphs(self) -> Iterator[memoryview]:
+        for index in range(self.paragraph_count):
+            yield self.paragraph(index)
+
+    def text(self, start: int = 0, stop: Optional[int] = None, errors: str = 'strict') -> str:
+        """Decoded text of lines [start, stop) (the whole file by default)."""
+        return bytes(self.lines(start, self.line_count if stop is None else stop)).decode('utf-8', errors)
+
+    def close(self) -> None:
+        """Unmap the file; a mapping callers still hold views into is freed with the last view."""
+        try:
+            self.view.release()
+            if isinstance(self.data, mmap.mmap):
+                self.data.close()
+        except BufferError:
+            pass
+
+
+def _map(path: Path):
+    """Read-only mapping of a file (b'' when empty, which mmap cannot map). The mapping keeps
+    its own descriptor, so the file is closed straight away."""
+    with open(path, 'rb') as f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if os.fstat(f.fileno()).st_size else b''
+
+
+_open_files: Dict[Path, CorpusFile] = {}
+
+
+def open_corpus(path, offsets_path: str = OFFSETS_PATH) -> CorpusFile:
+    """Shared CorpusFile for a path, remapped (and the old mapping closed) when the file
+    changes on disk."""
+    path = Path(path).resolve()
+    stat = path.stat()
+    corpus = _open_files.get(path)
+    if corpus is not None and len(corpus.view) == stat.st_size and corpus.mtime_ns == stat.st_mtime_ns \
+            and corpus.offsets_path == str(offsets_path):
+        return corpus
+    if corpus is not None:
+        corpus.close()
+    corpus = _open_files[path] = CorpusFile(path, offsets_path)
+    return corpus
+
+
+def read_text(path, errors: str = 'strict') -> str:
+    """Drop-in replacement for open(path).read() on a corpus file (newlines translated).
+    A one-off read decodes a plain mapping; it neither hashes the file nor writes an index."""
+    data = _map(Path(path))
+    try:
+        text = str(data, 'utf-8', errors)
+    finally:
+        if isinstance(data, mmap.mmap):
+            data.close()
+    return text.replace('\r\n', '\n').replace('\r', '\n') if '\r' in text else text
+
+
+def main():
+    """Main execution"""
+    if len(sys.argv) < 2:
+        print("Usage: python3 corpus_store.py <file> [first line] [last line]")
+        return
+    corpus = open_corpus(sys.argv[1])
+    print(f"📄 {corpus.path.name}: {corpus.line_count} lines, {corpus.paragraph_count} paragraphs "
+          f"(index {corpus.digest})")
+    if len(sys.argv) > 2:
+        first = int(sys.argv[2])
+        last = int(sys.argv[3]) if len(sys.argv) > 3 else first
+        print(corpus.text(first - 1, last))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Degradation-curve engine for the Fading Witness Protocol (Degradation_protocol.txt).
+The protocol's act structure, five degradation stages, three visual-system threads and
+modern-intrusion pattern are encoded as parameter tables. Curves are keyed by position
+within an act, so changing the act boundaries re-parameterizes the whole film. Every shot
+is evaluated in one vectorized pass, and the resulting style and negative-prompt modifiers
+are stored on each variant (degradation_style / degradation_negative) for rendering.
+"""
+
+import json
+from bisect import bisect_right
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+from film_data import APP_PATH, SHOTS_PATH, load_json, load_shots, shot_position
+from tracking_engine import keyframe_arrays, interpolate_systems
+
+ACT_STRUCTURE_PATH = f"{APP_PATH}/act_structure.json"
+DEGRADATION_PATH = f"{APP_PATH}/degradation_table.json"
+
+# Protocol shot ranges out of 100 (Prologue 1-15, Act I 16-35, ...), used as film percentages
+ACTS = [
+    {'name': 'prologue', 'title': 'The Predatory Paradise', 'end': 15},
+    {'name': 'act_1', 'title': 'The Trap', 'end': 35},
+    {'name': 'act_2', 'title': 'The Poisoning', 'end': 60},
+    {'name': 'act_3', 'title': 'The Recognition', 'end': 85},
+    {'name': 'act_4', 'title': 'The Monument', 'end': 100}
+]
+
+# Curves as (act index, fraction through the act, value)
+CURVES = {
+    # Degradation accelerates act by act; shot 45 (40% through Act II) lands on 35%
+    'degradation': [(0, 0.0, 0), (1, 0.0, 10), (2, 0.0, 25), (3, 0.0, 50), (4, 0.0, 80), (4, 1.0, 100)],
+    # Visual trinity weights at each act's midpoint (dominant 1.0, subtle 0.3, minimal 0.1)
+    'predatory': [(0, 0.5, 1.0), (1, 0.5, 0.5), (2, 0.5, 0.8), (3, 0.5, 0.6), (4, 0.5, 1.0)],
+    'organic': [(0, 0.5, 0.1), (1, 0.5, 1.0), (2, 0.5, 0.8), (3, 0.5, 0.6), (4, 0.5, 1.0)],
+    'geological': [(0, 0.5, 0.3), (1, 0.5, 0.5), (2, 0.5, 0.8), (3, 0.5, 1.0), (4, 0.5, 1.0)],
+    # None in the prologue, glimpses, subtle, obvious, full revelation
+    'modern_intrusion': [(0, 1.0, 0.0), (1, 0.5, 0.15), (2, 0.5, 0.4), (3, 0.5, 0.7), (4, 1.0, 1.0)]
+}
+
+VISUAL_SYSTEMS = ['predatory', 'organic', 'geological']
+
+STAGES = [
+    {'start': 0, 'name': 'predatory seduction',
+     'style': 'hypervivid false beauty, breathing landscape, suspiciously perfect',
+     'negative': 'visible decay, frost damage'},
+    {'start': 11, 'name': 'toxic intrusion',
+     'style': 'Danish frost spreading as necrosis, light curdling, small mathematical errors',
+     'negative': 'clean even lighting'},
+    {'start': 26, 'name': 'pressure fracture',
+     'style': 'spatial paradoxes, identity overlap, viscous time',
+     'negative': 'stable coherent geometry'},
+    {'start': 51, 'name': 'crystalline recognition',
+     'style': 'sharp obsidian clarity, shadows moving independently of bodies, cymatic patterns',
+     'negative': 'soft focus, shadows matching bodies'},
+    {'start': 81, 'name': 'monument convergence',
+     'style': 'complete crystallization, family conscious in glass, fossilized stillness',
+     'negative': 'warm living movement'}
+]
+
+# (threshold, style phrase, extra negative terms) for the modern-intrusion level
+INTRUSION_LEVELS = [
+    (0.0, '', 'modern objects, electric light, phones'),
+    (0.05, 'one or two frame glimpses of modern intrusion (LED flicker in whale oil)', ''),
+    (0.25, 'subtle but consistent modern intrusions (phone outlines, USAID stamps on brass)', ''),
+    (0.55, 'obvious parallel modern reality (Reykjavík skyline in ice)', ''),
+    (0.85, 'full modern revelation', '')
+]
+
+# The protocol never shows transformation directly
+BASE_NEGATIVE = 'on-screen physical transformation'
+
+
+def load_acts(path: str = ACT_STRUCTURE_PATH) -> List[Dict[str, Any]]:
+    """Act structure, overridable with act_structure.json ({"acts": [...]})."""
+    return load_json(path).get('acts') or ACTS
+
+
+def act_boundaries(acts: List[Dict[str, Any]]) -> List[float]:
+    return [0.0] + [float(act['end']) for act in acts]
+
+
+def curve_keyframes(acts: List[Dict[str, Any]]) -> Dict[str, Dict[str, List[float]]]:
+    """Map act-relative curve points to film percentages for the given act structure."""
+    bounds = act_boundaries(acts)
+    systems = {}
+    for name, points in CURVES.items():
+        points = [(act, fraction, value) for act, fraction, value in points if act < len(acts)]
+        systems[name] = {
+            'x': [bounds[act] + fraction * (bounds[act + 1] - bounds[act]) for act, fraction, _ in points],
+            'y': [float(value) for _, _, value in points]
+        }
+    return systems
+
+
+def evaluate_degradation(positions: np.ndarray, acts: List[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+    """Every curve at every position in one interpolation pass."""
+    names, xs, ys = keyframe_arrays(curve_keyframes(acts))
+    values = interpolate_systems(xs, ys, positions)
+    return {name: values[:, column] for column, name in enumerate(names)}
+
+
+def _system_phrase(weights: Dict[str, float]) -> str:
+    ranked = sorted(VISUAL_SYSTEMS, key=lambda system: -weights[system])
+    if weights[ranked[0]] - weights[ranked[-1]] < 0.1:
+        return 'all three systems converging'
+    supporting = [system for system in ranked[1:] if weights[system] >= 0.5]
+    phrase = f"{ranked[0]} dominant"
+    return phrase + (f" with {' and '.join(supporting)} support" if supporting else '')
+
+
+def shot_modifiers(percentage: float, weights: Dict[str, float], intrusion: float) -> Tuple[int, str, str]:
+    """(stage number, style modifier, negative modifier) following the protocol's prompt formula:
+    emotional temperature + dominant/supporting systems + detail + degradation percentage."""
+    stage_index = max(0, bisect_right([stage['start'] for stage in STAGES], percentage) - 1)
+    stage = STAGES[stage_index]
+    _, intrusion_style, intrusion_negative = INTRUSION_LEVELS[
+        max(0, bisect_right([level[0] for level in INTRUSION_LEVELS], intrusion) - 1)]
+
+    style_parts = [f"Stage {stage_index + 1} {stage['name']}", _system_phrase(weights), stage['style']]
+    if intrusion_style:
+        style_parts.append(intrusion_style)
+    style_parts.append(f"{percentage:.0f}% degradation")
+    negative_parts = [stage['negative'], BASE_NEGATIVE] + ([intrusion_negative] if intrusion_negative else [])
+    return stage_index + 1, ', '.join(style_parts) + '.', ', '.join(negative_parts)
+
+
+def degradation_table(shots: List[Tuple[str, Dict[str, Any]]], acts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Per-shot degradation parameters and modifiers at each shot's film position (the
+    index-based position the prompts, tracking values and milestones use)."""
+    positions = np.array([shot_position(index, len(shots)) for index in range(len(shots))])
+    curves = evaluate_degradation(positions, acts)
+    bounds = act_boundaries(acts)
+
+    table = []
+    for row, (shot_key, _) in enumerate(shots):
+        position = float(positions[row])
+        weights = {system: round(float(curves[system][row]), 3) for system in VISUAL_SYSTEMS}
+        percentage = float(curves['degradation'][row])
+        intrusion = float(curves['modern_intrusion'][row])
+        stage, style, negative = shot_modifiers(percentage, weights, intrusion)
+        act = acts[min(len(acts) - 1, max(0, bisect_right(bounds, position) - 1))]
+        table.append({
+            'shot_key': shot_key,
+            'position_percentage': round(position, 4),
+            'act': act['name'],
+            'stage': stage,
+            'degradation_percentage': round(percentage, 2),
+            'system_weights': weights,
+            'modern_intrusion': round(intrusion, 3),
+            'style_modifier': style,
+            'negative_modifier': negative
+        })
+    return table
+
+
+def apply_degradation(table: List[Dict[str, Any]], shots_dir: str = SHOTS_PATH) -> int:
+    """Store parameters on each shot and modifiers on each variant; returns files changed."""
+    updated = 0
+    for row in table:
+        shot_file = Path(shots_dir) / f"{row['shot_key']}.json"
+        with open(shot_file, 'r', encoding='utf-8') as f:
+            shot_data = json.load(f)
+        before = json.dumps(shot_data, sort_keys=True)
+
+        shot_data['degradation'] = {key: row[key] for key in
+                                    ('act', 'stage', 'degradation_percentage', 'system_weights', 'modern_intrusion')}
+        for variant in shot_data.get('prompt_variants', []):
+            variant['degradation_style'] = row['style_modifier']
+            variant['degradation_negative'] = row['negative_modifier']
+
+        if json.dumps(shot_data, sort_keys=True) == before:
+            continue
+        with open(shot_file, 'w', encoding='utf-8') as f:
+            json.dump(shot_data, f, indent=2)
+        updated += 1
+    return updated
+
+
+def main():
+    """Main execution"""
+    print("🌫  Evaluating Fading Witness degradation curves...")
+    acts = load_acts()
+    table = degradation_table(load_shots(SHOTS_PATH), acts)
+
+    with open(DEGRADATION_PATH, 'w', encoding='utf-8') as f:
+        json.dump({'acts': acts, 'shots': table}, f, indent=2, ensure_ascii=False)
+
+    for stage in range(1, len(STAGES) + 1):
+        count = sum(1 for row in table if row['stage'] == stage)
+        print(f"   Stage {stage} {STAGES[stage - 1]['name']}: {count} shots")
+
+    updated = apply_degradation(table)
+    print(f"\n✅ Degradation modifiers written to {updated} shot files")
+    print(f"📄 Table: {DEGRADATION_PATH}")
+
+
+if __name__ == "__main__":
+    main()
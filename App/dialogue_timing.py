@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Dialogue timing analyzer: does the spoken dialogue fit each shot's duration_seconds?
+Dialogue fields mix Icelandic, Danish and stage directions, e.g.
+(Magnús counting): "Einn, tveir..." (Counting again): "Fimm... sex?" (Tone: confused Danish).
+Only quoted text is spoken. A cue followed by a colon opens a turn, and other
+parentheticals (tone notes, translations) are stripped, though a language named in
+them sets that line's language. Speaking time comes from per-language syllable
+counts and rates. Timings are cached by dialogue hash, so re-runs only analyze
+edited dialogue.
+"""
+
+import hashlib
+import json
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from film_data import (APP_PATH, CACHE_PATH, CHARACTER_KEYS, DEFAULT_DURATION, SHOTS_PATH, character_key,
+                       fix_mojibake, load_json, load_shots)
+
+TIMING_REPORT_PATH = f"{APP_PATH}/dialogue_timing_report.json"
+TIMING_CACHE_PATH = f"{CACHE_PATH}/dialogue_timing.json"
+# Bump when the heuristics change so cached timings are recomputed
+TIMING_VERSION = 1
+
+# Vowel nuclei per language; a run of vowels counts as one syllable (au, ei, ey, øj...)
+VOWELS = {
+    'icelandic': 'aáeéiíoóuúyýæö',
+    'danish': 'aeiouyæøå',
+    'english': 'aeiouy'
+}
+# Syllables per second at a natural pace
+SYLLABLE_RATES = {'icelandic': 5.0, 'danish': 5.5, 'english': 4.5}
+DEFAULT_LANGUAGE = 'icelandic'
+
+LANGUAGE_MARKERS = {
+    'icelandic': (set('þðáíóúýé'), {'og', 'er', 'ekki', 'hvað', 'við', 'þú', 'ég', 'einn', 'tveir', 'nei', 'já'}),
+    'danish': (set('øå'), {'et', 'to', 'tre', 'fire', 'fem', 'seks', 'syv', 'jeg', 'ikke', 'hvor', 'mange', 'nej'}),
+    'english': (set(), {'the', 'and', 'is', 'you', 'we', 'are', 'what', 'how', 'no', 'yes'})
+}
+# Cue words that slow delivery, and the factor applied to the syllable rate
+SLOW_DELIVERY = {'singing': 0.5, 'sings': 0.5, 'chant': 0.5, 'chanting': 0.5, 'humming': 0.5,
+                 'whisper': 0.8, 'whispered': 0.8, 'slowly': 0.7, 'aging': 0.8}
+ELLIPSIS_PAUSE = 0.4
+TURN_GAP = 0.3
+
+TOKEN_PATTERN = re.compile(r'\((?P<cue>[^)]*)\)(?P<colon>\s*:)?|"(?P<line>[^"]*)"')
+ELLIPSIS_PATTERN = re.compile(r'\.\.\.|…')
+WORD_PATTERN = re.compile(r"[^\W\d_]+")
+
+
+def detect_language(text: str, hint: Optional[str] = None) -> str:
+    """Language named in an annotation, else the language with the most marker hits."""
+    if hint:
+        return hint
+    lowered = text.lower()
+    words = WORD_PATTERN.findall(lowered)
+    scores = {language: sum(ch in letters for ch in lowered) + sum(word in vocabulary for word in words)
+              for language, (letters, vocabulary) in LANGUAGE_MARKERS.items()}
+    best = max(scores, key=scores.get)
+    return best if scores[best] > 0 else DEFAULT_LANGUAGE
+
+
+def language_hint(annotation: str) -> Optional[str]:
+    lowered = annotation.lower()
+    return next((language for language in VOWELS if language in lowered), None)
+
+
+def count_syllables(text: str, language: str) -> int:
+    """Vowel groups per word, at least one per word; English drops a silent final e."""
+    vowels = VOWELS[language]
+    total = 0
+    for word in WORD_PATTERN.findall(text.lower()):
+        groups = len(re.findall(f"[{vowels}]+", word))
+        if language == 'english' and groups > 1 and word.endswith('e') and not word.endswith('le'):
+            groups -= 1
+        total += max(1, groups)
+    return total
+
+
+def tokenize_turns(dialogue: str) -> List[Dict[str, Any]]:
+    """Speaker turns with their spoken lines; cues without a known character keep the
+    previous speaker ("(Counting again):"), or name a non-family voice ("(Raven):")."""
+    turns = []
+    current = None
+    for match in TOKEN_PATTERN.finditer(fix_mojibake(dialogue or '')):
+        if match.group('cue') is not None:
+            cue = match.group('cue').strip()
+            head = cue.split(',')[0].strip()
+            if match.group('colon'):
+                first_word = character_key(head.split(' ')[0]) if head else ''
+                if first_word in CHARACTER_KEYS:
+                    speaker = first_word
+                else:
+                    speaker = current['speaker'] if current else head.lower()
+                current = {'speaker': speaker, 'cue': cue, 'lines': []}
+                turns.append(current)
+            elif current and current['lines'] and language_hint(cue):
+                # Trailing annotation such as "(Tone: confused Danish)"
+                current['lines'][-1]['language'] = language_hint(cue)
+        elif match.group('line').strip(' .…'):
+            if current is None:
+                current = {'speaker': None, 'cue': '', 'lines': []}
+                turns.append(current)
+            line = match.group('line').strip()
+            current['lines'].append({'text': line, 'language': detect_language(line, language_hint(current['cue']))})
+    return [turn for turn in turns if turn['lines']]
+
+
+def turn_seconds(turn: Dict[str, Any]) -> float:
+    cue_words = set(WORD_PATTERN.findall(turn['cue'].lower()))
+    pace = min([factor for word, factor in SLOW_DELIVERY.items() if word in cue_words], default=1.0)
+    seconds = 0.0
+    for line in turn['lines']:
+        syllables = count_syllables(line['text'], line['language'])
+        line['syllables'] = syllables
+        seconds += syllables / (SYLLABLE_RATES[line['language']] * pace)
+        seconds += ELLIPSIS_PAUSE * len(ELLIPSIS_PATTERN.findall(line['text']))
+    return seconds
+
+
+def analyze_dialogue(dialogue: str) -> Dict[str, Any]:
+    """Turns, spoken syllables and estimated seconds for one dialogue field."""
+    turns = tokenize_turns(dialogue)
+    seconds = sum(turn_seconds(turn) for turn in turns) + TURN_GAP * max(0, len(turns) - 1)
+    return {
+        'turns': turns,
+        'syllables': sum(line['syllables'] for turn in turns for line in turn['lines']),
+        'seconds': round(seconds, 2)
+    }
+
+
+def dialogue_digest(dialogue: str) -> str:
+    return hashlib.sha256(f"{TIMING_VERSION}:{dialogue}".encode('utf-8')).hexdigest()
+
+
+def analyze_batch(dialogues: List[str], cache: Dict[str, Any]) -> Tuple[Dict[str, Dict[str, Any]], int]:
+    """Timing per distinct dialogue, analyzing only those missing from the cache.
+    Returns ({digest: timing}, analyzed count); the cache is updated in place."""
+    timings = {}
+    analyzed = 0
+    for dialogue in dict.fromkeys(dialogues):
+        digest = dialogue_digest(dialogue)
+        if digest not in cache:
+            cache[digest] = analyze_dialogue(dialogue)
+            analyzed += 1
+        timings[digest] = cache[digest]
+    return timings, analyzed
+
+
+def check_film(shots: List[Tuple[str, Dict[str, Any]]],
+               cache_path: Optional[str] = TIMING_CACHE_PATH) -> Dict[str, Any]:
+    """Every variant's dialogue timing against its shot's duration, in one batch."""
+    cache = load_json(cache_path) if cache_path else {}
+    variants = [(shot_key, shot_data, variant) for shot_key, shot_data in shots
+                for variant in shot_data.get('prompt_variants', []) if variant.get('dialogue')]
+    timings, analyzed = analyze_batch([variant['dialogue'] for _, _, variant in variants], cache)
+
+    if cache_path and analyzed:
+        # Keep only entries still in use so the cache does not grow with every edit
+        Path(cache_path).parent.mkdir(parents=True, exist_ok=True)
+        with open(cache_path, 'w', encoding='utf-8') as f:
+            json.dump(timings, f, ensure_ascii=False)
+
+    results = []
+    for shot_key, shot_data, variant in variants:
+        timing = timings[dialogue_digest(variant['dialogue'])]
+        if not timing['turns']:
+            continue
+        duration = float(shot_data.get('shot_metadata', {}).get('duration_seconds') or DEFAULT_DURATION)
+        results.append({
+            'shot_key': shot_key,
+            'variant_id': variant.get('variant_id', ''),
+            'duration_seconds': duration,
+            'dialogue_seconds': timing['seconds'],
+            'speakers': list(dict.fromkeys(turn['speaker'] for turn in timing['turns'] if turn['speaker'])),
+            'languages': sorted({line['language'] for turn in timing['turns'] for line in turn['lines']}),
+            'overrun_seconds': round(max(0.0, timing['seconds'] - duration), 2)
+        })
+    return {
+        'analyzed': analyzed,
+        'cached': len(timings) - analyzed,
+        'variants': results,
+        'overruns': [result for result in results if result['overrun_seconds'] > 0]
+    }
+
+
+def main():
+    """Main execution"""
+    print("🗣  Timing dialogue against shot durations...")
+    report = check_film(load_shots(SHOTS_PATH))
+
+    with open(TIMING_REPORT_PATH, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+
+    print(f"   {report['analyzed']} dialogues analyzed, {report['cached']} from cache")
+    for result in report['overruns']:
+        print(f"⚠️  {result['shot_key']} {result['variant_id']}: {result['dialogue_seconds']:g}s of dialogue "
+              f"in {result['duration_seconds']:g}s")
+    print(f"\n✅ {len(report['variants'])} spoken variants, {len(report['overruns'])} over their shot duration")
+    print(f"📄 Report: {TIMING_REPORT_PATH}")
+
+
+if __name__ == "__main__":
+    main()
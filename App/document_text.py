@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Cached text extraction for the production bibles and shot guides that only exist as
+PDF or DOCX (Production Bible v5/v8/v9, Shot Production Guide v6/v7, prod bible v 13,
+ultimate genesis v16, uncomprimisable.pdf).
+PDFs are extracted page by page with pypdf; DOCX files paragraph by paragraph straight
+from word/document.xml. The text is stored as a plain .txt under the cache, keyed by
+the document's content hash, so later readers (the research index, the diff engine,
+the compactor) read it at plain-text speed. Uncached documents are extracted in a
+process pool. A document that cannot be read (corrupt archive, damaged PDF) is recorded
+with its error in the manifest and skipped until it changes.
+pypdf is only needed once a PDF has to be extracted.
+
+Usage: python3 document_text.py [document]
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sys
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from xml.etree import ElementTree
+
+from film_data import CACHE_PATH, STORIES_PATH, load_json
+
+DOCUMENT_TEXT_PATH = f"{CACHE_PATH}/document_text"
+# Bump when extraction changes so every document is extracted again
+EXTRACTION_VERSION = 1
+DOCUMENT_SUFFIXES = ('.pdf', '.docx')
+EXCLUDED_PARTS = {'.git', '.chunk_store', 'cache', '__pycache__', 'App copy'}
+
+WORD_NAMESPACE = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+# Pages and paragraphs are separated by a blank line in the extracted text
+UNIT_SEPARATOR = '\n\n'
+# A damaged DOCX: not a zip, no word/document.xml, or malformed XML
+DOCX_ERRORS = (zipfile.BadZipFile, KeyError, ElementTree.ParseError)
+
+
+def document_files(stories_path: str = STORIES_PATH) -> List[Path]:
+    root = Path(stories_path)
+    return sorted(path for path in root.rglob('*')
+                  if path.is_file() and path.suffix.lower() in DOCUMENT_SUFFIXES
+                  and not path.name.startswith(('.', '~$'))
+                  and not EXCLUDED_PARTS.intersection(path.relative_to(root).parts[:-1]))
+
+
+def file_digest(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()[:24]
+
+
+def extract_pdf(path: Path) -> List[str]:
+    """Text of each page."""
+    from pypdf import PdfReader
+
+    # The bible exports carry harmless broken xref entries that pypdf warns about
+    logging.getLogger('pypdf').setLevel(logging.ERROR)
+    return [(page.extract_text() or '').strip() for page in PdfReader(str(path)).pages]
+
+
+def extract_docx(path: Path) -> List[str]:
+    """Text of each non-empty paragraph, with tabs and line breaks kept."""
+    with zipfile.ZipFile(path) as archive:
+        root = ElementTree.fromstring(archive.read('word/document.xml'))
+    paragraphs = []
+    for paragraph in root.iter(f"{WORD_NAMESPACE}p"):
+        parts = []
+        for node in paragraph.iter():
+            if node.tag == f"{WORD_NAMESPACE}t":
+                parts.append(node.text or '')
+            elif node.tag == f"{WORD_NAMESPACE}tab":
+                parts.append('\t')
+            elif node.tag in (f"{WORD_NAMESPACE}br", f"{WORD_NAMESPACE}cr"):
+                parts.append('\n')
+        text = ''.join(parts).strip()
+        if text:
+            paragraphs.append(text)
+    return paragraphs
+
+
+def _extract_to_cache(job: Tuple[str, str, str]) -> Tuple[str, Optional[int], str]:
+    """Worker: extract one document into <digest>.txt; returns (digest, unit count, error).
+    A document that fails to parse gets no text, only the error; anything else (pypdf not
+    installed, an unreadable file) is raised, so it is never recorded against the document."""
+    source, digest, cache_path = job
+    path = Path(source)
+    if path.suffix.lower() == '.pdf':
+        # Imported here like PdfReader, so a missing pypdf raises ImportError
+        from pypdf.errors import PdfReadError, PdfStreamError
+        extract, parse_errors = extract_pdf, (PdfReadError, PdfStreamError)
+    else:
+        extract, parse_errors = extract_docx, DOCX_ERRORS
+    try:
+        units = extract(path)
+    except parse_errors as e:
+        return digest, None, f"{type(e).__name__}: {e}"
+    output = Path(cache_path) / f"{digest}.txt"
+    # Written under a temporary name so a killed worker never leaves a partial cache entry
+    partial = output.with_suffix('.part')
+    partial.write_text(UNIT_SEPARATOR.join(units) + '\n', encoding='utf-8')
+    partial.replace(output)
+    return digest, len(units), ''
+
+
+class DocumentTextCache:
+    """Extracted text of every PDF/DOCX in the stories tree, keyed by content hash."""
+
+    def __init__(self, cache_path: str = DOCUMENT_TEXT_PATH, stories_path: str = STORIES_PATH):
+        self.cache_path = Path(cache_path)
+        self.stories_path = Path(stories_path)
+        manifest = load_json(self.cache_path / 'manifest.json')
+        self.files: Dict[str, Dict[str, Any]] = \
+            manifest.get('files', {}) if manifest.get('version') == EXTRACTION_VERSION else {}
+
+    def update(self, paths: Optional[List[Path]] = None, max_workers: Optional[int] = None) -> Dict[str, int]:
+        """Extract new and changed documents; unchanged ones are recognised by size and
+        mtime, then by content hash. Documents that fail to extract are recorded with their
+        error and skipped. Text no document uses any more is removed."""
+        self.cache_path.mkdir(parents=True, exist_ok=True)
+        paths = document_files(str(self.stories_path)) if paths is None else paths
+        files = {}
+        jobs = []
+        stats = {'extracted': 0, 'reused': 0, 'failed': 0, 'removed': 0}
+        for path in paths:
+            relative = str(path.relative_to(self.stories_path))
+            stat = path.stat()
+            known = self.files.get(relative)
+            if known and known['size'] == stat.st_size and known['mtime_ns'] == stat.st_mtime_ns \
+                    and (known.get('error') or (self.cache_path / f"{known['digest']}.txt").exists()):
+                files[relative] = known
+                stats['failed' if known.get('error') else 'reused'] += 1
+                continue
+            digest = file_digest(path)
+            files[relative] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'digest': digest,
+                               'units': known['units'] if known and known['digest'] == digest else None}
+            if (self.cache_path / f"{digest}.txt").exists():
+                stats['reused'] += 1
+            elif digest not in {job[1] for job in jobs}:
+                jobs.append((str(path), digest, str(self.cache_path)))
+
+        if len(jobs) > 1:
+            with ProcessPoolExecutor(max_workers=min(len(jobs), max_workers or os.cpu_count() or 1)) as pool:
+                results = list(pool.map(_extract_to_cache, jobs))
+        else:
+            results = [_extract_to_cache(job) for job in jobs]
+        extracted = {digest: (units, error) for digest, units, error in results}
+        for entry in files.values():
+            if entry['digest'] in extracted:
+                entry['units'], error = extracted[entry['digest']]
+                if error:
+                    entry['error'] = error
+                stats['failed' if error else 'extracted'] += 1
+
+        in_use = {entry['digest'] for entry in files.values()}
+        for text_file in self.cache_path.glob('*.txt'):
+            if text_file.stem not in in_use:
+                text_file.unlink()
+                stats['removed'] += 1
+        self.files = files
+        with open(self.cache_path / 'manifest.json', 'w', encoding='utf-8') as f:
+            json.dump({'version': EXTRACTION_VERSION, 'files': files}, f, indent=2, ensure_ascii=False)
+        return stats
+
+    def text_path(self, path) -> Optional[Path]:
+        """Path of the cached plain text for a document, extracting it first if needed;
+        None for a document that cannot be extracted."""
+        path = Path(path).resolve()
+        relative = str(path.relative_to(self.stories_path.resolve()))
+        entry = self.files.get(relative)
+        stat = path.stat()
+        if entry and entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns:
+            if entry.get('error'):
+                return None
+            if (self.cache_path / f"{entry['digest']}.txt").exists():
+                return self.cache_path / f"{entry['digest']}.txt"
+        self.cache_path.mkdir(parents=True, exist_ok=True)
+        digest = file_digest(path)
+        text_file = self.cache_path / f"{digest}.txt"
+        if not text_file.exists():
+            _, _, error = _extract_to_cache((str(path), digest, str(self.cache_path)))
+            if error:
+                print(f"⚠️  Cannot extract {relative}: {error}")
+                return None
+        return text_file
+
+    def text(self, path) -> str:
+        """Extracted text of a document ('' if it cannot be extracted)."""
+        text_path = self.text_path(path)
+        return text_path.read_text(encoding='utf-8') if text_path else ''
+
+
+_default_cache: Optional[DocumentTextCache] = None
+
+
+def document_text(path) -> str:
+    """Plain text of a PDF or DOCX in the stories tree, from the shared cache."""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = DocumentTextCache()
+    return _default_cache.text(path)
+
+
+def main(document: Optional[str] = None):
+    """Main execution"""
+    cache = DocumentTextCache()
+    if document:
+        print(cache.text(document))
+        return
+    print("📑 Extracting text from PDF and DOCX documents...")
+    stats = cache.update()
+    for relative, entry in cache.files.items():
+        if entry.get('error'):
+            print(f"⚠️  Skipped {relative}: {entry['error']}")
+            continue
+        kind = 'pages' if relative.lower().endswith('.pdf') else 'paragraphs'
+        print(f"   {entry['units'] or '?':>5} {kind:10} {relative}")
+    print(f"\n✅ {len(cache.files)} documents: {stats['extracted']} extracted, {stats['reused']} cached, "
+          f"{stats['failed']} unreadable, {stats['removed']} stale texts removed")
+    print(f"📄 Text cache: {DOCUMENT_TEXT_PATH}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1] if len(sys.argv) > 1 else None)
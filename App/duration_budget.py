@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Duration budget solver: fit shot durations to a target runtime.
+Each act gets a share of the target; within an act every shot slot (alternates share
+one) has min/max bounds from its significance and spoken dialogue, or a fixed length.
+The act budget is allocated in one linear pass: every slot gets its minimum, and the
+remainder is spread in proportion to each slot's headroom. Durations are written back
+through the timeline index; inserting a shot re-solves only its act.
+"""
+
+import math
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+
+from continuity_validator import Slot, shot_slot
+from degradation_engine import load_acts
+from dialogue_timing import analyze_dialogue
+from film_data import SHOTS_PATH, load_shots
+from timeline_index import TimelineIndex, build_timeline, save_timeline, write_timeline
+
+# The protocol targets 20-30 minutes
+TARGET_RUNTIME = 25 * 60
+
+# significance -> (min, max) seconds
+SIGNIFICANCE_BOUNDS = {
+    'key': (6, 20),
+    'standard': (4, 12),
+    'enhancement': (2, 5)
+}
+DEFAULT_SIGNIFICANCE = 'standard'
+
+# Breathing room around the spoken lines
+DIALOGUE_PADDING = 1.0
+
+Bounds = Tuple[float, float]
+
+
+def shot_significance(shot_data: Dict[str, Any]) -> str:
+    """shot_metadata.significance, else 'enhancement' for integrated enhancement shots."""
+    metadata = shot_data.get('shot_metadata', {})
+    if metadata.get('significance') in SIGNIFICANCE_BOUNDS:
+        return metadata['significance']
+    return 'enhancement' if metadata.get('narrative_function') == 'enhancement' else DEFAULT_SIGNIFICANCE
+
+
+def dialogue_seconds(shot_data: Dict[str, Any]) -> float:
+    """Time needed for the longest variant's spoken dialogue (see dialogue_timing.py)."""
+    longest = max((analyze_dialogue(variant['dialogue'])['seconds']
+                   for variant in shot_data.get('prompt_variants', []) if variant.get('dialogue')), default=0.0)
+    return longest + DIALOGUE_PADDING if longest else 0.0
+
+
+def shot_bounds(shot_data: Dict[str, Any]) -> Bounds:
+    """(min, max) seconds; shot_metadata.duration_fixed pins the current duration."""
+    metadata = shot_data.get('shot_metadata', {})
+    if metadata.get('duration_fixed') and metadata.get('duration_seconds'):
+        fixed = float(metadata['duration_seconds'])
+        return fixed, fixed
+    low, high = SIGNIFICANCE_BOUNDS[shot_significance(shot_data)]
+    low = max(low, float(-(-dialogue_seconds(shot_data) // 1)))
+    return float(low), float(max(high, low))
+
+
+def merge_bounds(first: Bounds, second: Bounds) -> Bounds:
+    """Bounds for alternates sharing a slot: any of them may be cut in, so the tighter
+    range wins; a conflicting pair keeps the larger minimum."""
+    low = max(first[0], second[0])
+    return low, max(low, min(first[1], second[1]))
+
+
+def allocate(budget: float, bounds: List[Bounds]) -> Tuple[List[float], float]:
+    """Linear-time allocation of `budget` over slots; returns (durations, unallocated).
+
+    Unallocated is negative when even the minimums exceed the budget.
+    """
+    low_total = sum(low for low, _ in bounds)
+    headroom = sum(high - low for low, high in bounds)
+    spare = budget - low_total
+    fraction = 1.0 if headroom <= 0 else max(0.0, min(1.0, spare / headroom))
+    durations = [low + (high - low) * fraction for low, high in bounds]
+    return durations, budget - sum(durations)
+
+
+def round_durations(durations: List[float]) -> List[int]:
+    """Whole seconds via rounded prefix sums: the total is preserved and a duration
+    between integer bounds stays inside them. Halves always round up; round()'s
+    half-to-even would turn [2.5, 3, 4] into [2, 4, 4]."""
+    rounded = []
+    running = 0.0
+    previous = 0
+    for duration in durations:
+        running += duration
+        # Drop float noise first so an integer duration never loses a second
+        rounded.append(math.floor(round(running, 9) + 0.5) - previous)
+        previous += rounded[-1]
+    return rounded
+
+
+class DurationBudget:
+    """Per-act slot bounds over a timeline, re-solvable one act at a time."""
+
+    def __init__(self, timeline: TimelineIndex, shots: Dict[str, Dict[str, Any]],
+                 target: float = TARGET_RUNTIME, acts: Optional[List[Dict[str, Any]]] = None):
+        self.timeline = timeline
+        self.target = float(target)
+        self.acts = acts or load_acts()
+        self.slot_of: Dict[str, Slot] = {}
+        self.bounds: Dict[Slot, Bounds] = {}
+        self.members: Dict[Slot, List[str]] = defaultdict(list)
+        self.act_of: Dict[Slot, int] = {}
+        self.act_slots: Dict[int, List[Slot]] = defaultdict(list)
+
+        order = timeline.order()
+        for index, key in enumerate(order):
+            slot = shot_slot(shots[key])
+            if slot not in self.act_of:
+                self._add_slot(slot, self._act_at(index / max(1, len(order)) * 100))
+            self._add_member(key, slot, shot_bounds(shots[key]))
+
+    def _act_at(self, percentage: float) -> int:
+        for act_index, act in enumerate(self.acts):
+            if percentage < float(act['end']):
+                return act_index
+        return len(self.acts) - 1
+
+    def _add_slot(self, slot: Slot, act_index: int) -> None:
+        self.act_of[slot] = act_index
+        self.act_slots[act_index].append(slot)
+
+    def _add_member(self, key: str, slot: Slot, bounds: Bounds) -> None:
+        self.slot_of[key] = slot
+        self.members[slot].append(key)
+        self.bounds[slot] = merge_bounds(self.bounds[slot], bounds) if slot in self.bounds else bounds
+
+    def act_budget(self, act_index: int) -> float:
+        """The act's share of the target: act['share'] if given, else its span of the film."""
+        shares = [act.get('share') for act in self.acts]
+        if all(share is not None for share in shares):
+            return self.target * shares[act_index] / sum(shares)
+        start = float(self.acts[act_index - 1]['end']) if act_index else 0.0
+        return self.target * (float(self.acts[act_index]['end']) - start) / float(self.acts[-1]['end'])
+
+    def solve_act(self, act_index: int) -> Dict[str, Any]:
+        """Allocate one act's budget and apply it to every member shot in the timeline."""
+        slots = self.act_slots.get(act_index, [])
+        budget = self.act_budget(act_index)
+        durations, unallocated = allocate(budget, [self.bounds[slot] for slot in slots])
+        for slot, duration in zip(slots, round_durations(durations)):
+            for key in self.members[slot]:
+                if self.timeline.durations[key] != duration:
+                    self.timeline.set_duration(key, duration)
+        return {'act': self.acts[act_index]['name'], 'slots': len(slots), 'budget_seconds': round(budget, 1),
+                'unallocated_seconds': round(unallocated, 1) + 0.0}
+
+    def solve(self) -> List[Dict[str, Any]]:
+        return [self.solve_act(act_index) for act_index in range(len(self.acts))]
+
+    def insert_shot(self, key: str, shot_data: Dict[str, Any], index: Optional[int] = None) -> Dict[str, Any]:
+        """Insert a shot into the timeline and re-solve only the act it joins."""
+        slot = shot_slot(shot_data)
+        self.timeline.insert(key, shot_data.get('shot_metadata', {}).get('duration_seconds') or 0, index)
+        if slot not in self.act_of:
+            position = self.timeline.index_of(key) / max(1, len(self.timeline)) * 100
+            self._add_slot(slot, self._act_at(position))
+        self._add_member(key, slot, shot_bounds(shot_data))
+        return self.solve_act(self.act_of[slot])
+
+    def runtime(self) -> float:
+        """Cut runtime: one shot per slot."""
+        return sum(self.timeline.durations[self.members[slot][0]] for slot in self.act_of)
+
+
+def solve_durations(shots: List[Tuple[str, Dict[str, Any]]], target: float = TARGET_RUNTIME,
+                    acts: Optional[List[Dict[str, Any]]] = None) -> Tuple[DurationBudget, List[Dict[str, Any]]]:
+    budget = DurationBudget(build_timeline(shots), dict(shots), target, acts)
+    return budget, budget.solve()
+
+
+def main():
+    """Main execution"""
+    print(f"⏳ Solving shot durations for a {TARGET_RUNTIME // 60}-minute cut...")
+    budget, acts = solve_durations(load_shots(SHOTS_PATH))
+
+    for act in acts:
+        status = '' if abs(act['unallocated_seconds']) < 0.5 else f" ⚠️  {act['unallocated_seconds']:+g}s unallocated"
+        print(f"   {act['act']}: {act['slots']} slots, {act['budget_seconds']:g}s{status}")
+    minutes, seconds = divmod(int(budget.runtime()), 60)
+    print(f"   Cut runtime: {minutes}:{seconds:02d}")
+
+    save_timeline(budget.timeline)
+    updated = write_timeline(budget.timeline)
+    print(f"\n✅ Durations written to {updated} shot files")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Lazy variant x plate expansion for A/B testing generations.
+Combinations are generated on demand, filtered by plate percentage range and the
+characters actually present, and de-duplicated by the hash of the rendered prompt.
+"""
+
+import hashlib
+import heapq
+import json
+import random
+from itertools import product
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from film_data import (APP_PATH, SHOTS_PATH, character_key, load_json, load_plate_descriptions,
+                       load_shots, shot_position)
+from render_prompts import build_prompt_inputs, render_prompt
+
+COMBINATIONS_PATH = f"{APP_PATH}/combinations.json"
+
+
+def _as_list(value) -> List[str]:
+    """recommended_plates entries may be a single plate ID or a list of them."""
+    if not value:
+        return []
+    return list(value) if isinstance(value, (list, tuple)) else [value]
+
+
+def present_characters(shot_data: Dict[str, Any], variant: Dict[str, Any]) -> List[str]:
+    """Character keys listed as present in the variant or involved in the shot."""
+    names = list(variant.get('character_plates', {}).get('present', []))
+    names += shot_data.get('notes', {}).get('characters_involved', [])
+    keys = []
+    for name in names:
+        key = character_key(name)
+        if key not in keys:
+            keys.append(key)
+    return keys
+
+
+def plate_in_range(plate_info: Dict[str, Any], position: float) -> bool:
+    """True if the shot position falls inside the plate's film_percentage_range (or it has none)."""
+    low, high = plate_info.get('film_percentage_range', [0, 100])
+    return low <= position <= high
+
+
+def character_candidates(variant: Dict[str, Any], characters: List[str], position: float,
+                         character_index: Dict[str, Dict[str, Any]],
+                         include_index: bool = False) -> List[Optional[str]]:
+    """Candidate character plate IDs for the characters present in a shot."""
+    recommended = variant.get('recommended_plates', {}).get('characters', {})
+    candidates = []
+    for character in characters:
+        plate_ids = _as_list(recommended.get(character))
+        if include_index:
+            plate_ids += [plate_id for plate_id, info in character_index.items()
+                          if character_key(info.get('character', '')) == character]
+        for plate_id in plate_ids:
+            info = character_index.get(plate_id, {})
+            if plate_id not in candidates and plate_in_range(info, position):
+                candidates.append(plate_id)
+    return candidates or [None]
+
+
+def environment_candidates(variant: Dict[str, Any]) -> List[Optional[str]]:
+    """Candidate environment plate IDs recommended for a variant."""
+    recommended = variant.get('recommended_plates', {}).get('environment', {})
+    candidates = []
+    for value in recommended.values():
+        for plate_id in _as_list(value):
+            if plate_id not in candidates:
+                candidates.append(plate_id)
+    return candidates or [None]
+
+
+def iter_combinations(shots: List[Tuple[str, Dict[str, Any]]], character_index: Dict[str, Dict[str, Any]],
+                      include_index: bool = False) -> Iterator[Tuple[int, str, Dict[str, Any], Dict[str, Any],
+                                                                     Optional[str], Optional[str]]]:
+    """Yield (shot index, shot key, shot, variant, character plate, environment plate) lazily."""
+    for index, (shot_key, shot_data) in enumerate(shots):
+        position = shot_position(index, len(shots))
+        for variant in shot_data.get('prompt_variants', []):
+            characters = present_characters(shot_data, variant)
+            character_plate_ids = character_candidates(variant, characters, position,
+                                                       character_index, include_index)
+            for character_plate_id, environment_plate_id in product(character_plate_ids,
+                                                                    environment_candidates(variant)):
+                yield index, shot_key, shot_data, variant, character_plate_id, environment_plate_id
+
+
+def expand_prompts(shots: List[Tuple[str, Dict[str, Any]]], character_index: Dict[str, Dict[str, Any]],
+                   character_plates: Dict[str, str], env_plates: Dict[str, str],
+                   include_index: bool = False, dedupe: bool = True) -> Iterator[Dict[str, Any]]:
+    """Render each combination and yield {inputs, prompt, digest}, skipping duplicate prompts.
+
+    Every prompt carries its shot ID and position, so duplicates can only occur within
+    one shot; the seen-set is reset per shot and memory stays bounded by the largest shot.
+    """
+    seen = set()
+    current_shot = None
+    for index, shot_key, shot_data, variant, character_plate_id, environment_plate_id in iter_combinations(
+            shots, character_index, include_index):
+        if index != current_shot:
+            seen.clear()
+            current_shot = index
+
+        inputs = build_prompt_inputs(shot_key, shot_data, variant, shot_position(index, len(shots)),
+                                     character_plate_id, environment_plate_id, character_plates, env_plates)
+        prompt = render_prompt(inputs)
+        digest = hashlib.sha256(prompt.encode('utf-8')).hexdigest()
+        if dedupe:
+            if digest in seen:
+                continue
+            seen.add(digest)
+        yield {'inputs': inputs, 'prompt': prompt, 'digest': digest}
+
+
+def sample_prompts(expansion: Iterator[Dict[str, Any]], k: int, seed: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Uniform sample of k expanded prompts using reservoir sampling (single pass, O(k) memory)."""
+    rng = random.Random(seed)
+    reservoir = []
+    for seen_count, item in enumerate(expansion):
+        if seen_count < k:
+            reservoir.append(item)
+        else:
+            slot = rng.randint(0, seen_count)
+            if slot < k:
+                reservoir[slot] = item
+    return reservoir
+
+
+def default_score(item: Dict[str, Any]) -> float:
+    """Prefer combinations that resolve both plates to real plate descriptions."""
+    inputs = item['inputs']
+    return float((inputs['character_plate'] is not None) + (inputs['environment_plate'] is not None))
+
+
+def top_k_prompts(expansion: Iterator[Dict[str, Any]], k: int,
+                  score: Callable[[Dict[str, Any]], float] = default_score) -> List[Dict[str, Any]]:
+    """The k highest-scoring expanded prompts, keeping only k items in memory."""
+    heap = []
+    for order, item in enumerate(expansion):
+        entry = (score(item), -order, item['digest'], item)
+        if len(heap) < k:
+            heapq.heappush(heap, entry)
+        elif entry[:3] > heap[0][:3]:
+            heapq.heapreplace(heap, entry)
+    return [entry[3] for entry in sorted(heap, key=lambda entry: entry[:3], reverse=True)]
+
+
+def main():
+    """Main execution"""
+    print("🔀 Expanding variant x plate combinations...")
+    shots = load_shots(SHOTS_PATH)
+    character_index = load_json(f"{APP_PATH}/character_plates_index.json").get('plate_index', {})
+    character_plates, env_plates = load_plate_descriptions(APP_PATH)
+
+    total = sum(1 for _ in expand_prompts(shots, character_index, character_plates, env_plates,
+                                          include_index=True))
+    print(f"   {total} unique prompts across {len(shots)} shots")
+
+    best = top_k_prompts(expand_prompts(shots, character_index, character_plates, env_plates,
+                                        include_index=True), k=50)
+    with open(COMBINATIONS_PATH, 'w', encoding='utf-8') as f:
+        json.dump([{'digest': item['digest'],
+                    'shot_key': item['inputs']['shot_key'],
+                    'variant_id': item['inputs']['variant_id'],
+                    'character_plate_id': item['inputs']['character_plate_id'],
+                    'environment_plate_id': item['inputs']['environment_plate_id']} for item in best],
+                  f, indent=2, ensure_ascii=False)
+
+    print(f"✅ Top {len(best)} combinations written to {COMBINATIONS_PATH}")
+
+
+if __name__ == "__main__":
+    main()
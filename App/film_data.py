@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Shared loading helpers for the shot JSON files and plate indexes.
+Shot ordering mirrors FilmManager.loadShotsFromFiles in DataModels.swift.
+"""
+
+import json
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+# Base paths
+STORIES_PATH = "/Users/ingthor/Documents/stories"
+APP_PATH = f"{STORIES_PATH}/App"
+SHOTS_PATH = f"{APP_PATH}/App/FilmManager/Resources/shots/json"
+CACHE_PATH = f"{APP_PATH}/cache"
+
+DEFAULT_ASPECT_RATIO = "16:9"
+DEFAULT_DURATION = 8
+
+# Keys used for characters in recommended_plates / selected_plates
+CHARACTER_KEYS = ['magnus', 'sigrid', 'gudrun', 'jon', 'lilja']
+ASCII_FOLD = str.maketrans({'á': 'a', 'é': 'e', 'í': 'i', 'ó': 'o', 'ú': 'u', 'ý': 'y',
+                            'ö': 'o', 'æ': 'ae', 'ð': 'd', 'þ': 'th'})
+
+
+def load_json(path) -> Dict[str, Any]:
+    """Load a JSON file, returning an empty dict if it does not exist."""
+    path = Path(path)
+    if not path.exists():
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def extract_numeric_from_id(shot_id: str) -> float:
+    """Numeric sort value for IDs like "-1b", "0a", "16.5", "55.5c" (same rules as the Swift app)."""
+    if shot_id.startswith('-'):
+        numeric = re.sub(r'[^0-9.]', '', shot_id[1:])
+        value = -_to_float(numeric)
+        if 'a' in shot_id:
+            value -= 0.3
+        elif 'b' in shot_id:
+            value -= 0.2
+        elif 'c' in shot_id:
+            value -= 0.1
+        return value
+
+    value = _to_float(re.sub(r'[^0-9.]', '', shot_id))
+    if shot_id.endswith('a'):
+        value += 0.1
+    elif shot_id.endswith('b'):
+        value += 0.2
+    elif shot_id.endswith('c'):
+        value += 0.3
+    elif shot_id.endswith('d'):
+        value += 0.4
+    return value
+
+
+def _to_float(text: str) -> float:
+    try:
+        return float(text)
+    except ValueError:
+        return 0.0
+
+
+# Shot IDs as written in filenames and STITCH references: -1, minus1, 16.5, 16point5, 12_5, 55.5b
+SHOT_ID_TOKEN = r'(?:minus|-)?\d+(?:(?:\.|_|point)\d+)?[a-z]?'
+_SHOT_ID_PATTERN = re.compile(r'(minus|-)?(\d+)(?:(?:\.|_|point)(\d+))?([a-z]*)', re.IGNORECASE)
+
+
+def parse_shot_id(shot_id: str) -> Tuple[float, str]:
+    """'16point5' -> (16.5, ''), 'minus1b' -> (-1.0, 'b'), '12_5' -> (12.5, '')."""
+    match = _SHOT_ID_PATTERN.search(str(shot_id).strip().lower())
+    if not match:
+        return float('inf'), str(shot_id).strip().lower()
+    number = float(match.group(2) + (f".{match.group(3)}" if match.group(3) else ''))
+    return (-number if match.group(1) else number), match.group(4)
+
+
+def canonical_shot_id(shot_id: str) -> str:
+    """One spelling per shot ID: 'Minus1' -> '-1', '16point5' -> '16.5', '47B' -> '47b'."""
+    number, suffix = parse_shot_id(shot_id)
+    return suffix if number == float('inf') else f"{number:g}{suffix}"
+
+
+def shot_id_order(shot_id: str) -> Tuple[float, int, str]:
+    """Sort key matching extractNumericFromId: 5 < 5a < 5b, but -1a < -1b < -1."""
+    number, suffix = parse_shot_id(shot_id)
+    rank = ord(suffix[0]) - ord('a') + 1 if suffix else 0
+    if number < 0 and suffix:
+        rank -= 27
+    return number, rank, suffix
+
+
+def fix_mojibake(text: str) -> str:
+    """Undo UTF-8 text that was decoded as cp1252 (e.g. "MagnÃºs" -> "Magnús", "â†’" -> "→")."""
+    if 'Ã' not in text and 'Â' not in text and 'â' not in text:
+        return text
+    raw = bytearray()
+    try:
+        for ch in text:
+            if ord(ch) < 256:
+                raw.append(ord(ch))
+            else:
+                raw.extend(ch.encode('cp1252'))
+        return raw.decode('utf-8')
+    except (UnicodeEncodeError, UnicodeDecodeError):
+        return text
+
+
+def character_key(name: str) -> str:
+    """Normalize a character name ("MAGNÃšS", "Guðrún") to its plate key ("magnus", "gudrun")."""
+    return fix_mojibake(name).strip().lower().translate(ASCII_FOLD)
+
+
+def shot_sort_key(shot_key: str, shot_data: Dict[str, Any]) -> Tuple[int, float, str]:
+    """Prologue first, then by numeric ID; the file key breaks ties between alternates."""
+    metadata = shot_data.get('shot_metadata', {})
+    is_prologue = metadata.get('sequence_type') == 'prologue'
+    return (0 if is_prologue else 1, extract_numeric_from_id(str(metadata.get('id', ''))), shot_key)
+
+
+def load_shots(shots_dir: str = SHOTS_PATH) -> List[Tuple[str, Dict[str, Any]]]:
+    """Load every shot JSON as (file stem, data), sorted in film order.
+    Like FilmManager.loadShotsFromFiles, files are read in name order and a file whose
+    shot ID was already loaded is skipped, so positions match the app."""
+    shots = []
+    seen_ids = set()
+    for shot_file in sorted(Path(shots_dir).glob("shot_*.json")):
+        with open(shot_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if 'shot_metadata' not in data or 'id' not in data['shot_metadata']:
+            print(f"⚠️ Missing metadata in: {shot_file.name}")
+            continue
+        shot_id = str(data['shot_metadata']['id'])
+        if shot_id in seen_ids:
+            print(f"⚠️ Duplicate shot ID detected, skipping: {shot_id} from file: {shot_file.name}")
+            continue
+        seen_ids.add(shot_id)
+        shots.append((shot_file.stem, data))
+
+    shots.sort(key=lambda item: shot_sort_key(*item))
+    return shots
+
+
+def shot_position(index: int, count: int) -> float:
+    """Film percentage for the shot at index, as FilmManager.updateShotPositions computes it."""
+    return index / max(1, count - 1) * 100.0
+
+
+def load_plate_descriptions(app_path: str = APP_PATH) -> Tuple[Dict[str, str], Dict[str, str]]:
+    """Plate ID -> description maps for character and environmental plates."""
+    character_index = load_json(f"{app_path}/character_plates_index.json").get('plate_index', {})
+    env_index = load_json(f"{app_path}/environmental_plates_index.json").get('plate_index', {})
+    character_plates = {plate_id: info.get('description', '') for plate_id, info in character_index.items()}
+    env_plates = {plate_id: info.get('description', '') for plate_id, info in env_index.items()}
+    return character_plates, env_plates
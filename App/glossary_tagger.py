@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Glossary tagger: characters, places and motifs in the text fields of every shot.
+All spellings of every entity (Magnús, Magnus, MAGNÚS, the mojibake MagnÃºs/MAGNÃšS,
+Klettagjá/Klettagja, hákarl/hakarl...) go into one Aho-Corasick automaton, so each
+field is scanned once, in a single linear pass, whatever the number of variants.
+Matches must sit on word boundaries ("Jón" does not match inside "Jónas"). Plate
+assignments are skipped: their IDs (SIGRID_..., LILJA_..., WESTFJORDS_...) name the
+plate, not what happens in the shot.
+The result is a shots x entities presence matrix plus per-shot counts and fields.
+"""
+
+import json
+from collections import deque
+from typing import Any, Dict, Iterator, List, Tuple
+
+import numpy as np
+
+from film_data import APP_PATH, ASCII_FOLD, SHOTS_PATH, load_shots
+
+GLOSSARY_TAGS_PATH = f"{APP_PATH}/glossary_tags.json"
+# Fields holding plate IDs rather than narrative text
+PLATE_ID_FIELDS = {'recommended_plates', 'character_plates'}
+
+# Entity key -> (category, spellings); case and mojibake variants are generated
+GLOSSARY = {
+    'magnus': ('character', ['Magnús']),
+    'sigrid': ('character', ['Sigrid', 'Sigríð']),
+    'gudrun': ('character', ['Guðrún']),
+    'jon': ('character', ['Jón']),
+    'lilja': ('character', ['Lilja']),
+    'klettagja': ('place', ['Klettagjá']),
+    'westfjords': ('place', ['Westfjords', 'Vestfirðir']),
+    'badstofa': ('place', ['baðstofa']),
+    'fjord': ('place', ['fjord', 'fjords', 'fjörður']),
+    'raven': ('motif', ['raven', 'ravens', 'Krummi', 'hrafn']),
+    'whale': ('motif', ['whale', 'whales']),
+    'hakarl': ('motif', ['hákarl']),
+    'sheep': ('motif', ['sheep', 'ewe', 'ewes', 'ram', 'rams', 'lamb', 'lambs']),
+    'tilberi': ('motif', ['tilberi']),
+    'monolith': ('motif', ['monolith', 'monoliths']),
+    'shadow': ('motif', ['shadow', 'shadows']),
+    'wool': ('motif', ['wool', 'woollen']),
+    'bones': ('motif', ['bone', 'bones'])
+}
+
+
+def mojibake(text: str) -> str:
+    """The cp1252 misreading of UTF-8 text that fix_mojibake undoes; bytes cp1252 leaves
+    undefined come through as Latin-1, as they do in the shot files."""
+    out = []
+    for byte in text.encode('utf-8'):
+        try:
+            out.append(bytes([byte]).decode('cp1252'))
+        except UnicodeDecodeError:
+            out.append(chr(byte))
+    return ''.join(out)
+
+
+def spelling_variants(spelling: str) -> List[str]:
+    """Lowercased forms of a spelling: as written, ASCII-folded and mojibake, each from the
+    original, capitalized and upper case (mojibake lowercases differently per case)."""
+    variants = set()
+    for base in (spelling, spelling.translate(ASCII_FOLD)):
+        for cased in (base, base.capitalize(), base.upper()):
+            variants.add(cased.lower())
+            variants.add(mojibake(cased).lower())
+    return sorted(variants)
+
+
+class AhoCorasick:
+    """Multi-pattern automaton over lowercase text; patterns map to entity keys."""
+
+    def __init__(self, patterns: Dict[str, str]):
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.output: List[List[Tuple[str, int]]] = [[]]
+        for pattern, key in patterns.items():
+            state = 0
+            for ch in pattern:
+                if ch not in self.goto[state]:
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append([])
+                    self.goto[state][ch] = len(self.goto) - 1
+                state = self.goto[state][ch]
+            self.output[state].append((key, len(pattern)))
+
+        # Breadth-first failure links; each state inherits the outputs of its failure state
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, child in self.goto[state].items():
+                queue.append(child)
+                fallback = self.fail[state]
+                while fallback and ch not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                target = self.goto[fallback].get(ch, 0)
+                # Children of the root fail back to the root, not to themselves
+                self.fail[child] = target if target != child else 0
+                self.output[child] = self.output[child] + self.output[self.fail[child]]
+
+    def matches(self, text: str) -> Iterator[Tuple[str, int, int]]:
+        """(key, start, end) of every whole-word match in text (compared lowercased)."""
+        text = text.lower()
+        state = 0
+        for position, ch in enumerate(text):
+            while state and ch not in self.goto[state]:
+                state = self.fail[state]
+            state = self.goto[state].get(ch, 0)
+            for key, length in self.output[state]:
+                start, end = position + 1 - length, position + 1
+                if (start == 0 or not text[start - 1].isalnum()) and (end == len(text) or not text[end].isalnum()):
+                    yield key, start, end
+
+
+def build_tagger(glossary: Dict[str, Tuple[str, List[str]]] = GLOSSARY) -> AhoCorasick:
+    patterns = {}
+    for key, (_, spellings) in glossary.items():
+        for spelling in spellings:
+            for variant in spelling_variants(spelling):
+                patterns[variant] = key
+    return AhoCorasick(patterns)
+
+
+def text_fields(data: Any, path: str = '') -> Iterator[Tuple[str, str]]:
+    """(field path, text) for every string in a shot outside the plate-ID fields; list
+    indices are dropped from the path."""
+    if isinstance(data, str):
+        yield path, data
+    elif isinstance(data, dict):
+        for name, value in data.items():
+            if name not in PLATE_ID_FIELDS:
+                yield from text_fields(value, f"{path}.{name}" if path else name)
+    elif isinstance(data, list):
+        for value in data:
+            yield from text_fields(value, path)
+
+
+def tag_shot(shot_data: Dict[str, Any], tagger: AhoCorasick) -> Dict[str, Dict[str, Any]]:
+    """Entity -> {count, fields} for one shot."""
+    tags: Dict[str, Dict[str, Any]] = {}
+    for path, text in text_fields(shot_data):
+        for key, _, _ in tagger.matches(text):
+            tag = tags.setdefault(key, {'count': 0, 'fields': []})
+            tag['count'] += 1
+            if path not in tag['fields']:
+                tag['fields'].append(path)
+    return tags
+
+
+def tag_shots(shots: List[Tuple[str, Dict[str, Any]]],
+              tagger: AhoCorasick = None) -> Dict[str, Dict[str, Dict[str, Any]]]:
+    tagger = tagger or build_tagger()
+    return {shot_key: tag_shot(shot_data, tagger) for shot_key, shot_data in shots}
+
+
+def presence_matrix(tags: Dict[str, Dict[str, Dict[str, Any]]],
+                    entities: List[str] = None) -> Tuple[List[str], List[str], np.ndarray]:
+    """(shot keys, entity keys, shots x entities 0/1 matrix)."""
+    entities = entities or list(GLOSSARY)
+    shot_keys = list(tags)
+    matrix = np.zeros((len(shot_keys), len(entities)), dtype=np.uint8)
+    for row, shot_key in enumerate(shot_keys):
+        for column, entity in enumerate(entities):
+            matrix[row, column] = entity in tags[shot_key]
+    return shot_keys, entities, matrix
+
+
+def main():
+    """Main execution"""
+    print("🏷  Tagging characters, places and motifs in every shot...")
+    tags = tag_shots(load_shots(SHOTS_PATH))
+    shot_keys, entities, matrix = presence_matrix(tags)
+
+    with open(GLOSSARY_TAGS_PATH, 'w', encoding='utf-8') as f:
+        json.dump({
+            'entities': {key: GLOSSARY[key][0] for key in entities},
+            # One row per shot, one 0/1 column per entity in the order above
+            'matrix': {shot_key: ''.join(map(str, row)) for shot_key, row in zip(shot_keys, matrix.tolist())},
+            'tags': tags
+        }, f, indent=2, ensure_ascii=False)
+
+    for column, entity in enumerate(entities):
+        print(f"   {GLOSSARY[entity][0]:9} {entity:11} {int(matrix[:, column].sum()):4} shots")
+    print(f"\n✅ {len(shot_keys)} shots x {len(entities)} entities")
+    print(f"📄 Tags: {GLOSSARY_TAGS_PATH}")
+
+
+if __name__ == "__main__":
+    main()
@@ -11,6 +11,8 @@ import re
 from pathlib import Path
 from typing import Dict, List, Any, Tuple
 
+from corpus_store import read_text
+
 # Paths
 ENHANCEMENTS_DIR = "/Users/ingthor/Documents/stories/enhancements/enhancements"
 SHOTS_JSON_DIR = "/Users/ingthor/Documents/stories/App/App/FilmManager/Resources/shots/json"
@@ -18,8 +20,7 @@ SHOTS_DIR = "/Users/ingthor/Documents/stories/App/App/FilmManager/Resources/shot
 
 def parse_enhancement_file(filepath: str) -> Dict[str, Any]:
     """Parse an enhancement file to extract scene information."""
-    with open(filepath, 'r') as f:
-        content = f.read()
+    content = read_text(filepath)
     
     filename = os.path.basename(filepath)
     
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Compile main_film_system.json milestone_values into sorted breakpoint tables and
+precompute each shot's milestone label per tracking system with bisect.
+A label applies from its breakpoint up to the next one. The per-shot labels are
+written into every shot JSON as "milestones", so neither the app nor the scripts
+re-derive them per query.
+"""
+
+import json
+from bisect import bisect_right
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+from film_data import APP_PATH, SHOTS_PATH, load_json, load_shots, shot_position
+
+MILESTONES_PATH = f"{APP_PATH}/milestones.json"
+
+
+def compile_milestones(main_system: Dict[str, Any]) -> Dict[str, Dict[str, List]]:
+    """{system: {'breakpoints': [sorted percentages], 'labels': [label per breakpoint]}}"""
+    tables = {}
+    for name, info in main_system.get('tracking_systems', {}).items():
+        milestones = sorted((float(pct), label) for pct, label in info.get('milestone_values', {}).items())
+        if milestones:
+            tables[name] = {'breakpoints': [pct for pct, _ in milestones],
+                            'labels': [label for _, label in milestones]}
+    return tables
+
+
+def milestone_index(breakpoints: List[float], percentage: float) -> int:
+    """Index of the last breakpoint at or below percentage (the first one below the start)."""
+    return max(0, bisect_right(breakpoints, percentage) - 1)
+
+
+def milestone_label(table: Dict[str, List], percentage: float) -> str:
+    return table['labels'][milestone_index(table['breakpoints'], percentage)]
+
+
+def shot_milestone_table(shots: List[Tuple[str, Dict[str, Any]]],
+                         tables: Dict[str, Dict[str, List]]) -> Dict[str, Any]:
+    """Columnar per-shot milestone indices for every system, at each shot's film position
+    (the same index-based position the tracking engine, prompts and app use)."""
+    positions = [shot_position(index, len(shots)) for index in range(len(shots))]
+    return {
+        'shots': [shot_key for shot_key, _ in shots],
+        'positions': [round(position, 4) for position in positions],
+        'systems': {name: [milestone_index(table['breakpoints'], position) for position in positions]
+                    for name, table in tables.items()}
+    }
+
+
+def write_shot_milestones(table: Dict[str, Any], tables: Dict[str, Dict[str, List]],
+                          shots_dir: str = SHOTS_PATH) -> int:
+    """Store {system: label} as shot_data['milestones']; returns files changed."""
+    updated = 0
+    for row, shot_key in enumerate(table['shots']):
+        labels = {name: tables[name]['labels'][indices[row]] for name, indices in table['systems'].items()}
+        shot_file = Path(shots_dir) / f"{shot_key}.json"
+        with open(shot_file, 'r', encoding='utf-8') as f:
+            shot_data = json.load(f)
+        if shot_data.get('milestones') == labels:
+            continue
+        shot_data['milestones'] = labels
+        with open(shot_file, 'w', encoding='utf-8') as f:
+            json.dump(shot_data, f, indent=2)
+        updated += 1
+    return updated
+
+
+def main():
+    """Main execution"""
+    print("🏁 Compiling milestone tables...")
+    tables = compile_milestones(load_json(f"{APP_PATH}/main_film_system.json"))
+    table = shot_milestone_table(load_shots(SHOTS_PATH), tables)
+
+    with open(MILESTONES_PATH, 'w', encoding='utf-8') as f:
+        json.dump({'tables': tables, 'shots': table}, f, indent=2, ensure_ascii=False)
+    for name, compiled in tables.items():
+        print(f"   {name}: {len(compiled['breakpoints'])} breakpoints")
+
+    updated = write_shot_milestones(table, tables)
+    print(f"\n✅ Milestone labels written to {updated} shot files")
+    print(f"📄 Tables: {MILESTONES_PATH}")
+
+
+if __name__ == "__main__":
+    main()
@@ -8,6 +8,8 @@ import re
 import os
 from pathlib import Path
 
+from corpus_store import read_text
+
 # Base paths
 ENHANCEMENT_PATH = "/Users/ingthor/Documents/stories/enhancements"
 APP_PATH = "/Users/ingthor/Documents/stories/App"
@@ -33,8 +35,7 @@ def parse_character_plates():
             print(f"Warning: {filepath} not found")
             continue
             
-        with open(filepath, 'r') as f:
-            content = f.read()
+        content = read_text(filepath)
             
         # Extract master plate
         master_match = re.search(r'([A-Z]+)-MASTER[^:]*:(.*?)(?=\n\n|\nCLOTHING|\nPHYSICAL)', content, re.DOTALL)
@@ -106,8 +107,7 @@ def parse_environmental_plates():
             print(f"Warning: {filepath} not found")
             continue
             
-        with open(filepath, 'r') as f:
-            content = f.read()
+        content = read_text(filepath)
         
         # Extract environmental plates
         patterns = [
@@ -148,8 +148,7 @@ def parse_integration_file(plate_index):
     filepath = Path(ENHANCEMENT_PATH) / "FINAL_ENVIRONMENTAL_INTEGRATION_COMPLETE_SYSTEM.txt"
     
     if filepath.exists():
-        with open(filepath, 'r') as f:
-            content = f.read()
+        content = read_text(filepath)
         
         # Extract integrated environmental descriptions
         pattern = r'(WESTFJORDS-[A-Z-]+|BAÐSTOFA-[A-Z]+|SEA-[A-Z-]+|HOUSE-[A-Z]+)[^(]*\(([^)]+)\)'
@@ -177,8 +176,7 @@ def create_shot_recommendations():
     shot_mappings = {}
     
     if master_path.exists():
-        with open(master_path, 'r') as f:
-            content = f.read()
+        content = read_text(master_path)
         
         # Parse shot-specific plate assignments
         shot_pattern = r'\*\*SHOT ([^:]+):\s*([^*]+)\*\*\s*(.*?)(?=\*\*SHOT|\*\*Family Breathing|\Z)'
@@ -239,8 +237,7 @@ def add_environmental_mappings(shot_mappings):
     filepath = Path(ENHANCEMENT_PATH) / "FINAL_ENVIRONMENTAL_INTEGRATION_COMPLETE_SYSTEM.txt"
     
     if filepath.exists():
-        with open(filepath, 'r') as f:
-            content = f.read()
+        content = read_text(filepath)
         
         # Parse shot-by-shot environmental mapping
         pattern = r'\*\*SHOT ([^:]+):[^*]+\*\*\s*(.*?)(?=\*\*SHOT|\Z)'
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Parse each shot's progressive_state into numeric columnar tracks.
+"House 13/min + 60bpm heartbeat | Klettagjá 1mm "FÓRN" visible | Camera frost 5%" becomes
+house.breaths_per_min=13, house.bpm=60, klettagja.mm=1, camera_frost.percent=5.
+Tracks are stored one array per track, indexed by shot order, so continuity checks and
+plots are array operations instead of regex passes over the shot JSON.
+"""
+
+import json
+import re
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+from film_data import APP_PATH, SHOTS_PATH, character_key, fix_mojibake, load_json, load_shots, shot_position
+
+TRACKS_PATH = f"{APP_PATH}/progressive_tracks.json"
+
+UNIT_PATTERN = r'(?:/min|bpm|mm|cm|%|°C|ft\b|feet|foot)'
+# "13/min", "5%→10%", "8/min → 6/min": an optional start value, then the value and its unit
+QUANTITY_PATTERN = re.compile(
+    rf'(?:(-?\d+(?:\.\d+)?)\s*{UNIT_PATTERN}?\s*(?:→|->)\s*)?(-?\d+(?:\.\d+)?)\s*({UNIT_PATTERN})',
+    re.IGNORECASE)
+
+# unit as written -> (track unit, scale)
+UNITS = {
+    '/min': ('breaths_per_min', 1.0),
+    'bpm': ('bpm', 1.0),
+    'mm': ('mm', 1.0),
+    'cm': ('mm', 10.0),
+    '%': ('percent', 1.0),
+    '°c': ('celsius', 1.0),
+    'ft': ('feet', 1.0),
+    'feet': ('feet', 1.0),
+    'foot': ('feet', 1.0)
+}
+
+# Leading words of a segment -> canonical subject; "Frost 5%" is the camera frost overlay
+SUBJECT_ALIASES = [
+    ('camera frost', 'camera_frost'),
+    ('frost', 'camera_frost'),
+    ('house', 'house'),
+    ('klettagja', 'klettagja'),
+    ('temperature', 'temperature'),
+    ('temp', 'temperature'),
+    ('sigrid', 'sigrid')
+]
+
+
+def canonical_subject(text: str) -> str:
+    """Canonical track subject for the words in front of a quantity."""
+    key = character_key(text)
+    key = re.sub(r'[^a-z0-9 ]+', ' ', key).strip()
+    for prefix, subject in SUBJECT_ALIASES:
+        if key.startswith(prefix):
+            return subject
+    words = key.split()
+    return '_'.join(words[:2]) if words else 'unknown'
+
+
+def parse_progressive_state(text: str) -> List[Tuple[str, float]]:
+    """Return [(track name, value)] for every quantity in a progressive_state string.
+
+    Quantities without their own subject ("+ 60bpm") belong to the segment's subject.
+    A transition "5%→10%" records the state the shot ends on.
+    """
+    quantities = []
+    for segment in (text or '').split('|'):
+        segment = fix_mojibake(segment)
+        subject = None
+        for match in QUANTITY_PATTERN.finditer(segment):
+            if subject is None:
+                subject = canonical_subject(segment[:match.start()])
+            unit, scale = UNITS[match.group(3).lower()]
+            value = float(match.group(2)) * scale
+            quantities.append((f"{subject}.{unit}", value))
+    return quantities
+
+
+def shot_progressive_state(shot_data: Dict[str, Any]) -> str:
+    """Shot-level progressive_state, falling back to the first variant that has one."""
+    if shot_data.get('progressive_state'):
+        return shot_data['progressive_state']
+    for variant in shot_data.get('prompt_variants', []):
+        if variant.get('progressive_state'):
+            return variant['progressive_state']
+    return ''
+
+
+def build_tracks(shots: List[Tuple[str, Dict[str, Any]]]) -> Dict[str, Any]:
+    """Columnar table: shot keys, positions and one float array per track (NaN where absent)."""
+    parsed = [parse_progressive_state(shot_progressive_state(shot_data)) for _, shot_data in shots]
+    names = sorted({name for quantities in parsed for name, _ in quantities})
+    columns = {name: np.full(len(shots), np.nan) for name in names}
+    for row, quantities in enumerate(parsed):
+        for name, value in quantities:
+            # A repeated quantity in one state string keeps the last mention
+            columns[name][row] = value
+    return {
+        'shots': [shot_key for shot_key, _ in shots],
+        'positions': np.array([shot_position(index, len(shots)) for index in range(len(shots))]),
+        'tracks': columns
+    }
+
+
+def tracks_to_json(table: Dict[str, Any]) -> Dict[str, Any]:
+    """JSON form of the table; NaN becomes null."""
+    def column(values):
+        return [None if np.isnan(value) else round(float(value), 3) for value in values]
+
+    return {
+        'shots': table['shots'],
+        'positions': column(table['positions']),
+        'tracks': {name: column(values) for name, values in table['tracks'].items()}
+    }
+
+
+def load_tracks(path: str = TRACKS_PATH) -> Dict[str, Any]:
+    """Read a saved table back into NumPy arrays."""
+    data = load_json(path)
+    if not data:
+        return {'shots': [], 'positions': np.array([]), 'tracks': {}}
+
+    def array(values):
+        return np.array([np.nan if value is None else value for value in values], dtype=float)
+
+    return {
+        'shots': data['shots'],
+        'positions': array(data['positions']),
+        'tracks': {name: array(values) for name, values in data['tracks'].items()}
+    }
+
+
+def main():
+    """Main execution"""
+    print("🧮 Parsing progressive states into tracks...")
+    table = build_tracks(load_shots(SHOTS_PATH))
+
+    with open(TRACKS_PATH, 'w', encoding='utf-8') as f:
+        json.dump(tracks_to_json(table), f, indent=2, ensure_ascii=False)
+
+    for name, values in table['tracks'].items():
+        present = ~np.isnan(values)
+        print(f"   {name}: {int(present.sum())} shots, "
+              f"range {np.nanmin(values):g}–{np.nanmax(values):g}")
+    print(f"\n✅ {len(table['tracks'])} tracks across {len(table['shots'])} shots")
+    print(f"📄 Tracks: {TRACKS_PATH}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Batch-render the complete generation prompt for every shot x variant x selected plate.
+Output matches PromptVariant.generateCompletePrompt in DataModels.swift; only prompts
+whose inputs changed since the last run are re-rendered.
+"""
+
+import hashlib
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from film_data import (APP_PATH, DEFAULT_ASPECT_RATIO, DEFAULT_DURATION, SHOTS_PATH,
+                       load_plate_descriptions, load_shots, shot_position)
+
+PROMPTS_PATH = f"{APP_PATH}/prompts"
+MANIFEST_NAME = "manifest.json"
+FILENAME_PART_CHARS = 60
+
+# Templates are formatted once per section, in the same order the Swift builder appends them
+RENDER_CHARACTER_PLATE = "CHARACTER PLATE: {}\n\n".format
+RENDER_CUSTOM_CHARACTER = "CHARACTER: {}\n\n".format
+RENDER_ENVIRONMENT = "ENVIRONMENT: {}\n\n".format
+RENDER_BODY = ("Subject: {subject}\n"
+               "Action: {action}\n"
+               "Scene: {scene}\n"
+               "Style: {style}\n"
+               "Camera Position: {camera_position}").format_map
+RENDER_DIALOGUE = "\nDialogue: {}".format
+RENDER_AUXILIARY = ("\n\n--- AUXILIARY INFORMATION ---\n"
+                    "Duration: {duration} seconds\n"
+                    "Aspect Ratio: {aspect_ratio}\n"
+                    "Shot ID: {shot_id}\n"
+                    "Sequence: {sequence}\n"
+                    "Position: {position}% through film").format_map
+RENDER_PROGRESSIVE_STATE = "\nProgressive State: {}".format
+RENDER_NEGATIVE = "\n\nTechnical (Negative Prompt): {}".format
+
+
+def _with_modifier(text: str, modifier: str, separator: str) -> str:
+    """Append a generated modifier (e.g. degradation_style) to hand-written prompt text."""
+    return separator.join(part for part in (text, modifier) if part)
+
+
+def build_prompt_inputs(shot_key: str, shot_data: Dict[str, Any], variant: Dict[str, Any], position: float,
+                        character_plate_id: Optional[str], environment_plate_id: Optional[str],
+                        character_plates: Dict[str, str], env_plates: Dict[str, str]) -> Dict[str, Any]:
+    """Collect everything one rendered prompt depends on into a flat, picklable dict."""
+    metadata = shot_data.get('shot_metadata', {})
+    return {
+        'shot_key': shot_key,
+        'variant_id': variant.get('variant_id', f"{metadata.get('id')}_variant"),
+        'character_plate_id': character_plate_id,
+        'environment_plate_id': environment_plate_id,
+        # Hashed lookups replace the Swift first(where:) scans; unknown IDs fall back to custom text
+        'character_plate': character_plates.get(character_plate_id) if character_plate_id else None,
+        'environment_plate': env_plates.get(environment_plate_id) if environment_plate_id else None,
+        'custom_character_plate': variant.get('custom_character_plate', ''),
+        'custom_environment_plate': variant.get('custom_environment_plate', ''),
+        'subject': variant.get('subject', ''),
+        'action': variant.get('action', ''),
+        'scene': variant.get('scene', ''),
+        'style': _with_modifier(variant.get('style', ''), variant.get('degradation_style', ''), ' '),
+        'camera_position': variant.get('camera_position', ''),
+        'dialogue': variant.get('dialogue', ''),
+        'duration': metadata.get('duration_seconds', DEFAULT_DURATION),
+        'aspect_ratio': metadata.get('aspect_ratio', DEFAULT_ASPECT_RATIO),
+        'shot_id': metadata.get('id', ''),
+        'sequence': metadata.get('sequence_type', 'main_story'),
+        'position': int(position),
+        'progressive_state': variant.get('progressive_state') or shot_data.get('progressive_state', ''),
+        'negative_prompt': _with_modifier(variant.get('negative_prompt', ''),
+                                          variant.get('degradation_negative', ''), ', '),
+    }
+
+
+def render_prompt(inputs: Dict[str, Any], include_auxiliary: bool = True) -> str:
+    """Render one prompt exactly as PromptVariant.generateCompletePrompt lays it out.
+
+    include_auxiliary=False leaves out the auxiliary block (used when compacting to a token budget).
+    """
+    parts = []
+
+    if inputs['character_plate'] is not None:
+        parts.append(RENDER_CHARACTER_PLATE(inputs['character_plate']))
+    elif inputs['custom_character_plate']:
+        parts.append(RENDER_CUSTOM_CHARACTER(inputs['custom_character_plate']))
+
+    if inputs['environment_plate'] is not None:
+        parts.append(RENDER_ENVIRONMENT(inputs['environment_plate']))
+    elif inputs['custom_environment_plate']:
+        parts.append(RENDER_ENVIRONMENT(inputs['custom_environment_plate']))
+
+    parts.append(RENDER_BODY(inputs))
+
+    if inputs['dialogue']:
+        parts.append(RENDER_DIALOGUE(inputs['dialogue']))
+
+    if include_auxiliary:
+        parts.append(RENDER_AUXILIARY(inputs))
+
+        if inputs['progressive_state']:
+            parts.append(RENDER_PROGRESSIVE_STATE(inputs['progressive_state']))
+
+    if inputs['negative_prompt']:
+        parts.append(RENDER_NEGATIVE(inputs['negative_prompt']))
+
+    return ''.join(parts)
+
+
+def inputs_digest(inputs: Dict[str, Any]) -> str:
+    """Stable hash of a prompt's inputs, used to skip unchanged prompts."""
+    return hashlib.sha256(json.dumps(inputs, sort_keys=True, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+
+def selected_plate_combinations(variant: Dict[str, Any]) -> List[Tuple[Optional[str], Optional[str]]]:
+    """Every (character plate, environment plate) pair chosen in the variant's selected_plates."""
+    selected = variant.get('selected_plates', {})
+    characters = list(selected.get('characters', {}).values()) or [None]
+    environments = list(selected.get('environment', {}).values()) or [None]
+    return list(product(characters, environments))
+
+
+def prompt_filename(inputs: Dict[str, Any]) -> str:
+    """File name for a rendered prompt: shot, variant and plate IDs. Parts are cut to
+    FILENAME_PART_CHARS; a cut name gets a hash of the full parts so it stays unique."""
+    parts = [str(inputs['shot_key']), str(inputs['variant_id']),
+             inputs['character_plate_id'] or 'none', inputs['environment_plate_id'] or 'none']
+    safe_parts = [re.sub(r'[^\w.-]', '_', part) for part in parts]
+    if any(len(part) > FILENAME_PART_CHARS for part in safe_parts):
+        suffix = hashlib.sha256('\0'.join(parts).encode('utf-8')).hexdigest()[:10]
+        safe_parts = [part[:FILENAME_PART_CHARS] for part in safe_parts] + [suffix]
+    return '__'.join(safe_parts) + '.txt'
+
+
+def iter_prompt_inputs(shots: List[Tuple[str, Dict[str, Any]]], character_plates: Dict[str, str],
+                       env_plates: Dict[str, str]) -> Iterator[Dict[str, Any]]:
+    """Inputs for every shot x variant x selected plate combination, in film order."""
+    for index, (shot_key, shot_data) in enumerate(shots):
+        position = shot_position(index, len(shots))
+        for variant in shot_data.get('prompt_variants', []):
+            for character_plate_id, environment_plate_id in selected_plate_combinations(variant):
+                yield build_prompt_inputs(shot_key, shot_data, variant, position,
+                                          character_plate_id, environment_plate_id,
+                                          character_plates, env_plates)
+
+
+def _render_to_file(job: Tuple[str, Dict[str, Any]]) -> str:
+    """Worker: render one prompt and write it to its output path."""
+    output_path, inputs = job
+    with open(output_path, 'w', encoding='utf-8') as f:
+        f.write(render_prompt(inputs))
+    return output_path
+
+
+def render_all_prompts(shots_dir: str = SHOTS_PATH, prompts_dir: str = PROMPTS_PATH,
+                       app_path: str = APP_PATH, max_workers: Optional[int] = None) -> Dict[str, int]:
+    """Render every prompt into prompts_dir, skipping those whose inputs are unchanged."""
+    os.makedirs(prompts_dir, exist_ok=True)
+    manifest_path = Path(prompts_dir) / MANIFEST_NAME
+    previous = {}
+    if manifest_path.exists():
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            previous = json.load(f)
+
+    shots = load_shots(shots_dir)
+    character_plates, env_plates = load_plate_descriptions(app_path)
+
+    manifest = {}
+    jobs = []
+    for inputs in iter_prompt_inputs(shots, character_plates, env_plates):
+        filename = prompt_filename(inputs)
+        digest = inputs_digest(inputs)
+        if filename in manifest:
+            raise ValueError(f"Two prompts render to the same file: {filename}")
+        manifest[filename] = digest
+        output_path = os.path.join(prompts_dir, filename)
+        if previous.get(filename) != digest or not os.path.exists(output_path):
+            jobs.append((output_path, inputs))
+
+    if len(jobs) > 1:
+        workers = max_workers or os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(_render_to_file, jobs, chunksize=max(1, len(jobs) // (workers * 4))))
+    else:
+        for job in jobs:
+            _render_to_file(job)
+
+    # Remove prompts whose shot, variant or plate selection no longer exists
+    removed = 0
+    for filename in set(previous) - set(manifest):
+        stale_path = Path(prompts_dir) / filename
+        if stale_path.exists():
+            stale_path.unlink()
+            removed += 1
+
+    with open(manifest_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+
+    return {'total': len(manifest), 'rendered': len(jobs), 'removed': removed}
+
+
+def main():
+    """Main execution"""
+    print("🎬 Rendering complete prompts...")
+    stats = render_all_prompts()
+    print(f"✅ {stats['total']} prompts ({stats['rendered']} re-rendered, {stats['removed']} removed)")
+    print(f"📁 Output: {PROMPTS_PATH}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+Persistent BM25 full-text index over the research corpus: the MegaPrompt/ tree plus the
+root research files (whole context.txt, combined_old_research.txt, res1-12.txt), and the
+PDF/DOCX bibles through their cached extracted text (document_text.py).
+Files are split into passages of a few paragraphs. Each file gets its own segment with a
+term dictionary and varint-packed (passage gap, term frequency) postings, so re-indexing
+only rebuilds segments for files whose contents changed. Tokens are lowercased and
+folded (ð -> d, þ -> th, á -> a), so "hákarl" and "hakarl" match.
+
+Usage: python3 research_index.py [query words...]
+"""
+
+import hashlib
+import heapq
+import json
+import math
+import re
+import struct
+import sys
+import time
+import unicodedata
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from document_text import DOCUMENT_SUFFIXES, DOCUMENT_TEXT_PATH, DocumentTextCache, document_files
+from film_data import ASCII_FOLD, CACHE_PATH, STORIES_PATH, load_json
+
+INDEX_PATH = f"{CACHE_PATH}/research_index"
+ROOT_RESEARCH_PATTERNS = ['whole context.txt', 'combined_old_research.txt', 'res*.txt']
+# Bump when tokenization or the segment layout changes
+INDEX_VERSION = 1
+
+PASSAGE_CHARS = 1200
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+TOKEN_PATTERN = re.compile(r'[^\W_]+')
+FOLD = {**ASCII_FOLD, ord('ø'): 'o', ord('å'): 'a'}
+
+
+def corpus_files(stories_path: str = STORIES_PATH) -> List[Path]:
+    """Research files: everything textual under MegaPrompt/, the root research files and
+    the PDF/DOCX documents. Compaction outputs have no extension, so extensionless files
+    are included."""
+    files = [path for path in Path(f"{stories_path}/MegaPrompt").rglob('*')
+             if path.is_file() and not path.name.startswith('.') and path.suffix.lower() in ('', '.txt')]
+    for pattern in ROOT_RESEARCH_PATTERNS:
+        files += Path(stories_path).glob(pattern)
+    files += document_files(stories_path)
+    return sorted(set(files))
+
+
+def fold(text: str) -> str:
+    """Lowercase, Icelandic/Danish letters to ASCII, other accents stripped."""
+    folded = text.lower().translate(FOLD)
+    if folded.isascii():
+        return folded
+    return ''.join(ch for ch in unicodedata.normalize('NFKD', folded) if not unicodedata.combining(ch))
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_PATTERN.findall(fold(text))
+
+
+def split_passages(text: str) -> Iterator[Tuple[int, int, int, int, str]]:
+    """(start line, end line, byte offset, byte length, text) of each passage; a passage ends
+    at a blank line once it has some substance, or when it grows past PASSAGE_CHARS."""
+    start_line = 0
+    offset = 0
+    buffer: List[str] = []
+    size = 0
+    for number, line in enumerate(text.splitlines(keepends=True)):
+        if not buffer:
+            start_line = number
+        buffer.append(line)
+        size += len(line)
+        if size >= PASSAGE_CHARS or (not line.strip() and size >= PASSAGE_CHARS // 4):
+            passage = ''.join(buffer)
+            length = len(passage.encode('utf-8', errors='surrogateescape'))
+            yield start_line + 1, number + 1, offset, length, passage
+            offset += length
+            buffer, size = [], 0
+    if buffer and ''.join(buffer).strip():
+        passage = ''.join(buffer)
+        yield (start_line + 1, start_line + len(buffer), offset,
+               len(passage.encode('utf-8', errors='surrogateescape')), passage)
+
+
+# Varint postings
+
+def encode_varints(values: List[int]) -> bytes:
+    out = bytearray()
+    for value in values:
+        while value >= 0x80:
+            out.append((value & 0x7F) | 0x80)
+            value >>= 7
+        out.append(value)
+    return bytes(out)
+
+
+def decode_varints(data: bytes) -> List[int]:
+    values = []
+    value = shift = 0
+    for byte in data:
+        value |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+        else:
+            values.append(value)
+            value = shift = 0
+    return values
+
+
+# Segments: 4-byte header length, JSON header, then postings for every term
+
+def build_segment(text: str) -> bytes:
+    passages = []
+    postings = defaultdict(list)
+    for passage_id, (start, end, offset, length, passage) in enumerate(split_passages(text)):
+        counts = Counter(tokenize(passage))
+        passages.append([start, end, offset, length, sum(counts.values())])
+        for term, count in counts.items():
+            postings[term].append((passage_id, count))
+
+    terms = {}
+    blob = bytearray()
+    for term in sorted(postings):
+        values = []
+        previous = 0
+        for passage_id, count in postings[term]:
+            values += [passage_id - previous, count]
+            previous = passage_id
+        encoded = encode_varints(values)
+        terms[term] = [len(blob), len(encoded), len(postings[term])]
+        blob += encoded
+    header = json.dumps({'passages': passages, 'terms': terms}, ensure_ascii=False,
+                        separators=(',', ':')).encode('utf-8')
+    return struct.pack('<I', len(header)) + header + bytes(blob)
+
+
+class Segment:
+    """One file's passages and postings, decoded lazily per term."""
+
+    def __init__(self, path: str, data: bytes):
+        self.path = path
+        header_length = struct.unpack_from('<I', data)[0]
+        header = json.loads(data[4:4 + header_length].decode('utf-8'))
+        self.passages = header['passages']
+        self.terms = header['terms']
+        self.postings = data[4 + header_length:]
+
+    def term_postings(self, term: str) -> List[Tuple[int, int]]:
+        entry = self.terms.get(term)
+        if entry is None:
+            return []
+        values = decode_varints(self.postings[entry[0]:entry[0] + entry[1]])
+        result = []
+        passage_id = 0
+        for gap, count in zip(values[::2], values[1::2]):
+            passage_id += gap
+            result.append((passage_id, count))
+        return result
+
+
+class ResearchIndex:
+    """Manifest of indexed files and their segments, with BM25 search over all of them."""
+
+    def __init__(self, index_path: str = INDEX_PATH, stories_path: str = STORIES_PATH):
+        self.index_path = Path(index_path)
+        self.stories_path = Path(stories_path)
+        manifest = load_json(self.index_path / 'manifest.json')
+        # A manifest from another index version is ignored, so every file is re-indexed
+        self.files: Dict[str, Dict[str, Any]] = \
+            manifest.get('files', {}) if manifest.get('version') == INDEX_VERSION else {}
+        self.segments: Dict[str, Segment] = {}
+        # Extracted document text lives beside the index, in the same cache directory
+        self.documents = DocumentTextCache(str(self.index_path.parent / Path(DOCUMENT_TEXT_PATH).name),
+                                           stories_path=stories_path)
+
+    def text_source(self, relative: str) -> Optional[Path]:
+        """The file passages are read from: the extracted text for PDF/DOCX documents
+        (None for a document that cannot be extracted)."""
+        path = self.stories_path / relative
+        return self.documents.text_path(path) if path.suffix.lower() in DOCUMENT_SUFFIXES else path
+
+    def update(self) -> Dict[str, int]:
+        """Re-index changed files only; unchanged files are recognised by size and mtime,
+        then by content hash. Returns counts of indexed, reused and removed files."""
+        self.index_path.mkdir(parents=True, exist_ok=True)
+        files = {}
+        stats = {'indexed': 0, 'reused': 0, 'removed': 0}
+        self.documents.update()
+        for path in corpus_files(str(self.stories_path)):
+            relative = str(path.relative_to(self.stories_path))
+            stat = path.stat()
+            known = self.files.get(relative)
+            if known and known['size'] == stat.st_size and known['mtime_ns'] == stat.st_mtime_ns:
+                files[relative] = known
+                stats['reused'] += 1
+                continue
+            source = self.text_source(relative)
+            if source is None:
+                # Unreadable document; the document cache records the error
+                continue
+            raw = source.read_bytes()
+            digest = hashlib.sha256(raw).hexdigest()[:24]
+            segment_file = self.index_path / f"{digest}.seg"
+            if segment_file.exists():
+                stats['reused'] += 1
+            else:
+                # surrogateescape keeps byte offsets exact for the odd non-UTF-8 file
+                segment_file.write_bytes(build_segment(raw.decode('utf-8', errors='surrogateescape')))
+                stats['indexed'] += 1
+            files[relative] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'segment': digest}
+
+        in_use = {entry['segment'] for entry in files.values()}
+        for segment_file in self.index_path.glob('*.seg'):
+            if segment_file.stem not in in_use:
+                segment_file.unlink()
+                stats['removed'] += 1
+        self.files = files
+        self.segments = {}
+        (self.index_path / 'manifest.json').write_text(
+            json.dumps({'version': INDEX_VERSION, 'files': files}, indent=2, ensure_ascii=False), encoding='utf-8')
+        return stats
+
+    def load(self) -> None:
+        for relative, entry in self.files.items():
+            if relative not in self.segments:
+                self.segments[relative] = Segment(
+                    relative, (self.index_path / f"{entry['segment']}.seg").read_bytes())
+
+    def search(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """Top passages by BM25, each with its file, line range and text."""
+        self.load()
+        terms = list(dict.fromkeys(tokenize(query)))
+        passage_count = sum(len(segment.passages) for segment in self.segments.values())
+        if not terms or not passage_count:
+            return []
+        average_length = sum(passage[4] for segment in self.segments.values()
+                             for passage in segment.passages) / passage_count
+
+        scores: Dict[Tuple[str, int], float] = defaultdict(float)
+        for term in terms:
+            frequency = sum(segment.terms[term][2] for segment in self.segments.values() if term in segment.terms)
+            if not frequency:
+                continue
+            idf = math.log(1 + (passage_count - frequency + 0.5) / (frequency + 0.5))
+            for relative, segment in self.segments.items():
+                for passage_id, count in segment.term_postings(term):
+                    length = segment.passages[passage_id][4]
+                    norm = BM25_K1 * (1 - BM25_B + BM25_B * length / average_length)
+                    scores[(relative, passage_id)] += idf * count * (BM25_K1 + 1) / (count + norm)
+
+        results = []
+        for (relative, passage_id), score in heapq.nlargest(limit, scores.items(), key=lambda item: item[1]):
+            start, end, offset, length, _ = self.segments[relative].passages[passage_id]
+            results.append({'path': relative, 'start_line': start, 'end_line': end, 'byte_offset': offset,
+                            'score': round(score, 3), 'text': self.passage_text(relative, offset, length)})
+        return results
+
+    def passage_text(self, relative: str, offset: int, length: int) -> str:
+        source = self.text_source(relative)
+        if source is None:
+            return ''
+        with open(source, 'rb') as f:
+            f.seek(offset)
+            return f.read(length).decode('utf-8', errors='replace')
+
+
+def main(query: Optional[str] = None):
+    """Main execution"""
+    print("📚 Updating research index...")
+    index = ResearchIndex()
+    stats = index.update()
+    print(f"   {len(index.files)} files: {stats['indexed']} indexed, {stats['reused']} unchanged, "
+          f"{stats['removed']} stale segments removed")
+
+    if query:
+        index.load()
+        start = time.perf_counter()
+        results = index.search(query)
+        elapsed = (time.perf_counter() - start) * 1000
+        for result in results:
+            snippet = ' '.join(result['text'].split())[:160]
+            print(f"\n{result['score']:7.2f}  {result['path']}:{result['start_line']}-{result['end_line']}")
+            print(f"         {snippet}")
+        print(f"\n✅ {len(results)} passages in {elapsed:.0f}ms")
+    else:
+        print(f"\n✅ Index at {INDEX_PATH}")
+
+
+if __name__ == "__main__":
+    main(' '.join(sys.argv[1:]))
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Cross-document shot reference index.
+One compiled pattern finds shot mentions in every text file of the stories tree and in
+file names: "SHOT 12", "Shot 9c", "shot_55point5", "Shots 26-35", "shot_23_24_four_corners".
+Ranges and lists are expanded, and each hit is normalized to its canonical shot ID.
+Hits are stored per file with their offset, line and context, and files are rescanned
+only when their size or mtime changes. The persisted shot -> references map lets the app
+list every note about a shot without scanning.
+
+Usage: python3 shot_references.py [shot id]
+"""
+
+import json
+import re
+import sys
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Tuple
+
+from film_data import CACHE_PATH, STORIES_PATH, canonical_shot_id, load_json
+
+REFERENCES_PATH = f"{CACHE_PATH}/shot_references.json"
+# Bump when the pattern changes so every file is rescanned
+REFERENCES_VERSION = 1
+
+EXCLUDED_PARTS = {'.git', '.chunk_store', 'cache', '__pycache__', 'Assets.xcassets'}
+BINARY_SUFFIXES = {'.pdf', '.docx', '.epub', '.jpg', '.jpeg', '.png', '.gif', '.avif', '.webp', '.mp4', '.mov',
+                   '.zip', '.xcuserstate', '.pyc'}
+CONTEXT_CHARS = 60
+MAX_RANGE = 200
+
+# A shot ID inside references: "_" is a decimal point only before a single digit, so
+# shot_12_5 is 12.5 but shot_23_24 is shots 23 and 24
+_ID = r'(?:minus|-)?\d+(?:(?:\.|point|_(?=\d(?!\d)))\d+)?(?:[a-z](?![a-z]))?(?![a-z\d])'
+REFERENCE_PATTERN = re.compile(
+    r'(?<![a-z])shots?[ _#]*(?P<first>' + _ID + r')'
+    r'(?:\s*(?:-|–|—|to|through)\s*(?P<last>' + _ID.replace('(?:minus|-)?', '') + r'))?'
+    r'(?P<more>(?:\s*(?:,|&|/|_|and)\s*' + _ID + r')*)',
+    re.IGNORECASE)
+_MORE_ID = re.compile(_ID, re.IGNORECASE)
+
+
+def expand_reference(match: re.Match) -> List[str]:
+    """Canonical shot IDs named by one match; whole-number ranges are expanded."""
+    first = canonical_shot_id(match.group('first'))
+    keys = [first]
+    if match.group('last'):
+        last = canonical_shot_id(match.group('last'))
+        if first.lstrip('-').isdigit() and last.isdigit() and 0 < int(last) - int(first) <= MAX_RANGE:
+            keys += [str(number) for number in range(int(first) + 1, int(last) + 1)]
+        else:
+            keys.append(last)
+    if match.group('more'):
+        keys += [canonical_shot_id(token) for token in _MORE_ID.findall(match.group('more'))]
+    return list(dict.fromkeys(keys))
+
+
+def scan_text(text: str) -> Iterator[Tuple[str, int, int, str]]:
+    """(shot key, offset, line, context) for every reference in text."""
+    line = 1
+    position = 0
+    for match in REFERENCE_PATTERN.finditer(text):
+        line += text.count('\n', position, match.start())
+        position = match.start()
+        context = ' '.join(text[max(0, match.start() - CONTEXT_CHARS):match.end() + CONTEXT_CHARS].split())
+        for key in expand_reference(match):
+            yield key, match.start(), line, context
+
+
+def reference_files(root: Path) -> List[Path]:
+    return sorted(path for path in root.rglob('*')
+                  if path.is_file() and not path.name.startswith('.')
+                  and path.suffix.lower() not in BINARY_SUFFIXES
+                  and not EXCLUDED_PARTS.intersection(path.relative_to(root).parts[:-1]))
+
+
+def scan_file(path: Path) -> List[List[Any]]:
+    """Hits in the file name (offset -1) and, for text files, in the contents."""
+    hits = [[key, -1, 0, path.name] for key, _, _, _ in scan_text(path.name)]
+    raw = path.read_bytes()
+    if b'\0' in raw[:8192]:
+        return hits
+    return hits + [list(hit) for hit in scan_text(raw.decode('utf-8', errors='replace'))]
+
+
+class ShotReferenceIndex:
+    """Per-file hits plus the shot -> [(file, offset, line, context)] map built from them."""
+
+    def __init__(self, path: str = REFERENCES_PATH, root: str = STORIES_PATH):
+        self.path = Path(path)
+        self.root = Path(root)
+        data = load_json(self.path)
+        current = data.get('version') == REFERENCES_VERSION
+        self.files: Dict[str, Dict[str, Any]] = data.get('files', {}) if current else {}
+        self.shots: Dict[str, List[List[Any]]] = data.get('shots', {}) if current else {}
+
+    def update(self) -> Dict[str, int]:
+        """Rescan new and changed files, drop deleted ones, rebuild the shot map."""
+        files = {}
+        stats = {'scanned': 0, 'unchanged': 0, 'removed': 0}
+        for path in reference_files(self.root):
+            relative = str(path.relative_to(self.root))
+            stat = path.stat()
+            known = self.files.get(relative)
+            if known and known['size'] == stat.st_size and known['mtime_ns'] == stat.st_mtime_ns:
+                files[relative] = known
+                stats['unchanged'] += 1
+                continue
+            files[relative] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'hits': scan_file(path)}
+            stats['scanned'] += 1
+        stats['removed'] = len(set(self.files) - set(files))
+
+        if stats['scanned'] or stats['removed'] or not self.shots:
+            shots: Dict[str, List[List[Any]]] = {}
+            for relative, entry in files.items():
+                for key, offset, line, context in entry['hits']:
+                    shots.setdefault(key, []).append([relative, offset, line, context])
+            self.files, self.shots = files, shots
+            self.save()
+        return stats
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump({'version': REFERENCES_VERSION, 'files': self.files, 'shots': self.shots}, f,
+                      ensure_ascii=False)
+
+    def references(self, shot_id: str) -> List[Dict[str, Any]]:
+        """Every mention of a shot, in any spelling of its ID."""
+        return [{'file': relative, 'offset': offset, 'line': line, 'context': context}
+                for relative, offset, line, context in self.shots.get(canonical_shot_id(shot_id), [])]
+
+
+def main(shot_id: str = ''):
+    """Main execution"""
+    print("🔗 Indexing shot references across the stories tree...")
+    index = ShotReferenceIndex()
+    stats = index.update()
+    print(f"   {len(index.files)} files: {stats['scanned']} scanned, {stats['unchanged']} unchanged, "
+          f"{stats['removed']} removed")
+    print(f"   {len(index.shots)} shots, {sum(len(refs) for refs in index.shots.values())} references")
+
+    if shot_id:
+        references = index.references(shot_id)
+        by_file: Dict[str, int] = {}
+        for reference in references:
+            by_file[reference['file']] = by_file.get(reference['file'], 0) + 1
+        for relative, count in sorted(by_file.items(), key=lambda item: -item[1]):
+            print(f"   {count:4}  {relative}")
+        print(f"\n✅ Shot {canonical_shot_id(shot_id)}: {len(references)} references in {len(by_file)} files")
+    else:
+        print(f"\n✅ Index at {REFERENCES_PATH}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1] if len(sys.argv) > 1 else '')
@@ -3,6 +3,8 @@
 import re
 import os
 
+from corpus_store import read_text
+
 def split_shots():
     # Read the V18 file
     input_file = "/Users/ingthor/Documents/stories/App/v18_only_shots_true_orig.txt"
@@ -11,8 +13,7 @@ def split_shots():
     # Create output directory if it doesn't exist
     os.makedirs(output_dir, exist_ok=True)
     
-    with open(input_file, 'r', encoding='utf-8') as f:
-        content = f.read()
+    content = read_text(input_file)
     
     # Split by "SHOT" followed by space and any identifier
     shots = re.split(r'\n(?=SHOT\s)', content)
@@ -3,6 +3,32 @@
 import re
 import os
 
+from corpus_store import read_text
+
+# Shot grammar shared with version_diff.py
+MAIN_STORY_PATTERN = re.compile(r'\n\s*Main story:\s*\n', re.IGNORECASE)
+SHOT_SPLIT_PATTERN = re.compile(r'\n(?=SHOT\s)')
+SHOT_HEADING_PATTERN = re.compile(r'SHOT\s+([^:]+):\s*(.+)')
+
+def split_sections(content):
+    """[(section_type, content)]: prologue and main around "Main story:", else one unknown section"""
+    main_story_match = MAIN_STORY_PATTERN.search(content)
+    if not main_story_match:
+        return [("unknown", content)]
+    return [("prologue", content[:main_story_match.start()]), ("main", content[main_story_match.end():])]
+
+def split_section_shots(content):
+    """Yield (shot_id, shot_title, text) per shot; id and title are None without a SHOT heading"""
+    for shot_content in SHOT_SPLIT_PATTERN.split(content):
+        if not shot_content.strip():
+            continue
+        first_line = shot_content.strip().split('\n')[0].strip()
+        shot_match = SHOT_HEADING_PATTERN.match(first_line)
+        if shot_match:
+            yield shot_match.group(1).strip(), shot_match.group(2).strip(), shot_content.strip()
+        else:
+            yield None, None, shot_content.strip()
+
 def split_shots():
     # Read the V18 file
     input_file = "/Users/ingthor/Documents/stories/App/v18_only_shots_true_orig.txt"
@@ -11,48 +37,22 @@ def split_shots():
     # Create output directory if it doesn't exist
     os.makedirs(output_dir, exist_ok=True)
     
-    with open(input_file, 'r', encoding='utf-8') as f:
-        content = f.read()
+    content = read_text(input_file)
     
     # First split by major sections
     # Find "Main story:" marker to separate prologue from main
-    main_story_match = re.search(r'\n\s*Main story:\s*\n', content, re.IGNORECASE)
-    
-    if main_story_match:
-        prologue_content = content[:main_story_match.start()]
-        main_story_content = content[main_story_match.end():]
-        
-        # Process prologue shots
-        process_section(prologue_content, "prologue", output_dir)
-        
-        # Process main story shots  
-        process_section(main_story_content, "main", output_dir)
-    else:
+    sections = split_sections(content)
+    if sections[0][0] == "unknown":
         print("Could not find 'Main story:' separator - processing as single section")
-        process_section(content, "unknown", output_dir)
+    
+    for section_type, section_content in sections:
+        process_section(section_content, section_type, output_dir)
 
 def process_section(content, section_type, output_dir):
     # Split by "SHOT" followed by space and any identifier
-    shots = re.split(r'\n(?=SHOT\s)', content)
-    
-    for i, shot_content in enumerate(shots):
-        if not shot_content.strip():
-            continue
-            
-        lines = shot_content.strip().split('\n')
-        if not lines:
-            continue
-            
-        # Get the first line as the shot identifier
-        first_line = lines[0].strip()
-        
-        # Extract shot ID from first line (e.g., "SHOT 0a: THE SHADOW POLE" -> "0a_THE_SHADOW_POLE")
-        shot_match = re.match(r'SHOT\s+([^:]+):\s*(.+)', first_line)
-        
-        if shot_match:
-            shot_id = shot_match.group(1).strip()
-            shot_title = shot_match.group(2).strip()
-            
+    for i, (shot_id, shot_title, shot_content) in enumerate(split_section_shots(content)):
+        # Shot ID from the first line (e.g., "SHOT 0a: THE SHADOW POLE" -> "0a_THE_SHADOW_POLE")
+        if shot_id is not None:
             # Clean up the shot ID and title for filename
             safe_id = re.sub(r'[^\w-]', '_', shot_id)
             safe_title = re.sub(r'[^\w\s-]', '', shot_title)
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Canonical shot order from the STITCH graph merged with numeric shot-ID order.
+Inserted shots (12_5, 16point5, minus1) are placed by their ID, and a shot never comes
+before the shot it stitches from. The order is a topological sort of the stitch graph
+that always takes the ready shot earliest in ID order; when nothing is ready, the cycle
+holding up the earliest unplaced shot is broken at the cycle's own earliest shot. Each
+cycle (a shot stitching from itself included) is reported once, together with dangling
+references. Results are cached (in
+memory, and in stitch_order.json for main) by a hash of every shot's ID, sequence and
+stitch_from field. The timeline index lays shots out in this order.
+"""
+
+import hashlib
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+from film_data import APP_PATH, SHOTS_PATH, canonical_shot_id, load_json, load_shots, shot_id_order
+from stitch_scheduler import build_stitch_graph, sequence_group, successors_of
+
+ORDER_PATH = f"{APP_PATH}/stitch_order.json"
+
+_order_cache: Dict[str, Dict[str, Any]] = {}
+
+
+def stitch_fields_hash(shots: List[Tuple[str, Dict[str, Any]]]) -> str:
+    """Hash of everything the order depends on; independent of load order."""
+    fields = sorted(
+        (shot_key, str(metadata.get('id', '')), metadata.get('sequence_type', ''), metadata.get('stitch_from', ''))
+        for shot_key, metadata in ((key, data.get('shot_metadata', {})) for key, data in shots))
+    return hashlib.sha256(json.dumps(fields, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+
+def id_rank(shots: List[Tuple[str, Dict[str, Any]]]) -> Dict[str, int]:
+    """Shot key -> position in numeric order (prologue first; file key breaks ties)."""
+    def sort_key(item):
+        shot_key, shot_data = item
+        return (0 if sequence_group(shot_data) == 'prologue' else 1,
+                shot_id_order(str(shot_data['shot_metadata'].get('id', ''))), shot_key)
+    return {shot_key: rank for rank, (shot_key, _) in enumerate(sorted(shots, key=sort_key))}
+
+
+def _find_cycle(start: str, predecessors: Dict[str, List[str]], indegree: Dict[str, int]) -> List[str]:
+    """Walk unplaced predecessors from `start` until a shot repeats; returns that cycle in
+    stitch order. Every unplaced shot has one while nothing is ready."""
+    seen = {}
+    path = []
+    key = start
+    while key not in seen:
+        seen[key] = len(path)
+        path.append(key)
+        key = next(pred for pred in predecessors[key] if indegree[pred] >= 0)
+    return path[seen[key]:][::-1]
+
+
+def canonical_order(shots: List[Tuple[str, Dict[str, Any]]]) -> Dict[str, Any]:
+    """Kahn's algorithm with a bucket queue over ID ranks (0..n-1).
+
+    Returns {'order', 'cycles', 'dangling', 'hash'}. A placed shot has indegree -1.
+    """
+    predecessors, dangling = build_stitch_graph(shots)
+    successors = successors_of(predecessors)
+    rank = id_rank(shots)
+    by_rank = sorted(rank, key=rank.get)
+
+    # build_stitch_graph drops a shot's edge to itself; a reference nothing else answers is a loop
+    own_ids = {shot_key: canonical_shot_id(shot_data['shot_metadata']['id']) for shot_key, shot_data in shots}
+    loops = [ref for ref in dangling if ref['reference'] == own_ids[ref['shot']]]
+    dangling = [ref for ref in dangling if ref not in loops]
+    cycles = [[ref['shot']] for ref in sorted(loops, key=lambda ref: rank[ref['shot']])]
+
+    indegree = {key: len(preds) for key, preds in predecessors.items()}
+    # ready[r] is set while the shot of rank r is ready; `cursor` is at or below the lowest
+    ready = [indegree[key] == 0 for key in by_rank]
+    cursor = 0
+    next_pending = 0
+    order = []
+
+    while len(order) < len(rank):
+        while cursor < len(ready) and not ready[cursor]:
+            cursor += 1
+        if cursor == len(ready):
+            # Stalled: break the cycle holding up the earliest unplaced shot at its earliest shot
+            while indegree[by_rank[next_pending]] < 0:
+                next_pending += 1
+            cycle = _find_cycle(by_rank[next_pending], predecessors, indegree)
+            first = min(range(len(cycle)), key=lambda i: rank[cycle[i]])
+            cycles.append(cycle[first:] + cycle[:first])
+            cursor = rank[cycle[first]]
+            ready[cursor] = True
+        key = by_rank[cursor]
+        ready[cursor] = False
+        indegree[key] = -1
+        order.append(key)
+        for succ in successors[key]:
+            if indegree[succ] > 0:
+                indegree[succ] -= 1
+                if indegree[succ] == 0:
+                    ready[rank[succ]] = True
+                    cursor = min(cursor, rank[succ])
+
+    return {'order': order, 'cycles': cycles, 'dangling': dangling, 'hash': stitch_fields_hash(shots)}
+
+
+def cached_canonical_order(shots: List[Tuple[str, Dict[str, Any]]],
+                           cache_path: Optional[str] = None) -> Dict[str, Any]:
+    """canonical_order, reused while no stitch field has changed (also from cache_path if given)."""
+    digest = stitch_fields_hash(shots)
+    if digest not in _order_cache:
+        cached = load_json(cache_path) if cache_path else {}
+        _order_cache[digest] = cached if cached.get('hash') == digest else canonical_order(shots)
+    return _order_cache[digest]
+
+
+def canonical_shots(shots: List[Tuple[str, Dict[str, Any]]]) -> List[Tuple[str, Dict[str, Any]]]:
+    """The loaded shots rearranged into canonical order."""
+    by_key = dict(shots)
+    return [(key, by_key[key]) for key in cached_canonical_order(shots)['order']]
+
+
+def main():
+    """Main execution"""
+    print("🧵 Deriving canonical shot order from STITCH references...")
+    shots = load_shots(SHOTS_PATH)
+    result = cached_canonical_order(shots, ORDER_PATH)
+
+    with open(ORDER_PATH, 'w', encoding='utf-8') as f:
+        json.dump(result, f, indent=2, ensure_ascii=False)
+
+    loaded = [key for key, _ in shots]
+    moved = [key for index, key in enumerate(result['order']) if loaded[index] != key]
+    print(f"   {len(result['order'])} shots, {len(moved)} placed differently from file order")
+    for key in moved:
+        print(f"   ↪ {key}: {loaded.index(key)} -> {result['order'].index(key)}")
+    for cycle in result['cycles']:
+        print(f"⚠️  Stitch cycle: {' -> '.join(cycle)}")
+    for ref in result['dangling']:
+        print(f"⚠️  {ref['shot']} stitches from missing shot {ref['reference']}")
+
+    print(f"\n✅ Canonical order written to {ORDER_PATH}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+STITCH-aware render scheduler.
+Each shot's stitch_from ("[STITCH from Shot 9: ...]") makes it depend on its predecessor's
+final frame. The references form a DAG; independent chains run in parallel, shots within
+a chain run in order, and ready shots are prioritised by critical-path length.
+"""
+
+import asyncio
+import heapq
+import json
+import re
+from collections import defaultdict
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
+
+from film_data import APP_PATH, SHOTS_PATH, SHOT_ID_TOKEN, canonical_shot_id, load_shots
+
+SCHEDULE_PATH = f"{APP_PATH}/stitch_schedule.json"
+MAX_PARALLEL = 4
+
+# "[STITCH from Shot 9: ...]", "[STITCH from Shot 51c revised: ...]", "[STITCH from either version of 47b/c: ...]",
+# "[STITCH from Shot 16point5: ...]"
+STITCH_PATTERN = re.compile(r'\[STITCH from (?:Shot[ _]?|either version of )?(' + SHOT_ID_TOKEN + r')((?:/[a-z])*)',
+                            re.IGNORECASE)
+
+
+def parse_stitch_refs(stitch_from: str) -> List[str]:
+    """Shot IDs a stitch_from field refers to ([] for NO STITCH or an empty field)."""
+    match = STITCH_PATTERN.search(stitch_from or '')
+    if not match:
+        return []
+    base_id = canonical_shot_id(match.group(1))
+    refs = [base_id]
+    # "47b/c" means either 47b or 47c
+    stem = re.sub(r'[a-z]$', '', base_id)
+    refs += [stem + suffix for suffix in match.group(2).lower().split('/') if suffix]
+    return refs
+
+
+def sequence_group(shot_data: Dict[str, Any]) -> str:
+    """Prologue and main story number their shots independently."""
+    return 'prologue' if shot_data['shot_metadata'].get('sequence_type') == 'prologue' else 'main'
+
+
+def build_stitch_graph(shots: List[Tuple[str, Dict[str, Any]]]) -> Tuple[Dict[str, List[str]], List[Dict[str, str]]]:
+    """Return (predecessors per shot key, dangling references).
+
+    A reference to an ID with several alternate shots depends on all of them, since any
+    alternate may be the one finally cut in.
+    """
+    by_id = defaultdict(list)
+    for shot_key, shot_data in shots:
+        by_id[(sequence_group(shot_data), canonical_shot_id(shot_data['shot_metadata']['id']))].append(shot_key)
+
+    predecessors = {}
+    dangling = []
+    for shot_key, shot_data in shots:
+        group = sequence_group(shot_data)
+        preds = []
+        for ref in parse_stitch_refs(shot_data['shot_metadata'].get('stitch_from', '')):
+            targets = [key for key in by_id.get((group, ref), []) if key != shot_key]
+            if not targets:
+                dangling.append({'shot': shot_key, 'reference': ref})
+            preds += [key for key in targets if key not in preds]
+        predecessors[shot_key] = preds
+    return predecessors, dangling
+
+
+def successors_of(predecessors: Dict[str, List[str]]) -> Dict[str, List[str]]:
+    successors = {key: [] for key in predecessors}
+    for key, preds in predecessors.items():
+        for pred in preds:
+            successors[pred].append(key)
+    return successors
+
+
+def topological_order(predecessors: Dict[str, List[str]]) -> Tuple[List[str], List[str]]:
+    """Kahn's algorithm; returns (order, shots left over because they sit on a cycle)."""
+    successors = successors_of(predecessors)
+    indegree = {key: len(preds) for key, preds in predecessors.items()}
+    ready = [key for key, degree in indegree.items() if degree == 0]
+    order = []
+    while ready:
+        key = ready.pop()
+        order.append(key)
+        for succ in successors[key]:
+            indegree[succ] -= 1
+            if indegree[succ] == 0:
+                ready.append(succ)
+    cyclic = [key for key, degree in indegree.items() if degree > 0]
+    return order, cyclic
+
+
+def cycle_members(predecessors: Dict[str, List[str]], cyclic: List[str]) -> List[str]:
+    """The shots of cyclic that sit on a cycle, not merely stitched from one."""
+    successors = successors_of(predecessors)
+    left = set(cyclic)
+    outdegree = {key: sum(succ in left for succ in successors[key]) for key in cyclic}
+    sinks = [key for key, degree in outdegree.items() if degree == 0]
+    while sinks:
+        key = sinks.pop()
+        left.discard(key)
+        for pred in predecessors[key]:
+            if pred in left:
+                outdegree[pred] -= 1
+                if outdegree[pred] == 0:
+                    sinks.append(pred)
+    return [key for key in cyclic if key in left]
+
+
+def independent_chains(predecessors: Dict[str, List[str]]) -> List[List[str]]:
+    """Weakly connected components of the stitch graph, each in dependency order."""
+    parent = {key: key for key in predecessors}
+
+    def find(key):
+        while parent[key] != key:
+            parent[key] = parent[parent[key]]
+            key = parent[key]
+        return key
+
+    for key, preds in predecessors.items():
+        for pred in preds:
+            parent[find(pred)] = find(key)
+
+    order, cyclic = topological_order(predecessors)
+    chains = defaultdict(list)
+    for key in order + cyclic:
+        chains[find(key)].append(key)
+    return sorted(chains.values(), key=len, reverse=True)
+
+
+def critical_path_lengths(predecessors: Dict[str, List[str]],
+                          cost: Callable[[str], float] = lambda key: 1.0) -> Dict[str, float]:
+    """Longest cost from each shot to the end of its chain, the shot itself included."""
+    successors = successors_of(predecessors)
+    order, cyclic = topological_order(predecessors)
+    lengths = {}
+    for key in reversed(order):
+        lengths[key] = cost(key) + max((lengths[succ] for succ in successors[key] if succ in lengths), default=0.0)
+    for key in cyclic:
+        lengths[key] = cost(key)
+    return lengths
+
+
+def simulate_schedule(predecessors: Dict[str, List[str]], max_parallel: int = MAX_PARALLEL,
+                      cost: Callable[[str], float] = lambda key: 1.0) -> Tuple[float, Dict[str, float]]:
+    """Event simulation of the scheduler; returns (makespan, start time per shot)."""
+    successors = successors_of(predecessors)
+    priority = critical_path_lengths(predecessors, cost)
+    waiting = {key: len(preds) for key, preds in predecessors.items()}
+    ready = [(-priority[key], key) for key, count in waiting.items() if count == 0]
+    heapq.heapify(ready)
+    running = []
+    starts = {}
+    now = 0.0
+
+    while ready or running:
+        while ready and len(running) < max_parallel:
+            _, key = heapq.heappop(ready)
+            starts[key] = now
+            heapq.heappush(running, (now + cost(key), key))
+        now, key = heapq.heappop(running)
+        for succ in successors[key]:
+            waiting[succ] -= 1
+            if waiting[succ] == 0:
+                heapq.heappush(ready, (-priority[succ], succ))
+    return now, starts
+
+
+async def run_schedule(predecessors: Dict[str, List[str]], run_shot: Callable[[str], Awaitable[Any]],
+                       max_parallel: int = MAX_PARALLEL,
+                       cost: Callable[[str], float] = lambda key: 1.0) -> Dict[str, List[str]]:
+    """Run run_shot(shot_key) for every shot once its stitch predecessors are done.
+
+    A failed shot blocks everything stitched from it. Shots on a stitch cycle, or stitched
+    from one, can never start and are blocked too; 'cycles' lists the shots on the cycle.
+    Returns done/failed/blocked/cycles shot keys.
+    """
+    successors = successors_of(predecessors)
+    priority = critical_path_lengths(predecessors, cost)
+    waiting = {key: len(preds) for key, preds in predecessors.items()}
+    ready = [(-priority[key], key) for key, count in waiting.items() if count == 0]
+    heapq.heapify(ready)
+    running = {}
+    _, cyclic = topological_order(predecessors)
+    result = {'done': [], 'failed': [], 'blocked': list(cyclic), 'cycles': cycle_members(predecessors, cyclic)}
+    if cyclic:
+        print(f"⚠️  Stitch cycle through {', '.join(result['cycles'])}: {len(cyclic)} shots not rendered")
+
+    def block(key):
+        for succ in successors[key]:
+            if succ not in result['blocked']:
+                result['blocked'].append(succ)
+                block(succ)
+
+    while ready or running:
+        while ready and len(running) < max_parallel:
+            _, key = heapq.heappop(ready)
+            running[asyncio.ensure_future(run_shot(key))] = key
+        finished, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+        for task in finished:
+            key = running.pop(task)
+            if task.exception() is not None:
+                print(f"❌ {key}: {task.exception()}")
+                result['failed'].append(key)
+                block(key)
+                continue
+            result['done'].append(key)
+            for succ in successors[key]:
+                waiting[succ] -= 1
+                if waiting[succ] == 0 and succ not in result['blocked']:
+                    heapq.heappush(ready, (-priority[succ], succ))
+    return result
+
+
+def build_schedule(shots_dir: str = SHOTS_PATH, max_parallel: int = MAX_PARALLEL) -> Dict[str, Any]:
+    """Stitch graph, chains and simulated wall time for the whole film (one unit per shot)."""
+    shots = load_shots(shots_dir)
+    predecessors, dangling = build_stitch_graph(shots)
+    chains = independent_chains(predecessors)
+    priority = critical_path_lengths(predecessors)
+    makespan, starts = simulate_schedule(predecessors, max_parallel)
+    _, cyclic = topological_order(predecessors)
+    return {
+        'max_parallel': max_parallel,
+        'shot_count': len(shots),
+        'longest_chain': max(priority.values(), default=0),
+        'makespan': makespan,
+        'chains': chains,
+        'predecessors': predecessors,
+        'critical_path': priority,
+        'start_slot': starts,
+        'dangling_references': dangling,
+        'cycles': cycle_members(predecessors, cyclic)
+    }
+
+
+def main():
+    """Main execution"""
+    print("🧵 Building STITCH schedule...")
+    schedule = build_schedule()
+
+    with open(SCHEDULE_PATH, 'w', encoding='utf-8') as f:
+        json.dump(schedule, f, indent=2, ensure_ascii=False)
+
+    print(f"   {schedule['shot_count']} shots in {len(schedule['chains'])} independent chains")
+    print(f"   Longest stitch chain: {schedule['longest_chain']:.0f} shots")
+    print(f"   Wall time with {schedule['max_parallel']} workers: {schedule['makespan']:.0f} shot-slots "
+          f"(serial: {schedule['shot_count']})")
+    for ref in schedule['dangling_references']:
+        print(f"⚠️  {ref['shot']} stitches from missing shot {ref['reference']}")
+    if schedule['cycles']:
+        print(f"⚠️  Stitch cycle through {', '.join(schedule['cycles'])}")
+    print(f"\n✅ Schedule written to {SCHEDULE_PATH}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Shared string table for the shot JSON payloads.
+Across the shots many values repeat verbatim: negative prompts, style fragments,
+intent_tags, sound lists, plate IDs, whole notes/audio blocks. The film bundle stores
+each repeated string once in a "strings" table and each repeated block once in a
+"values" table; shots reference them as {"$s": id} and {"$v": id}, and a real block of
+that shape is wrapped as {"$d": block}. The bundle holds every shot file, alternates with
+a duplicate ID included. Loading it gives shots whose equal strings are one shared object,
+and exporting writes the legacy per-shot JSON files (indent=2, ASCII-escaped) byte for
+byte as before.
+
+Usage: python3 string_table.py [export]
+"""
+
+import copy
+import json
+import sys
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+from film_data import APP_PATH, SHOTS_PATH, load_json, load_shots, shot_sort_key
+
+SHOT_BUNDLE_PATH = f"{APP_PATH}/shot_bundle.json"
+BUNDLE_VERSION = 1
+
+# Shorter values cost more as a reference than inline
+MIN_STRING_LENGTH = 8
+MIN_VALUE_LENGTH = 40
+STRING_REF = '$s'
+VALUE_REF = '$v'
+LITERAL_REF = '$d'
+REF_KEYS = {STRING_REF, VALUE_REF, LITERAL_REF}
+
+
+def _dump(value: Any) -> str:
+    """Key-order-preserving serialization; blocks only share an entry when they would
+    export identically."""
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':'))
+
+
+def _walk(node: Any, strings: Counter, values: Counter) -> None:
+    if isinstance(node, str):
+        if len(node) >= MIN_STRING_LENGTH:
+            strings[node] += 1
+    elif isinstance(node, (dict, list)):
+        if node:
+            dumped = _dump(node)
+            if len(dumped) >= MIN_VALUE_LENGTH:
+                values[dumped] += 1
+        for child in (node.values() if isinstance(node, dict) else node):
+            _walk(child, strings, values)
+
+
+def build_bundle(shots: List[Tuple[str, Dict[str, Any]]]) -> Dict[str, Any]:
+    """Bundle of the shots with repeated strings and blocks replaced by table references."""
+    string_counts: Counter = Counter()
+    value_counts: Counter = Counter()
+    for _, shot_data in shots:
+        _walk(shot_data, string_counts, value_counts)
+
+    # Most used first, so the commonest references have the shortest IDs
+    values = sorted((dumped for dumped, count in value_counts.items() if count > 1),
+                    key=lambda dumped: (-value_counts[dumped], dumped))
+    value_ids = {dumped: index for index, dumped in enumerate(values)}
+    string_ids: Dict[str, int] = {}
+
+    def encode(node: Any, top: bool = False) -> Any:
+        if isinstance(node, str):
+            if string_counts[node] > 1 and len(node) >= MIN_STRING_LENGTH:
+                return {STRING_REF: string_ids.setdefault(node, len(string_ids))}
+            return node
+        if isinstance(node, (dict, list)):
+            if not top and node:
+                dumped = _dump(node)
+                if dumped in value_ids:
+                    return {VALUE_REF: value_ids[dumped]}
+            if isinstance(node, dict):
+                encoded = {key: encode(value) for key, value in node.items()}
+                # A block that looks like a reference is wrapped so it decodes as itself
+                return {LITERAL_REF: encoded} if len(node) == 1 and set(node) <= REF_KEYS else encoded
+            return [encode(value) for value in node]
+        return node
+
+    encoded_shots = {shot_key: encode(shot_data, top=True) for shot_key, shot_data in shots}
+    encoded_values = [encode(json.loads(dumped), top=True) for dumped in values]
+    return {'version': BUNDLE_VERSION,
+            'strings': sorted(string_ids, key=string_ids.get),
+            'values': encoded_values,
+            'shots': encoded_shots}
+
+
+class BundleDecoder:
+    """Expands references; every use of a table string is the same str object, and each
+    use of a table block is its own copy so shots can be edited independently."""
+
+    def __init__(self, bundle: Dict[str, Any]):
+        self.strings: List[str] = bundle['strings']
+        self._values = bundle['values']
+        self._decoded: Dict[int, Any] = {}
+
+    def value(self, index: int) -> Any:
+        if index not in self._decoded:
+            self._decoded[index] = self.decode(self._values[index])
+        # Strings are immutable, so deepcopy keeps sharing them
+        return copy.deepcopy(self._decoded[index])
+
+    def decode(self, node: Any) -> Any:
+        if isinstance(node, dict):
+            if len(node) == 1 and STRING_REF in node:
+                return self.strings[node[STRING_REF]]
+            if len(node) == 1 and VALUE_REF in node:
+                return self.value(node[VALUE_REF])
+            if len(node) == 1 and LITERAL_REF in node:
+                return {key: self.decode(value) for key, value in node[LITERAL_REF].items()}
+            return {key: self.decode(value) for key, value in node.items()}
+        if isinstance(node, list):
+            return [self.decode(value) for value in node]
+        return node
+
+
+def load_shot_files(shots_dir: str = SHOTS_PATH) -> List[Tuple[str, Dict[str, Any]]]:
+    """Every shot file as (file stem, data) in film order. Unlike load_shots(), alternates
+    with an already-loaded ID are kept, since the bundle must export every file."""
+    shots = []
+    for shot_file in sorted(Path(shots_dir).glob("shot_*.json")):
+        with open(shot_file, 'r', encoding='utf-8') as f:
+            shots.append((shot_file.stem, json.load(f)))
+    shots.sort(key=lambda item: shot_sort_key(*item))
+    return shots
+
+
+def load_bundle(path: str = SHOT_BUNDLE_PATH) -> List[Tuple[str, Dict[str, Any]]]:
+    """Shots from the bundle as (file stem, data), in bundle (film) order."""
+    bundle = load_json(path)
+    if bundle.get('version') != BUNDLE_VERSION:
+        return []
+    decoder = BundleDecoder(bundle)
+    return [(shot_key, decoder.decode(encoded)) for shot_key, encoded in bundle['shots'].items()]
+
+
+def intern_strings(node: Any, table: Dict[str, str]) -> Any:
+    """The same structure with equal strings (keys included) replaced by one shared object."""
+    if isinstance(node, str):
+        return table.setdefault(node, node)
+    if isinstance(node, dict):
+        return {table.setdefault(key, key): intern_strings(value, table) for key, value in node.items()}
+    if isinstance(node, list):
+        return [intern_strings(value, table) for value in node]
+    return node
+
+
+def load_interned_shots(shots_dir: str = SHOTS_PATH) -> List[Tuple[str, Dict[str, Any]]]:
+    """load_shots() with one string table shared by every shot."""
+    table: Dict[str, str] = {}
+    return [(shot_key, intern_strings(shot_data, table)) for shot_key, shot_data in load_shots(shots_dir)]
+
+
+def save_bundle(bundle: Dict[str, Any], path: str = SHOT_BUNDLE_PATH) -> None:
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(bundle, f, ensure_ascii=False, separators=(',', ':'))
+
+
+def export_shots(shots: List[Tuple[str, Dict[str, Any]]], shots_dir: str = SHOTS_PATH) -> int:
+    """Write the legacy per-shot JSON files with the same json.dump(indent=2) settings as
+    every other shot writer; returns files changed."""
+    updated = 0
+    for shot_key, shot_data in shots:
+        shot_file = Path(shots_dir) / f"{shot_key}.json"
+        text = json.dumps(shot_data, indent=2)
+        if shot_file.exists() and shot_file.read_text(encoding='utf-8') == text:
+            continue
+        with open(shot_file, 'w', encoding='utf-8') as f:
+            f.write(text)
+        updated += 1
+    return updated
+
+
+def payload_bytes(node: Any, seen: set = None) -> int:
+    """Memory held by a decoded payload, counting each shared object once."""
+    seen = set() if seen is None else seen
+    if id(node) in seen:
+        return 0
+    seen.add(id(node))
+    size = sys.getsizeof(node)
+    if isinstance(node, dict):
+        size += sum(payload_bytes(key, seen) + payload_bytes(value, seen) for key, value in node.items())
+    elif isinstance(node, list):
+        size += sum(payload_bytes(value, seen) for value in node)
+    return size
+
+
+def main(command: str = ''):
+    """Main execution"""
+    if command == 'export':
+        shots = load_bundle()
+        if not shots:
+            print(f"⚠️  No bundle at {SHOT_BUNDLE_PATH}")
+            return
+        print(f"\n✅ Exported bundle to {export_shots(shots)} changed shot files")
+        return
+
+    print("🧵 Building the shared string table for the shot payloads...")
+    shots = load_shot_files(SHOTS_PATH)
+    bundle = build_bundle(shots)
+    save_bundle(bundle)
+
+    files_size = sum(path.stat().st_size for path in Path(SHOTS_PATH).glob('shot_*.json'))
+    bundle_size = Path(SHOT_BUNDLE_PATH).stat().st_size
+    print(f"   {len(bundle['strings'])} shared strings, {len(bundle['values'])} shared blocks")
+    print(f"   Size: {files_size / 1e3:.0f} kB in {len(shots)} files -> {bundle_size / 1e3:.0f} kB bundle")
+    print(f"   Memory: {payload_bytes([data for _, data in shots]) / 1e6:.1f} MB per-file load -> "
+          f"{payload_bytes([data for _, data in load_bundle()]) / 1e6:.1f} MB from the bundle")
+    print(f"\n✅ Bundle: {SHOT_BUNDLE_PATH}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1] if len(sys.argv) > 1 else '')
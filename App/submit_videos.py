@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+Async submission queue for video generation.
+Rendered prompts are submitted concurrently with bounded parallelism, token-bucket
+rate limiting and retries with backoff. Job state is persisted so an interrupted run
+resumes where it stopped, and finished video paths are written back into each
+variant's video_references. A local HTTP stub backend is included for offline runs.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List
+
+from film_data import APP_PATH, SHOTS_PATH, load_plate_descriptions, load_shots
+from render_prompts import inputs_digest, iter_prompt_inputs, prompt_filename, render_prompt
+
+JOB_STORE_PATH = f"{APP_PATH}/video_jobs.json"
+VIDEOS_PATH = f"{APP_PATH}/videos"
+
+# Backend settings
+BACKEND_URL = "http://127.0.0.1:8765"
+USE_STUB_BACKEND = True
+MAX_CONCURRENT = 4
+REQUESTS_PER_SECOND = 2.0
+BURST = 4
+MAX_ATTEMPTS = 5
+BACKOFF_BASE = 1.0
+BACKOFF_MAX = 30.0
+REQUEST_TIMEOUT = 600
+
+
+class JobStore:
+    """Job state persisted as JSON; every change is written atomically so a crash loses nothing."""
+
+    def __init__(self, path: str = JOB_STORE_PATH):
+        self.path = Path(path)
+        self.jobs: Dict[str, Dict[str, Any]] = {}
+        # Prompt text is rebuilt from the shots on every run rather than persisted
+        self.prompts: Dict[str, str] = {}
+        if self.path.exists():
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.jobs = json.load(f)
+        # Anything left running by a crashed run goes back in the queue
+        for job in self.jobs.values():
+            if job['status'] == 'running':
+                job['status'] = 'pending'
+
+    def add(self, job_id: str, digest: str, shot_key: str, variant_id: str, prompt: str) -> None:
+        """Register a job; a job whose prompt changed is reset to pending."""
+        self.prompts[job_id] = prompt
+        existing = self.jobs.get(job_id)
+        if existing and existing['digest'] == digest:
+            return
+        self.jobs[job_id] = {
+            'digest': digest,
+            'shot_key': shot_key,
+            'variant_id': variant_id,
+            'status': 'pending',
+            'attempts': 0,
+            'result_path': None,
+            'error': None
+        }
+
+    def update(self, job_id: str, **changes) -> None:
+        self.jobs[job_id].update(changes)
+        self.save()
+
+    def pending(self) -> List[str]:
+        return [job_id for job_id, job in self.jobs.items()
+                if job['status'] == 'pending' and job_id in self.prompts]
+
+    def save(self) -> None:
+        tmp_path = self.path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.jobs, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+
+class TokenBucket:
+    """Async token bucket: `rate` requests per second with bursts up to `capacity`."""
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class HTTPVideoBackend:
+    """Submits a prompt with POST {base_url}/generate and returns the video path from the reply."""
+
+    def __init__(self, base_url: str = BACKEND_URL, timeout: float = REQUEST_TIMEOUT):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+
+    def _post(self, job_id: str, prompt: str) -> str:
+        body = json.dumps({'job_id': job_id, 'prompt': prompt}).encode('utf-8')
+        request = urllib.request.Request(f"{self.base_url}/generate", data=body,
+                                         headers={'Content-Type': 'application/json'})
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            return json.loads(response.read().decode('utf-8'))['video_path']
+
+    async def submit(self, job_id: str, prompt: str) -> str:
+        return await asyncio.to_thread(self._post, job_id, prompt)
+
+
+async def run_jobs(store: JobStore, backend, max_concurrent: int = MAX_CONCURRENT,
+                   rate: float = REQUESTS_PER_SECOND, burst: int = BURST,
+                   max_attempts: int = MAX_ATTEMPTS, backoff_base: float = BACKOFF_BASE,
+                   on_done=None) -> Dict[str, int]:
+    """Submit every pending job and return counts of done/failed jobs."""
+    queue: asyncio.Queue = asyncio.Queue()
+    for job_id in store.pending():
+        queue.put_nowait(job_id)
+    bucket = TokenBucket(rate, burst)
+    counts = {'done': 0, 'failed': 0}
+
+    async def worker():
+        while True:
+            try:
+                job_id = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            job = store.jobs[job_id]
+            while True:
+                await bucket.acquire()
+                store.update(job_id, status='running', attempts=job['attempts'] + 1)
+                try:
+                    result_path = await backend.submit(job_id, store.prompts[job_id])
+                except Exception as e:
+                    if job['attempts'] >= max_attempts:
+                        store.update(job_id, status='failed', error=str(e))
+                        counts['failed'] += 1
+                        print(f"❌ {job_id}: {e}")
+                        break
+                    delay = min(BACKOFF_MAX, backoff_base * 2 ** (job['attempts'] - 1))
+                    await asyncio.sleep(delay * random.uniform(0.5, 1.0))
+                    continue
+                store.update(job_id, status='done', result_path=result_path, error=None)
+                counts['done'] += 1
+                if on_done:
+                    on_done(store.jobs[job_id])
+                break
+
+    await asyncio.gather(*(worker() for _ in range(max_concurrent)))
+    return counts
+
+
+def write_video_reference(job: Dict[str, Any], shots_dir: str = SHOTS_PATH) -> None:
+    """Append a finished video path to the variant's video_references in its shot JSON."""
+    shot_file = Path(shots_dir) / f"{job['shot_key']}.json"
+    with open(shot_file, 'r', encoding='utf-8') as f:
+        shot_data = json.load(f)
+
+    for variant in shot_data.get('prompt_variants', []):
+        if variant.get('variant_id') == job['variant_id']:
+            references = variant.setdefault('video_references', [])
+            if job['result_path'] in references:
+                return
+            references.append(job['result_path'])
+            break
+    else:
+        return
+
+    with open(shot_file, 'w', encoding='utf-8') as f:
+        json.dump(shot_data, f, indent=2)
+
+
+def queue_rendered_prompts(store: JobStore, shots_dir: str = SHOTS_PATH, app_path: str = APP_PATH) -> None:
+    """Create (or refresh) one job per rendered prompt."""
+    shots = load_shots(shots_dir)
+    character_plates, env_plates = load_plate_descriptions(app_path)
+    for inputs in iter_prompt_inputs(shots, character_plates, env_plates):
+        job_id = prompt_filename(inputs)[:-len('.txt')]
+        store.add(job_id, inputs_digest(inputs), inputs['shot_key'], inputs['variant_id'], render_prompt(inputs))
+    store.save()
+
+
+# Local stub backend
+
+class StubVideoBackend:
+    """Local HTTP server that fakes generation: waits `latency` seconds, fails at `failure_rate`,
+    and writes a placeholder file per job."""
+
+    def __init__(self, output_dir: str = VIDEOS_PATH, host: str = '127.0.0.1', port: int = 8765,
+                 latency: float = 0.05, failure_rate: float = 0.0):
+        self.output_dir = output_dir
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.requests = 0
+        os.makedirs(output_dir, exist_ok=True)
+        self.server = ThreadingHTTPServer((host, port), self._handler())
+        self.thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                stub.requests += 1
+                body = json.loads(self.rfile.read(int(self.headers['Content-Length'])).decode('utf-8'))
+                time.sleep(stub.latency)
+                if random.random() < stub.failure_rate:
+                    self.send_response(503)
+                    self.end_headers()
+                    return
+                video_path = os.path.join(stub.output_dir, f"{body['job_id']}.mp4")
+                with open(video_path, 'w', encoding='utf-8') as f:
+                    f.write(hashlib.sha256(body['prompt'].encode('utf-8')).hexdigest())
+                reply = json.dumps({'video_path': video_path}).encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(reply)))
+                self.end_headers()
+                self.wfile.write(reply)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self) -> 'StubVideoBackend':
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def main():
+    """Main execution"""
+    print("🎥 Video submission queue")
+    store = JobStore(JOB_STORE_PATH)
+    queue_rendered_prompts(store)
+    print(f"   {len(store.jobs)} jobs, {len(store.pending())} pending")
+
+    # A crash between marking a job done and writing its reference is repaired here
+    for job in store.jobs.values():
+        if job['status'] == 'done':
+            write_video_reference(job)
+
+    stub = StubVideoBackend(VIDEOS_PATH).start() if USE_STUB_BACKEND else None
+    backend = HTTPVideoBackend(stub.url if stub else BACKEND_URL)
+
+    start = time.monotonic()
+    try:
+        counts = asyncio.run(run_jobs(store, backend, on_done=write_video_reference))
+    finally:
+        if stub:
+            stub.stop()
+    elapsed = time.monotonic() - start
+
+    finished = counts['done'] + counts['failed']
+    print(f"\n✅ {counts['done']} done, {counts['failed']} failed in {elapsed:.1f}s"
+          + (f" ({finished / elapsed:.2f} jobs/s)" if elapsed > 0 else ""))
+    print(f"📄 Job state: {JOB_STORE_PATH}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+"""
+Timeline index over shot durations backed by Fenwick (binary indexed) trees.
+Shots occupy gapped slots in a fixed-capacity tree, so durations are updated and shots
+removed in O(log n); start time, runtime position and the shot at a percentage or timecode
+are O(log n) queries. An insert or move takes a free slot between its neighbours; when
+that gap runs out, only the smallest surrounding window of slots that is sparse enough
+is relabelled and patched into the trees in time linear in the window, which amortises
+to O(log^2 n) per insert. The trees are rebuilt with double the spacing only when the
+whole timeline gets dense. The index serializes to JSON and writes each shot's start
+time and runtime-weighted position into its JSON as "timeline"; the film position the
+app and the other scripts use is film_data.shot_position (by index), not this one.
+"""
+
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from film_data import APP_PATH, DEFAULT_DURATION, SHOTS_PATH, load_shots
+from stitch_order import canonical_shots
+
+TIMELINE_PATH = f"{APP_PATH}/timeline_index.json"
+SLOT_GAP = 64
+# Occupancy allowed in a relabelled window: the smallest window may be a quarter full, the
+# whole tree an eighth. Limits that fall with window size keep relabelling amortised.
+LEAF_DENSITY = 0.25
+ROOT_DENSITY = 0.125
+
+
+class FenwickTree:
+    """Prefix sums over a fixed-size array with O(log n) point updates."""
+
+    def __init__(self, size: int):
+        self.size = size
+        self.tree = [0] * (size + 1)
+
+    @classmethod
+    def from_values(cls, values: List[float]) -> 'FenwickTree':
+        """Linear-time build."""
+        fenwick = cls(len(values))
+        tree = fenwick.tree
+        for i, value in enumerate(values, 1):
+            tree[i] += value
+            parent = i + (i & -i)
+            if parent <= fenwick.size:
+                tree[parent] += tree[i]
+        return fenwick
+
+    def add(self, index: int, delta: float) -> None:
+        i = index + 1
+        while i <= self.size:
+            self.tree[i] += delta
+            i += i & -i
+
+    def assign_block(self, start: int, values: List[float]) -> None:
+        """Replace the entries from `start` on with `values` in O(len(values)), when the block
+        is dyadic (start a multiple of a power of two >= len(values), or the block ends the
+        array) and its total is unchanged, so no node covering the whole block changes."""
+        end = start + len(values)
+        tree = self.tree
+        inside = [i for i in range(start + 1, end + 1) if i - (i & -i) >= start]
+        for i in inside:
+            tree[i] = values[i - start - 1]
+        for i in inside:
+            parent = i + (i & -i)
+            if parent <= end and parent - (parent & -parent) >= start:
+                tree[parent] += tree[i]
+
+    def prefix_sum(self, count: int) -> float:
+        """Sum of the first `count` entries."""
+        total = 0
+        i = count
+        while i > 0:
+            total += self.tree[i]
+            i -= i & -i
+        return total
+
+    def search(self, target: float) -> int:
+        """Smallest index whose inclusive prefix sum exceeds target (size if none)."""
+        position = 0
+        step = 1 << self.size.bit_length()
+        while step:
+            nxt = position + step
+            if nxt <= self.size and self.tree[nxt] <= target:
+                position = nxt
+                target -= self.tree[nxt]
+            step >>= 1
+        return position
+
+
+class TimelineIndex:
+    """Ordered shots with durations; positions are start time / total runtime."""
+
+    def __init__(self, shots: Iterable[Tuple[str, float]] = (), gap: int = SLOT_GAP):
+        # Shots relabelled one slot apart would leave no free slot between them
+        self.gap = max(2, gap)
+        self.durations: Dict[str, float] = {}
+        self.slots: Dict[str, int] = {}
+        self.keys_at: Dict[int, str] = {}
+        self.total = 0.0
+        shots = list(shots)
+        for key, duration in shots:
+            if key in self.durations:
+                raise ValueError(f"Duplicate shot key: {key}")
+            self.durations[key] = float(duration)
+        self._relabel([key for key, _ in shots])
+
+    def _relabel(self, order: List[str], capacity: Optional[int] = None) -> None:
+        """Spread the shots evenly over a fresh tree."""
+        self.capacity = capacity or (len(order) + 1) * self.gap
+        self.slots = {key: (i + 1) * self.gap for i, key in enumerate(order)}
+        self.keys_at = {slot: key for key, slot in self.slots.items()}
+        duration_values = [0.0] * self.capacity
+        count_values = [0] * self.capacity
+        for key, slot in self.slots.items():
+            duration_values[slot] = self.durations[key]
+            count_values[slot] = 1
+        self.duration_tree = FenwickTree.from_values(duration_values)
+        self.count_tree = FenwickTree.from_values(count_values)
+        self.total = sum(self.durations[key] for key in order)
+
+    def __len__(self) -> int:
+        return len(self.slots)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.slots
+
+    def _slot_at(self, index: int) -> int:
+        return self.count_tree.search(index)
+
+    def _free_slot(self, index: int) -> Optional[int]:
+        """A free slot between the shots at index-1 and index, or None if the gap is used up."""
+        low = self._slot_at(index - 1) if index > 0 else 0
+        high = self._slot_at(index) if index < len(self) else min(low + 2 * self.gap, self.capacity)
+        return (low + high) // 2 if high - low >= 2 else None
+
+    def _relabel_window(self, slot: int) -> bool:
+        """Spread the shots evenly over the smallest aligned window of slots around `slot`
+        that stays under its density limit with one more shot; False if even the whole tree
+        is too dense. Windows are dyadic, so both trees are patched in O(window size)."""
+        size = 1 << self.gap.bit_length()
+        levels = max(1, ((self.capacity - 1) // size).bit_length() + 1)
+        for level in range(levels):
+            low = slot // size * size
+            high = min(low + size, self.capacity)
+            first = int(self.count_tree.prefix_sum(low))
+            count = int(self.count_tree.prefix_sum(high)) - first
+            limit = LEAF_DENSITY - (LEAF_DENSITY - ROOT_DENSITY) * level / max(1, levels - 1)
+            if count + 1 <= (high - low) * limit:
+                break
+            size *= 2
+        else:
+            return False
+
+        keys = [self.keys_at.pop(old_slot) for old_slot in range(low, high) if old_slot in self.keys_at]
+        step = (high - low) // (count + 1)
+        duration_values = [0.0] * (high - low)
+        count_values = [0] * (high - low)
+        for i, key in enumerate(keys, 1):
+            self.slots[key] = low + i * step
+            self.keys_at[low + i * step] = key
+            duration_values[i * step] = self.durations[key]
+            count_values[i * step] = 1
+        self.duration_tree.assign_block(low, duration_values)
+        self.count_tree.assign_block(low, count_values)
+        return True
+
+    def insert(self, key: str, duration: float, index: Optional[int] = None) -> None:
+        """Insert a shot before the shot currently at `index` (default: at the end)."""
+        if key in self.slots:
+            raise ValueError(f"Shot already in timeline: {key}")
+        index = len(self) if index is None else max(0, min(index, len(self)))
+        slot = self._free_slot(index)
+        if slot is None:
+            if not self._relabel_window(self._slot_at(index - 1) if index > 0 else 0):
+                order = self.order()
+                self._relabel(order, (len(order) + 2) * self.gap * 2)
+            slot = self._free_slot(index)
+        self.durations[key] = float(duration)
+        self.slots[key] = slot
+        self.keys_at[slot] = key
+        self.duration_tree.add(slot, float(duration))
+        self.count_tree.add(slot, 1)
+        self.total += float(duration)
+
+    def remove(self, key: str) -> float:
+        """Remove a shot and return its duration."""
+        slot = self.slots.pop(key)
+        del self.keys_at[slot]
+        duration = self.durations.pop(key)
+        self.duration_tree.add(slot, -duration)
+        self.count_tree.add(slot, -1)
+        self.total -= duration
+        return duration
+
+    def move(self, key: str, index: int) -> None:
+        """Move a shot so it ends up at `index` in the new order."""
+        self.insert(key, self.remove(key), index)
+
+    def set_duration(self, key: str, duration: float) -> None:
+        delta = float(duration) - self.durations[key]
+        self.durations[key] = float(duration)
+        self.duration_tree.add(self.slots[key], delta)
+        self.total += delta
+
+    def index_of(self, key: str) -> int:
+        return int(self.count_tree.prefix_sum(self.slots[key]))
+
+    def start_of(self, key: str) -> float:
+        """Seconds from the start of the film to the start of the shot."""
+        return float(self.duration_tree.prefix_sum(self.slots[key]))
+
+    def position_of(self, key: str) -> float:
+        """Percentage through the film at which the shot starts."""
+        return self.start_of(key) / self.total * 100 if self.total > 0 else 0.0
+
+    def shot_at_time(self, seconds: float) -> Optional[str]:
+        """Shot playing at a timecode (the last shot for times past the end)."""
+        if not self.slots:
+            return None
+        if seconds >= self.total:
+            return self.keys_at[self._slot_at(len(self) - 1)]
+        return self.keys_at[self.duration_tree.search(max(0.0, seconds))]
+
+    def shot_at_percentage(self, percentage: float) -> Optional[str]:
+        return self.shot_at_time(percentage / 100 * self.total)
+
+    def order(self) -> List[str]:
+        return [self.keys_at[slot] for slot in sorted(self.keys_at)]
+
+    def entries(self) -> List[Dict[str, Any]]:
+        """Every shot with index, duration, start and position, in one pass."""
+        entries = []
+        start = 0.0
+        for index, key in enumerate(self.order()):
+            duration = self.durations[key]
+            entries.append({
+                'key': key,
+                'index': index,
+                'duration_seconds': duration,
+                'start_seconds': start,
+                'position_percentage': start / self.total * 100 if self.total > 0 else 0.0
+            })
+            start += duration
+        return entries
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'gap': self.gap, 'total_seconds': self.total, 'shots': self.entries()}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'TimelineIndex':
+        return cls(((entry['key'], entry['duration_seconds']) for entry in data.get('shots', [])),
+                   gap=data.get('gap', SLOT_GAP))
+
+
+def shot_duration(shot_data: Dict[str, Any]) -> float:
+    return float(shot_data.get('shot_metadata', {}).get('duration_seconds') or DEFAULT_DURATION)
+
+
+def build_timeline(shots: List[Tuple[str, Dict[str, Any]]]) -> TimelineIndex:
+    """Timeline in canonical (stitch-aware) film order from loaded shots."""
+    return TimelineIndex((shot_key, shot_duration(shot_data)) for shot_key, shot_data in canonical_shots(shots))
+
+
+def load_timeline(path: str = TIMELINE_PATH) -> TimelineIndex:
+    with open(path, 'r', encoding='utf-8') as f:
+        return TimelineIndex.from_dict(json.load(f))
+
+
+def save_timeline(timeline: TimelineIndex, path: str = TIMELINE_PATH) -> None:
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(timeline.to_dict(), f, indent=2, ensure_ascii=False)
+
+
+def write_timeline(timeline: TimelineIndex, shots_dir: str = SHOTS_PATH) -> int:
+    """Store each shot's timeline entry (and duration) in its JSON; returns files changed.
+    runtime_position_percentage is the share of the runtime before the shot starts, not
+    the index-based film position."""
+    updated = 0
+    for entry in timeline.entries():
+        shot_file = Path(shots_dir) / f"{entry['key']}.json"
+        with open(shot_file, 'r', encoding='utf-8') as f:
+            shot_data = json.load(f)
+        duration = entry['duration_seconds']
+        values = {
+            'index': entry['index'],
+            'start_seconds': round(entry['start_seconds'], 3),
+            'runtime_position_percentage': round(entry['position_percentage'], 4)
+        }
+        metadata = shot_data.setdefault('shot_metadata', {})
+        if shot_data.get('timeline') == values and metadata.get('duration_seconds') == duration:
+            continue
+        shot_data['timeline'] = values
+        metadata['duration_seconds'] = int(duration) if float(duration).is_integer() else duration
+        with open(shot_file, 'w', encoding='utf-8') as f:
+            json.dump(shot_data, f, indent=2)
+        updated += 1
+    return updated
+
+
+def main():
+    """Main execution"""
+    print("⏱  Building timeline index...")
+    timeline = build_timeline(load_shots(SHOTS_PATH))
+    save_timeline(timeline)
+
+    minutes, seconds = divmod(int(timeline.total), 60)
+    print(f"   {len(timeline)} shots, {minutes}:{seconds:02d} total")
+    for percentage in (25, 50, 75):
+        print(f"   {percentage}%: {timeline.shot_at_percentage(percentage)}")
+
+    updated = write_timeline(timeline)
+    print(f"\n✅ Positions written to {updated} shot files")
+    print(f"📄 Timeline: {TIMELINE_PATH}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Estimate prompt token lengths and deterministically compact prompts to a budget.
+Lowest-priority sections are trimmed first: auxiliary info, then ambient sounds,
+then plate text. Subject/Action/Scene/Style/Camera are never cut; the ambient tier
+only drops stage cues on the Dialogue line that restate the variant's own audio.ambient.
+"""
+
+import json
+import math
+import re
+from functools import lru_cache
+from typing import Any, Dict, List, Tuple
+
+from film_data import APP_PATH, SHOTS_PATH, load_plate_descriptions, load_shots, shot_position
+from render_prompts import build_prompt_inputs, render_prompt, selected_plate_combinations
+
+DEFAULT_TOKEN_BUDGET = 1024
+REPORT_PATH = f"{APP_PATH}/token_budget_report.json"
+
+TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+SENTENCE_PATTERN = re.compile(r"[^.!?]+[.!?]*\s*")
+WORD_PATTERN = re.compile(r"[a-z0-9]{3,}")
+QUOTED_PATTERN = re.compile(r'"[^"]*"|“[^”]*”|„[^“”]*[“”]|«[^»]*»')
+STOP_WORDS = {'the', 'and', 'from', 'with', 'now', 'into', 'under', 'over', 'all', 'its', 'her', 'his'}
+
+
+@lru_cache(maxsize=65536)
+def estimate_line_tokens(line: str) -> int:
+    """Approximate BPE token count for one line: ~4 characters per token for words, 1 per symbol."""
+    tokens = 0
+    for match in TOKEN_PATTERN.finditer(line):
+        piece = match.group(0)
+        if piece[0].isalnum() or piece[0] == '_':
+            # Non-ASCII letters (á, ð, þ, mojibake) split into more pieces
+            extra = sum(1 for ch in piece if ord(ch) > 127)
+            tokens += max(1, math.ceil((len(piece) + extra) / 4))
+        else:
+            tokens += 1
+    return tokens
+
+
+def estimate_tokens(text: str) -> int:
+    """Token estimate for a prompt; lines are cached so re-estimates after trimming are cheap."""
+    lines = text.split('\n')
+    return sum(estimate_line_tokens(line) for line in lines) + len(lines) - 1
+
+
+def _cue_words(cue: str) -> set:
+    return {word for word in WORD_PATTERN.findall(cue.lower()) if word not in STOP_WORDS}
+
+
+def strip_ambient_sentences(text: str, ambient_cues: List[str]) -> str:
+    """Remove sentences that restate one of the ambient cues (two shared words, or the whole
+    of a one-word cue). Quoted spans are spoken lines and always kept whole."""
+    cue_word_sets = [words for words in (_cue_words(cue) for cue in ambient_cues) if words]
+    if not cue_word_sets or not text:
+        return text
+
+    def keep(sentence: str) -> bool:
+        words = set(WORD_PATTERN.findall(sentence.lower()))
+        return not any(len(words & cue) >= min(2, len(cue)) for cue in cue_word_sets)
+
+    kept = []
+    position = 0
+    for match in [*QUOTED_PATTERN.finditer(text), None]:
+        between = text[position:match.start() if match else len(text)]
+        for sentence in SENTENCE_PATTERN.findall(between):
+            # A dropped sentence keeps the space that separated it from a preceding quote
+            kept.append(sentence if keep(sentence) else sentence[:len(sentence) - len(sentence.lstrip())])
+        if match:
+            kept.append(match.group(0))
+            position = match.end()
+    return ''.join(kept).strip()
+
+
+def _first_sentence(text: str) -> str:
+    match = SENTENCE_PATTERN.match(text or '')
+    return match.group(0).strip() if match else ''
+
+
+def _trim_steps(inputs: Dict[str, Any], ambient_cues: List[str]):
+    """Yield (step name, inputs, include_auxiliary) from least to most aggressive trimming."""
+    inputs = dict(inputs)
+    inputs['progressive_state'] = ''
+    yield 'progressive_state', dict(inputs), True
+    yield 'auxiliary', dict(inputs), False
+
+    inputs['dialogue'] = strip_ambient_sentences(inputs['dialogue'], ambient_cues)
+    yield 'ambient_sounds', dict(inputs), False
+
+    for key in ('environment_plate', 'character_plate'):
+        if inputs[key]:
+            inputs[key] = _first_sentence(inputs[key])
+            yield f'{key}_shortened', dict(inputs), False
+    for key, custom_key in (('environment_plate', 'custom_environment_plate'),
+                            ('character_plate', 'custom_character_plate')):
+        if inputs[key] is not None or inputs[custom_key]:
+            inputs[key] = None
+            inputs[custom_key] = ''
+            yield f'{key}_removed', dict(inputs), False
+
+
+def compact_prompt(inputs: Dict[str, Any], ambient_cues: List[str] = (),
+                   budget: int = DEFAULT_TOKEN_BUDGET) -> Tuple[str, int, List[str]]:
+    """Return (prompt, estimated tokens, steps applied), trimming only as far as needed."""
+    prompt = render_prompt(inputs)
+    tokens = estimate_tokens(prompt)
+    applied = []
+    if tokens <= budget:
+        return prompt, tokens, applied
+
+    for step, trimmed, include_auxiliary in _trim_steps(inputs, list(ambient_cues)):
+        applied.append(step)
+        prompt = render_prompt(trimmed, include_auxiliary=include_auxiliary)
+        tokens = estimate_tokens(prompt)
+        if tokens <= budget:
+            break
+    return prompt, tokens, applied
+
+
+def budget_report(shots_dir: str = SHOTS_PATH, app_path: str = APP_PATH,
+                  budget: int = DEFAULT_TOKEN_BUDGET) -> Dict[str, Any]:
+    """Per-shot token estimates and overage before and after compaction, for the whole film."""
+    shots = load_shots(shots_dir)
+    character_plates, env_plates = load_plate_descriptions(app_path)
+    report = {}
+
+    for index, (shot_key, shot_data) in enumerate(shots):
+        position = shot_position(index, len(shots))
+        prompts = []
+        for variant in shot_data.get('prompt_variants', []):
+            ambient_cues = (variant.get('audio') or {}).get('ambient') or []
+            for character_plate_id, environment_plate_id in selected_plate_combinations(variant):
+                inputs = build_prompt_inputs(shot_key, shot_data, variant, position, character_plate_id,
+                                             environment_plate_id, character_plates, env_plates)
+                original = estimate_tokens(render_prompt(inputs))
+                _, compacted, steps = compact_prompt(inputs, ambient_cues, budget)
+                prompts.append({
+                    'variant_id': inputs['variant_id'],
+                    'character_plate_id': character_plate_id,
+                    'environment_plate_id': environment_plate_id,
+                    'tokens': original,
+                    'overage': max(0, original - budget),
+                    'compacted_tokens': compacted,
+                    'remaining_overage': max(0, compacted - budget),
+                    'steps': steps
+                })
+        report[shot_key] = {
+            'max_overage': max((p['overage'] for p in prompts), default=0),
+            'max_remaining_overage': max((p['remaining_overage'] for p in prompts), default=0),
+            'prompts': prompts
+        }
+
+    return {'budget': budget, 'shots': report}
+
+
+def main():
+    """Main execution"""
+    print(f"📏 Estimating prompt tokens against a budget of {DEFAULT_TOKEN_BUDGET}...")
+    report = budget_report()
+
+    with open(REPORT_PATH, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+
+    over = {key: shot for key, shot in report['shots'].items() if shot['max_overage']}
+    still_over = [key for key, shot in over.items() if shot['max_remaining_overage']]
+    for key, shot in over.items():
+        print(f"⚠️  {key}: +{shot['max_overage']} tokens"
+              + (f" (still +{shot['max_remaining_overage']} after compaction)" if shot['max_remaining_overage'] else ""))
+
+    print(f"\n✅ {len(report['shots'])} shots checked, {len(over)} over budget, {len(still_over)} cannot be compacted")
+    print(f"📄 Report: {REPORT_PATH}")
+
+
+if __name__ == "__main__":
+    main()
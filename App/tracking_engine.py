@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Evaluate every tracking system at every shot position in one vectorized pass.
+Keyframes come from breathing_rates_external.json (per-character rates such as "12/min")
+and from main_film_system.json milestone_values. The result is a shots x systems matrix
+that is written into each shot as tracking_values, so the app reads it instead of recomputing.
+"""
+
+import json
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+from film_data import APP_PATH, SHOTS_PATH, character_key, load_json, load_shots, shot_position
+
+MATRIX_PATH = f"{APP_PATH}/tracking_matrix.json"
+
+QUANTITY_PATTERN = re.compile(r'(-?\d+(?:\.\d+)?)\s*(°C|mm|cm|ft|/min|bpm)')
+# Lengths are normalised to millimetres so one system never mixes units
+UNIT_SCALE = {'mm': ('mm', 1.0), 'cm': ('mm', 10.0), 'ft': ('mm', 304.8)}
+# "No crack formation": nothing of the measured quantity yet
+ABSENT_PATTERN = re.compile(r'\s*(?:no|none)\b', re.IGNORECASE)
+
+
+def parse_rate(rate: str) -> float:
+    """'12/min' -> 12.0"""
+    match = re.match(r'\s*(-?\d+(?:\.\d+)?)', rate)
+    return float(match.group(1)) if match else float('nan')
+
+
+def parse_quantity(text: str) -> Tuple[float, str]:
+    """First quantity with a unit in a milestone description, e.g. 'Hairline crack (0.5mm)'."""
+    match = QUANTITY_PATTERN.search(text)
+    if not match:
+        return float('nan'), ''
+    unit, scale = UNIT_SCALE.get(match.group(2), (match.group(2), 1.0))
+    return float(match.group(1)) * scale, unit
+
+
+def breathing_keyframes(breathing_data: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """breathing_rate.<character> systems: percentage -> breaths per minute."""
+    systems = {}
+    characters = breathing_data.get('breathing_rates_system', {}).get('characters', {})
+    for name, info in characters.items():
+        progression = sorted(info.get('progression', []), key=lambda point: point['percentage'])
+        systems[f"breathing_rate.{character_key(name)}"] = {
+            'unit': '/min',
+            'x': [float(point['percentage']) for point in progression],
+            'y': [parse_rate(point['rate']) for point in progression]
+        }
+    return systems
+
+
+def milestone_keyframes(main_system: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """Tracking systems from milestone_values.
+
+    A system whose milestones state a quantity (°C, mm, /min) in at least two places is tracked
+    in that unit, with unmeasured "No ..." milestones as zero keyframes; otherwise it is
+    tracked as a fractional milestone stage (0, 1, 2, ...).
+    """
+    systems = {}
+    for name, info in main_system.get('tracking_systems', {}).items():
+        milestones = sorted((float(pct), text) for pct, text in info.get('milestone_values', {}).items())
+        if not milestones:
+            continue
+        quantities = [(pct,) + parse_quantity(text) for pct, text in milestones]
+        measured = [(pct, value, unit) for pct, value, unit in quantities if unit]
+        units = {unit for _, _, unit in measured}
+        if len(measured) >= 2 and len(units) == 1:
+            keyframes = [(pct, value if unit else 0.0)
+                         for (pct, value, unit), (_, text) in zip(quantities, milestones)
+                         if unit or ABSENT_PATTERN.match(text)]
+            systems[name] = {'unit': units.pop(),
+                             'x': [pct for pct, _ in keyframes],
+                             'y': [value for _, value in keyframes]}
+        else:
+            systems[name] = {'unit': 'stage',
+                             'x': [pct for pct, _ in milestones],
+                             'y': [float(stage) for stage in range(len(milestones))]}
+    return systems
+
+
+def keyframe_arrays(systems: Dict[str, Dict[str, Any]]) -> Tuple[List[str], np.ndarray, np.ndarray]:
+    """Pad every system's keyframes to a common length by repeating the last point."""
+    names = list(systems)
+    width = max(max(len(systems[name]['x']) for name in names), 2)
+    xs = np.empty((len(names), width))
+    ys = np.empty((len(names), width))
+    for row, name in enumerate(names):
+        x, y = systems[name]['x'], systems[name]['y']
+        xs[row] = x + [x[-1]] * (width - len(x))
+        ys[row] = y + [y[-1]] * (width - len(y))
+    return names, xs, ys
+
+
+def interpolate_systems(xs: np.ndarray, ys: np.ndarray, positions: np.ndarray) -> np.ndarray:
+    """Piecewise-linear interpolation of every system at every position, clamped at the ends.
+
+    xs, ys: systems x keyframes; positions: shots. Returns shots x systems.
+    """
+    width = xs.shape[1]
+    # Index of the segment's right keyframe for each (system, position)
+    right = np.clip((xs[:, None, :] <= positions[None, :, None]).sum(axis=2), 1, width - 1)
+    left = right - 1
+    x0 = np.take_along_axis(xs, left, axis=1)
+    x1 = np.take_along_axis(xs, right, axis=1)
+    y0 = np.take_along_axis(ys, left, axis=1)
+    y1 = np.take_along_axis(ys, right, axis=1)
+    span = x1 - x0
+    t = np.where(span > 0, (positions[None, :] - x0) / np.where(span > 0, span, 1.0), 0.0)
+    t = np.clip(t, 0.0, 1.0)
+    return (y0 + t * (y1 - y0)).T
+
+
+def load_systems(app_path: str = APP_PATH) -> Dict[str, Dict[str, Any]]:
+    """Breathing-rate and milestone keyframes for every tracking system."""
+    systems = breathing_keyframes(load_json(f"{app_path}/breathing_rates_external.json"))
+    systems.update(milestone_keyframes(load_json(f"{app_path}/main_film_system.json")))
+    return systems
+
+
+def evaluate_film(shots_dir: str = SHOTS_PATH, app_path: str = APP_PATH) -> Dict[str, Any]:
+    """Shots x systems matrix of tracking values at each shot's film position."""
+    shots = load_shots(shots_dir)
+    systems = load_systems(app_path)
+    names, xs, ys = keyframe_arrays(systems)
+    positions = np.array([shot_position(index, len(shots)) for index in range(len(shots))])
+    matrix = interpolate_systems(xs, ys, positions)
+    return {
+        'systems': names,
+        'units': [systems[name]['unit'] for name in names],
+        'shots': [shot_key for shot_key, _ in shots],
+        'positions': positions.round(3).tolist(),
+        'values': matrix.round(3).tolist()
+    }
+
+
+def write_tracking_values(result: Dict[str, Any], shots_dir: str = SHOTS_PATH) -> int:
+    """Store each shot's row as shot_data['tracking_values'] = {system: value}."""
+    updated = 0
+    for shot_key, position, row in zip(result['shots'], result['positions'], result['values']):
+        shot_file = Path(shots_dir) / f"{shot_key}.json"
+        with open(shot_file, 'r', encoding='utf-8') as f:
+            shot_data = json.load(f)
+        values = {
+            'film_position_percentage': position,
+            'systems': {name: {'value': value, 'unit': unit}
+                        for name, unit, value in zip(result['systems'], result['units'], row)}
+        }
+        if shot_data.get('tracking_values') == values:
+            continue
+        shot_data['tracking_values'] = values
+        with open(shot_file, 'w', encoding='utf-8') as f:
+            json.dump(shot_data, f, indent=2)
+        updated += 1
+    return updated
+
+
+def main():
+    """Main execution"""
+    print("📈 Evaluating tracking systems at every shot...")
+    result = evaluate_film()
+
+    with open(MATRIX_PATH, 'w', encoding='utf-8') as f:
+        json.dump(result, f, indent=2, ensure_ascii=False)
+    print(f"   {len(result['shots'])} shots x {len(result['systems'])} systems")
+
+    updated = write_tracking_values(result)
+    print(f"\n✅ Updated tracking_values in {updated} shot files")
+    print(f"📄 Matrix: {MATRIX_PATH}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Shot-granular diff across script generations (v7 ... v18_partially_cleaned).
+Each version is split into shots with the splitter's grammar (split_shots_fixed.py).
+Shots are aligned across versions by shot ID when the titles are still alike, then by
+fuzzy title for renumbered shots; a reused ID with an unrelated title is a new shot. Only matched bodies are diffed, and bodies with the same normalized hash are
+skipped. The result is one change matrix: every shot against every version.
+"""
+
+import difflib
+import hashlib
+import json
+import re
+from typing import Any, Dict, List, Optional
+
+from corpus_store import read_text
+from film_data import APP_PATH, SHOT_ID_TOKEN, STORIES_PATH, canonical_shot_id
+from split_shots_fixed import split_section_shots, split_sections
+
+VERSION_DIFF_PATH = f"{APP_PATH}/version_diff.json"
+
+# Script generations, oldest first, relative to the stories tree
+VERSIONS = [
+    ('v7', 'v7'),
+    ('v9', 'The Sheep in the Baðstofa - Ultimate v9.txt'),
+    ('v13', 'The Sheep in the Baðstofa prod bible v 13.txt'),
+    ('v14', 'The Sheep in the Baðstofa - FINAL GENESIS v14.txt'),
+    ('v16', 'The Sheep in the Baðstofa - ULTIMATE v16.txt'),
+    ('v17', 'v17.txt'),
+    ('v17_good', 'v17_good.txt'),
+    ('v18', 'v18'),
+    ('v18_cleaned', 'v18_cleaned.txt'),
+    ('v18_partially_cleaned', 'v18_partially_cleaned.txt')
+]
+
+TITLE_MATCH_RATIO = 0.8
+# A same-ID match still needs this much title similarity; renumbered scripts reuse IDs
+ID_TITLE_MATCH_RATIO = 0.4
+# Matrix symbols for the console summary
+SYMBOLS = {'absent': '·', 'added': '+', 'unchanged': '=', 'modified': '~', 'removed': '-'}
+
+_SHOT_ID = re.compile(SHOT_ID_TOKEN, re.IGNORECASE)
+
+
+def normalize_id(shot_id: str) -> str:
+    """Canonical ID for plain shot IDs; ranges and oddities ("0-7") are kept as written."""
+    shot_id = shot_id.strip()
+    return canonical_shot_id(shot_id) if _SHOT_ID.fullmatch(shot_id) else shot_id.lower()
+
+
+def body_hash(body: str) -> str:
+    """Hash ignoring trailing whitespace and blank-line differences."""
+    lines = [line.rstrip() for line in body.splitlines() if line.strip()]
+    return hashlib.sha256('\n'.join(lines).encode('utf-8')).hexdigest()
+
+
+def parse_version(path: str) -> List[Dict[str, Any]]:
+    """Shots of one version in script order; text before the first heading is skipped.
+    Older generations are not all UTF-8, so undecodable bytes are replaced."""
+    shots = []
+    for section, content in split_sections(read_text(path, errors='replace')):
+        for shot_id, title, text in split_section_shots(content):
+            if shot_id is None:
+                continue
+            shots.append({'id': normalize_id(shot_id), 'title': title, 'section': section,
+                          'body': text, 'hash': body_hash(text)})
+    return shots
+
+
+def title_ratio(first: str, second: str) -> float:
+    return difflib.SequenceMatcher(None, first.lower(), second.lower()).ratio()
+
+
+def align(versions: Dict[str, List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """Shot identities with their occurrence in each version (None when absent)."""
+    identities: List[Dict[str, Any]] = []
+    by_id: Dict[str, List[int]] = {}
+    for label in versions:
+        taken = set()
+        for shot in versions[label]:
+            # Same ID with a similar title (closest among repeats; a missing title cannot
+            # disagree), then a renumbered shot with a matching title
+            candidates = [(title_ratio(identities[index]['title'], shot['title']), index)
+                          for index in by_id.get(shot['id'], []) if index not in taken]
+            ratio, match = max(candidates, key=lambda candidate: candidate[0], default=(0.0, None))
+            if match is not None and ratio < ID_TITLE_MATCH_RATIO \
+                    and identities[match]['title'].strip() and shot['title'].strip():
+                match = None
+            if match is None:
+                best = max(((title_ratio(identity['title'], shot['title']), index)
+                            for index, identity in enumerate(identities)
+                            if index not in taken and identity['shots'].get(label) is None),
+                           default=(0.0, None))
+                match = best[1] if best[0] >= TITLE_MATCH_RATIO else None
+            if match is None:
+                match = len(identities)
+                identities.append({'id': shot['id'], 'title': shot['title'], 'shots': {}})
+            taken.add(match)
+            identities[match]['shots'][label] = shot
+            identities[match]['title'] = shot['title']
+            by_id.setdefault(shot['id'], [])
+            if match not in by_id[shot['id']]:
+                by_id[shot['id']].append(match)
+    return identities
+
+
+def diff_bodies(old: str, new: str) -> Dict[str, Any]:
+    old_lines, new_lines = old.splitlines(), new.splitlines()
+    added = removed = 0
+    for line in difflib.unified_diff(old_lines, new_lines, lineterm='', n=0):
+        if line.startswith('+') and not line.startswith('+++'):
+            added += 1
+        elif line.startswith('-') and not line.startswith('---'):
+            removed += 1
+    return {'added_lines': added, 'removed_lines': removed,
+            'similarity': round(difflib.SequenceMatcher(None, old_lines, new_lines).ratio(), 3)}
+
+
+def change_matrix(versions: Dict[str, List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """Per identity, the status of each version against the previous version containing it."""
+    rows = []
+    for identity in align(versions):
+        cells = {}
+        previous: Optional[Dict[str, Any]] = None
+        present_before = False
+        for label, shots in versions.items():
+            shot = identity['shots'].get(label)
+            if shot is None:
+                # A version without SHOT headings says nothing about which shots it dropped
+                cells[label] = {'status': 'removed' if present_before and shots else 'absent'}
+                present_before = present_before and not shots
+                continue
+            if previous is None:
+                cell = {'status': 'added'}
+            elif previous['hash'] == shot['hash']:
+                cell = {'status': 'unchanged'}
+            else:
+                cell = {'status': 'modified', **diff_bodies(previous['body'], shot['body'])}
+            if previous is not None and previous['id'] != shot['id']:
+                cell['renumbered_from'] = previous['id']
+            cell.update({'id': shot['id'], 'title': shot['title']})
+            cells[label] = cell
+            previous = shot
+            present_before = True
+        rows.append({'id': identity['id'], 'title': identity['title'], 'versions': cells})
+    return rows
+
+
+def load_versions(stories_path: str = STORIES_PATH) -> Dict[str, List[Dict[str, Any]]]:
+    return {label: parse_version(f"{stories_path}/{relative}") for label, relative in VERSIONS}
+
+
+def main():
+    """Main execution"""
+    print("🧬 Diffing script generations shot by shot...")
+    versions = load_versions()
+    rows = change_matrix(versions)
+
+    with open(VERSION_DIFF_PATH, 'w', encoding='utf-8') as f:
+        json.dump({'versions': {label: len(shots) for label, shots in versions.items()}, 'shots': rows},
+                  f, indent=2, ensure_ascii=False)
+
+    for label, shots in versions.items():
+        note = '' if shots else '  ⚠️  no SHOT headings'
+        print(f"   {label}: {len(shots)} shots{note}")
+    print(f"\n   {'':10} {''.join(f'{label[:4]:5}' for label in versions)}")
+    for row in rows:
+        marks = ''.join(f"{SYMBOLS[row['versions'][label]['status']]:5}" for label in versions)
+        print(f"   {row['id'][:10]:10} {marks} {row['title'][:40]}")
+    print(f"\n✅ {len(rows)} shots across {len(versions)} versions")
+    print(f"📄 Matrix: {VERSION_DIFF_PATH}")
+
+
+if __name__ == "__main__":
+    main()